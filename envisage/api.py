@@ -40,10 +40,12 @@ Application, plugin and related classes
 - :class:`~.PluginActivator`
 - :class:`~.PluginExtensionRegistry`
 - :class:`~.PluginManager`
+- :class:`~.PreferencesSaver`
 - :class:`~.ProviderExtensionRegistry`
 - :class:`~.Service`
 - :class:`~.ServiceOffer`
 - :class:`~.ServiceRegistry`
+- :class:`~.TrackedPreferences`
 
 Exceptions
 ----------
@@ -81,6 +83,7 @@ from .plugin import Plugin
 from .plugin_activator import PluginActivator
 from .plugin_extension_registry import PluginExtensionRegistry
 from .plugin_manager import PluginManager
+from .preferences_saver import PreferencesSaver, TrackedPreferences
 from .provider_extension_registry import ProviderExtensionRegistry
 from .service import Service
 from .service_offer import ServiceOffer
@@ -13,12 +13,24 @@
 # Standard library imports.
 import logging
 import os
+import threading
 
 # Enthought library imports.
-from apptools.preferences.api import IPreferences, ScopedPreferences
+from apptools.preferences.api import IPreferences, Preferences
+from apptools.preferences.api import ScopedPreferences
 from apptools.preferences.api import set_default_preferences
 from traits.api import (
-    Delegate, Event, HasTraits, Instance, observe, provides, Str, VetoableEvent
+    Any,
+    Bool,
+    Delegate,
+    Event,
+    HasTraits,
+    Instance,
+    List,
+    observe,
+    provides,
+    Str,
+    VetoableEvent,
 )
 from traits.etsconfig.api import ETSConfig
 
@@ -30,7 +42,9 @@ from .i_plugin_manager import IPluginManager
 from .i_service_registry import IServiceRegistry
 
 from .application_event import ApplicationEvent
+from .extension_index import ExtensionIndex
 from .import_manager import ImportManager
+from .preferences_saver import PreferencesSaver, TrackedPreferences
 
 
 # Logging.
@@ -103,11 +117,35 @@ class Application(HasTraits):
     #: The service registry.
     service_registry = Instance(IServiceRegistry)
 
+    #: Whether the application has a staged startup. If it does, 'start' only
+    #: starts the plugins whose 'startup_phase' is "early", and the deferred
+    #: plugins are started by 'start_deferred_plugins'. Otherwise, 'start'
+    #: starts all of the plugins.
+    staged_startup = Bool(False)
+
+    #: Whether changes to the (default) preferences are saved in the
+    #: background soon after they are made. If they are, only the nodes that
+    #: have changed are written, and 'stop' only saves whatever has not been
+    #: saved yet. Otherwise all of the preferences are saved by 'stop'.
+    save_preferences_in_background = Bool(False)
+
     #### Private interface ####################################################
 
+    # The deferred plugins that have not been started yet.
+    _deferred_plugins = List
+
+    # The plugins that have been started, in the order that they were started,
+    # if the application has a staged startup (or None if the plugin manager
+    # started all of the plugins).
+    _started_plugins = Any
+
     # The import manager.
     _import_manager = Instance(IImportManager, factory=ImportManager)
 
+    # The object that saves the preferences in the background (or None if
+    # they are saved when the application stops).
+    _preferences_saver = Instance(PreferencesSaver)
+
     ###########################################################################
     # 'object' interface.
     ###########################################################################
@@ -166,9 +204,23 @@ class Application(HasTraits):
     def _preferences_default(self):
         """ Trait initializer. """
 
+        filename = os.path.join(self.home, 'preferences.ini')
+        if not self.save_preferences_in_background:
+            return ScopedPreferences(application_preferences_filename=filename)
+
+        # The same scopes as the default ones, except that changes to the
+        # application scope are tracked so that they can be saved as they
+        # happen.
+        application_scope = TrackedPreferences(
+            name="application", filename=filename
+        )
+        self._preferences_saver = PreferencesSaver(
+            preferences=application_scope
+        )
+
         return ScopedPreferences(
-            application_preferences_filename=os.path.join(
-                self.home, 'preferences.ini')
+            application_preferences_filename=filename,
+            scopes=[application_scope, Preferences(name="default")],
         )
 
     #### Methods ##############################################################
@@ -282,8 +334,11 @@ class Application(HasTraits):
         self.starting = event = self._create_application_event()
         if not event.veto:
             # Start the plugin manager (this starts all of the manager's
-            # plugins).
-            self.plugin_manager.start()
+            # plugins, unless some of them are deferred).
+            if self.staged_startup:
+                self._start_early_plugins()
+            else:
+                self.plugin_manager.start()
 
             # Lifecycle event.
             self.started = self._create_application_event()
@@ -316,11 +371,19 @@ class Application(HasTraits):
         self.stopping = event = self._create_application_event()
         if not event.veto:
             # Stop the plugin manager (this stops all of the manager's
-            # plugins).
-            self.plugin_manager.stop()
-
-            # Save all preferences.
-            self.preferences.save()
+            # plugins). If some plugins were deferred then we only stop the
+            # ones that were actually started.
+            if self._started_plugins is not None:
+                self._stop_started_plugins()
+            else:
+                self.plugin_manager.stop()
+
+            # Save all preferences (or just those that have not been saved in
+            # the background yet).
+            if self._preferences_saver is not None:
+                self._preferences_saver.flush()
+            else:
+                self.preferences.save()
 
             # Lifecycle event.
             self.stopped = self._create_application_event()
@@ -407,6 +470,38 @@ class Application(HasTraits):
     # 'Application' interface.
     ###########################################################################
 
+    def get_extension_index(self, extension_point_id, key="id"):
+        """ Return an index of the extensions to an extension point.
+
+        The index is a read-only mapping from the value of the attribute
+        called 'key' to the first extension with that value. If the extension
+        registry keeps indexes itself (as 'ExtensionRegistry' does) then the
+        index is kept up to date as extensions are added and removed.
+        Otherwise the index is built from a snapshot of the current
+        extensions.
+
+        """
+
+        get_extension_index = getattr(
+            self.extension_registry, "get_extension_index", None
+        )
+        if get_extension_index is not None:
+            return get_extension_index(extension_point_id, key)
+
+        extensions = self.get_extensions(extension_point_id)
+
+        return ExtensionIndex(key, lambda: extensions, threading.Lock())
+
+    def start_deferred_plugins(self):
+        """ Start any deferred plugins that have not been started yet.
+
+        This does nothing unless the application has a staged startup.
+
+        """
+
+        while self._start_next_deferred_plugin() is not None:
+            pass
+
     #### Trait initializers ###################################################
 
     def _extension_registry_default(self):
@@ -475,6 +570,54 @@ class Application(HasTraits):
 
     #### Methods ##############################################################
 
+    def _start_early_plugins(self):
+        """ Start all plugins except the deferred ones. """
+
+        deferred = [
+            plugin
+            for plugin in self.plugin_manager
+            if getattr(plugin, "startup_phase", "early") == "deferred"
+        ]
+
+        # If nothing is deferred then leave it to the plugin manager.
+        if len(deferred) == 0:
+            self.plugin_manager.start()
+            return
+
+        self._deferred_plugins = deferred
+        self._started_plugins = []
+        for plugin in self.plugin_manager:
+            if plugin not in deferred:
+                self.start_plugin(plugin)
+                self._started_plugins.append(plugin)
+
+    def _start_next_deferred_plugin(self):
+        """ Start the next deferred plugin.
+
+        Return the plugin, or None if there are no more deferred plugins to
+        start.
+
+        """
+
+        if len(self._deferred_plugins) == 0:
+            return None
+
+        plugin = self._deferred_plugins.pop(0)
+        self.start_plugin(plugin)
+        self._started_plugins.append(plugin)
+
+        return plugin
+
+    def _stop_started_plugins(self):
+        """ Stop the plugins that were started (in the reverse order). """
+
+        # Any deferred plugins that haven't been started yet never will be.
+        self._deferred_plugins = []
+
+        started, self._started_plugins = self._started_plugins, None
+        for plugin in reversed(started):
+            self.stop_plugin(plugin)
+
     def _create_application_event(self):
         """ Create an application event. """
 
@@ -9,8 +9,6 @@
 # Thanks for using Enthought open source!
 """ The Envisage core plugin. """
 
-from contextlib import closing
-
 # Enthought library imports.
 from envisage.extension_point import ExtensionPoint
 from envisage.plugin import Plugin
@@ -163,11 +161,23 @@ class CorePlugin(Plugin):
         # is exactly what happens in the preferences UI.
         default = self.application.preferences.node("default/")
 
-        # The resource manager is used to find the preferences files.
+        # The resource manager is used to find the preferences files. They are
+        # opened concurrently (so that slow HTTP or network file system reads
+        # overlap), but loaded in order so that later contributions override
+        # earlier ones.
         resource_manager = ResourceManager()
-        for resource_name in preferences:
-            with closing(resource_manager.file(resource_name)) as f:
-                default.load(f)
+        results = resource_manager.fetch_many(preferences)
+        try:
+            for result in results:
+                if result.error is not None:
+                    raise result.error
+
+                default.load(result.file)
+
+        finally:
+            for result in results:
+                if result.file is not None:
+                    result.file.close()
 
     def _register_service_offers(self, service_offers):
         """ Register a list of service offers. """
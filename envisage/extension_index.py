@@ -0,0 +1,184 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+""" An index of the extensions contributed to an extension point. """
+
+
+# Standard library imports.
+from collections.abc import Mapping
+
+# Marker for extensions that don't have the key attribute.
+_MISSING = object()
+
+
+class ExtensionIndex(Mapping):
+    """ An index of the extensions contributed to an extension point.
+
+    The index is a read-only mapping from the value of an attribute of the
+    extensions (the 'key', e.g. 'id') to the *first* extension with that
+    value. Extensions that don't have the attribute are not indexed.
+
+    Indexes are created by extension registries (see
+    'ExtensionRegistry.get_extension_index'), which keep them up to date as
+    extensions are added and removed. Note that changing the key attribute of
+    an extension that has already been contributed is not noticed.
+
+    """
+
+    def __init__(self, key, get_extensions, lock):
+        """ Constructor.
+
+        'key' is the name of the attribute to index the extensions by,
+        'get_extensions' is a callable that returns the current extensions,
+        and 'lock' is the lock that serializes changes to the extensions.
+
+        """
+
+        self.key = key
+
+        self._get_extensions = get_extensions
+        self._lock = lock
+
+        # The extensions with each key, in the order that they appear in the
+        # extension point, or None if the index needs to be rebuilt.
+        #
+        # e.g. {key : [extension, ...]}
+        self._buckets = None
+
+    ###########################################################################
+    # 'Mapping' interface.
+    ###########################################################################
+
+    def __getitem__(self, key):
+        """ Return the first extension with the specified key. """
+
+        return self._get_buckets()[key][0]
+
+    def __iter__(self):
+        """ Iterate over the keys of the extensions. """
+
+        return iter(list(self._get_buckets()))
+
+    def __len__(self):
+        """ Return the number of distinct keys. """
+
+        return len(self._get_buckets())
+
+    def __repr__(self):
+        """ Return a string representation of the index. """
+
+        return "%s(key=%r, %r)" % (type(self).__name__, self.key, dict(self))
+
+    ###########################################################################
+    # 'ExtensionIndex' interface.
+    ###########################################################################
+
+    def get_all(self, key):
+        """ Return all of the extensions with the specified key.
+
+        Return an empty list if there are no such extensions.
+
+        """
+
+        return list(self._get_buckets().get(key, ()))
+
+    def extensions_changed(self, event):
+        """ Update the index after the extensions have changed.
+
+        'event' is the 'ExtensionPointChangedEvent' describing the change, and
+        must be passed to the index *after* the change has been made.
+
+        """
+
+        with self._lock:
+            buckets = self._buckets
+            if buckets is None:
+                return
+
+            # The whole list was replaced, so we may as well start again.
+            if event.index is None:
+                self.reset()
+                return
+
+            for extension in event.removed:
+                key = self._key_of(extension)
+                if key is _MISSING:
+                    continue
+
+                bucket = buckets.get(key, [])
+                for i, item in enumerate(bucket):
+                    if item is extension:
+                        del bucket[i]
+                        break
+
+                # If we can't find the extension then its key has probably
+                # been changed since it was indexed.
+                else:
+                    self.reset()
+                    return
+
+                if len(bucket) == 0:
+                    del buckets[key]
+
+            # Added extensions go into a new bucket unless there are already
+            # extensions with the same key, in which case we rescan the
+            # extensions to find out which one comes first.
+            rescan = set()
+            for extension in event.added:
+                key = self._key_of(extension)
+                if key is _MISSING:
+                    continue
+
+                if key in buckets:
+                    rescan.add(key)
+
+                else:
+                    buckets[key] = [extension]
+
+            if len(rescan) > 0:
+                for key in rescan:
+                    buckets[key] = []
+
+                for extension in self._get_extensions():
+                    key = self._key_of(extension)
+                    if key in rescan:
+                        buckets[key].append(extension)
+
+    def reset(self):
+        """ Discard the index so that it is rebuilt when it is next used. """
+
+        with self._lock:
+            self._buckets = None
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _get_buckets(self):
+        """ Return the buckets, building them if necessary. """
+
+        buckets = self._buckets
+        if buckets is None:
+            with self._lock:
+                buckets = self._buckets
+                if buckets is None:
+                    buckets = {}
+                    for extension in self._get_extensions():
+                        key = self._key_of(extension)
+                        if key is not _MISSING:
+                            buckets.setdefault(key, []).append(extension)
+
+                    self._buckets = buckets
+
+        return buckets
+
+    def _key_of(self, extension):
+        """ Return the key of an extension (or _MISSING if it has none). """
+
+        return getattr(extension, self.key, _MISSING)
@@ -19,6 +19,7 @@ from traits.api import List, TraitType, Undefined, provides
 
 # Local imports.
 from .i_extension_point import IExtensionPoint
+from .read_only_list import ReadOnlyList
 
 
 # Exception message template.
@@ -105,6 +106,13 @@ class ExtensionPoint(TraitType):
         # Dict(weakref.ref(Any), Dict(Str, Callable))
         self._obj_to_listeners_map = weakref.WeakKeyDictionary()
 
+        # A dictionary containing the cached (and already validated) value of
+        # the extension point for each connected object. Entries are
+        # invalidated by the extension point listener installed in 'connect'.
+        #
+        # Dict(weakref.ref(Any), Dict(Str, (IExtensionRegistry, List)))
+        self._obj_to_cache_map = weakref.WeakKeyDictionary()
+
     def __repr__(self):
         """ String representation of an ExtensionPoint object """
         return "ExtensionPoint(id={!r})".format(self.id)
@@ -114,15 +122,42 @@ class ExtensionPoint(TraitType):
     ###########################################################################
 
     def get(self, obj, trait_name):
-        """ Trait type getter. """
+        """ Trait type getter.
+
+        The value is a read-only list. If the trait has been connected (see
+        'connect') the value is cached until the extension point changes.
+
+        """
 
         extension_registry = self._get_extension_registry(obj)
 
+        cache = self._obj_to_cache_map.get(obj)
+        if cache is not None:
+            registry_and_value = cache.get(trait_name)
+            if (
+                registry_and_value is not None
+                and registry_and_value[0] is extension_registry
+            ):
+                return registry_and_value[1]
+
         # Get the extensions to this extension point.
         extensions = extension_registry.get_extensions(self.id)
 
         # Make sure the contributions are of the appropriate type.
-        return self.trait_type.validate(obj, trait_name, extensions)
+        value = ReadOnlyList(
+            self.trait_type.validate(obj, trait_name, extensions)
+        )
+
+        # We can only cache the value if we will be told when it changes, and
+        # we are only told about changes to extension points that the registry
+        # knows about.
+        if cache is not None and trait_name in self._obj_to_listeners_map.get(
+            obj, {}
+        ):
+            if extension_registry.get_extension_point(self.id) is not None:
+                cache[trait_name] = (extension_registry, value)
+
+        return value
 
     def set(self, obj, name, value):
         """ Trait type setter. """
@@ -153,6 +188,12 @@ class ExtensionPoint(TraitType):
         def listener(extension_registry, event):
             """ Listener called when an extension point is changed. """
 
+            # Invalidate the cached value *before* anybody gets to hear about
+            # the change.
+            cache = self._obj_to_cache_map.get(obj)
+            if cache is not None:
+                cache.pop(trait_name, None)
+
             # If an index was specified then we fire an '_items' changed event.
             if event.index is not None:
                 name = trait_name + "_items"
@@ -177,6 +218,9 @@ class ExtensionPoint(TraitType):
         listeners = self._obj_to_listeners_map.setdefault(obj, {})
         listeners[trait_name] = listener
 
+        # Now that we will hear about changes, the value can be cached.
+        self._obj_to_cache_map.setdefault(obj, {}).pop(trait_name, None)
+
     def disconnect(self, obj, trait_name):
         """ Disconnect the extension point from a trait on an object. """
 
@@ -191,6 +235,7 @@ class ExtensionPoint(TraitType):
 
             # Clean up.
             del self._obj_to_listeners_map[obj][trait_name]
+            self._obj_to_cache_map.get(obj, {}).pop(trait_name, None)
 
     ###########################################################################
     # Private interface.
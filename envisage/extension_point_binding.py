@@ -14,7 +14,7 @@
 import weakref
 
 # Enthought library imports.
-from traits.api import Any, HasTraits, Instance, Str, Undefined
+from traits.api import Any, HasTraits, Instance, Str, TraitError, Undefined
 
 # Local imports.
 from .i_extension_registry import IExtensionRegistry
@@ -143,12 +143,58 @@ class ExtensionPointBinding(HasTraits):
     def _update_trait(self, event):
         """ Update the object's trait to the value of the extension point. """
 
-        self._set_trait(notify=False)
+        # Apply the change directly to the object's list if we can, rather
+        # than fetching the entire list of extensions again.
+        if not self._patch_trait(event):
+            self._set_trait(notify=False)
 
         self.obj.trait_property_changed(
             self.trait_name + "_items", Undefined, event
         )
 
+    def _patch_trait(self, event):
+        """ Apply the changes described by an event to the object's list.
+
+        The list is changed in place without firing any trait change events.
+        Returns False if the changes could not be applied (e.g. if the list
+        does not match what the event says was removed), in which case the
+        list is left unchanged.
+
+        """
+
+        index = event.index
+        if isinstance(index, slice):
+            if index.step not in (None, 1):
+                return False
+
+            index = index.start or 0
+
+        value = getattr(self.obj, self.trait_name)
+        if (
+            not isinstance(value, list)
+            or value is event.added
+            or value is event.removed
+        ):
+            return False
+
+        stop = index + len(event.removed)
+        if value[index:stop] != list(event.removed):
+            return False
+
+        # Validate the new items as the list would (if it is a trait list).
+        added = event.added
+        item_validator = getattr(value, "item_validator", None)
+        if item_validator is not None:
+            try:
+                added = [item_validator(item) for item in added]
+
+            except TraitError:
+                return False
+
+        list.__setitem__(value, slice(index, stop), added)
+
+        return True
+
     def _set_extensions(self, extensions):
         """ Set the extensions to an extension point. """
 
@@ -33,3 +33,153 @@ class ExtensionPointChangedEvent(TraitListEvent):
                     self.index,
                     self.removed,
                     self.added)
+
+
+def merge_events(first, second):
+    """ Merge two consecutive events for the same extension point.
+
+    Returns a single event equivalent to 'first' followed by 'second', or None
+    if the events cannot be merged (in which case they must be dispatched
+    separately).
+
+    Events that replace the whole list (i.e. with an index of None) can be
+    merged with any other event. Index events can only be merged if they are
+    both insertions into one contiguous range, or both deletions from one
+    contiguous range.
+
+    """
+
+    if first.index is None:
+        added = _apply(list(first.added), second)
+        if added is None:
+            return None
+
+        return ExtensionPointChangedEvent(
+            extension_point_id=first.extension_point_id,
+            added=added,
+            removed=first.removed,
+            index=None,
+        )
+
+    if second.index is None:
+        removed = _unapply(list(second.removed), first)
+        if removed is None:
+            return None
+
+        return ExtensionPointChangedEvent(
+            extension_point_id=first.extension_point_id,
+            added=second.added,
+            removed=removed,
+            index=None,
+        )
+
+    first_index = _normalize_index(first.index)
+    second_index = _normalize_index(second.index)
+    if isinstance(first_index, slice) or isinstance(second_index, slice):
+        return None
+
+    # Insertions into (or at either end of) the range that was inserted.
+    if not first.removed and not second.removed:
+        offset = second_index - first_index
+        if 0 <= offset <= len(first.added):
+            return ExtensionPointChangedEvent(
+                extension_point_id=first.extension_point_id,
+                added=(
+                    first.added[:offset] + second.added + first.added[offset:]
+                ),
+                removed=[],
+                index=first_index,
+            )
+
+    # Deletions immediately after or before the range that was deleted.
+    elif not first.added and not second.added:
+        if second_index == first_index:
+            return ExtensionPointChangedEvent(
+                extension_point_id=first.extension_point_id,
+                added=[],
+                removed=first.removed + second.removed,
+                index=first_index,
+            )
+
+        if second_index + len(second.removed) == first_index:
+            return ExtensionPointChangedEvent(
+                extension_point_id=first.extension_point_id,
+                added=[],
+                removed=second.removed + first.removed,
+                index=second_index,
+            )
+
+    return None
+
+
+def _normalize_index(index):
+    """ Return the start of an index that refers to a contiguous range.
+
+    Extended slices (and None) are returned unchanged.
+
+    """
+
+    if isinstance(index, slice) and index.step in (None, 1):
+        return index.start or 0
+
+    return index
+
+
+def _apply(extensions, event):
+    """ Apply an event to the list of extensions that it was fired for.
+
+    Returns the updated list, or None if the event cannot be applied.
+
+    """
+
+    index = _normalize_index(event.index)
+    if index is None:
+        return list(event.added)
+
+    if isinstance(index, slice):
+        # Extended slices are either replaced item for item, or deleted.
+        if event.added:
+            if len(event.added) != len(event.removed):
+                return None
+            extensions[index] = event.added
+
+        else:
+            del extensions[index]
+
+    else:
+        extensions[index:index + len(event.removed)] = event.added
+
+    return extensions
+
+
+def _unapply(extensions, event):
+    """ Undo an event on the list of extensions that it resulted in.
+
+    Returns the original list, or None if the event cannot be undone.
+
+    """
+
+    index = _normalize_index(event.index)
+    if index is None:
+        return list(event.removed)
+
+    if isinstance(index, slice):
+        start, step = index.start or 0, index.step
+        if step < 1:
+            return None
+
+        # Extended slices are either replaced item for item, or deleted.
+        if event.added:
+            if len(event.added) != len(event.removed):
+                return None
+            extensions[index] = event.removed
+
+        else:
+            positions = range(start, start + step * len(event.removed), step)
+            for position, extension in zip(positions, event.removed):
+                extensions.insert(position, extension)
+
+    else:
+        extensions[index:index + len(event.added)] = event.removed
+
+    return extensions
@@ -11,15 +11,24 @@
 
 
 # Standard library imports.
+import contextlib
+import functools
 import logging
+import threading
 import types
 import weakref
 
 # Enthought library imports.
-from traits.api import Dict, HasTraits, provides
+from traits.api import (
+    Any, Bool, Callable, Dict, Enum, HasTraits, Int, List, provides
+)
 
 # Local imports.
-from .extension_point_changed_event import ExtensionPointChangedEvent
+from .extension_point_changed_event import (
+    ExtensionPointChangedEvent,
+    merge_events,
+)
+from .extension_index import ExtensionIndex
 from .i_extension_registry import IExtensionRegistry
 from .unknown_extension_point import UnknownExtensionPoint
 
@@ -28,7 +37,7 @@ from .unknown_extension_point import UnknownExtensionPoint
 logger = logging.getLogger(__name__)
 
 
-def _saferef(listener):
+def _saferef(listener, callback=None):
     """
     Weak reference for a (possibly bound method) listener.
 
@@ -46,6 +55,9 @@ def _saferef(listener):
         Listener to return a weak reference for. This can be
         either a plain function, a bound method, or some other
         form of callable.
+    callback : callable, optional
+        Callable called with the weak reference when the listener is garbage
+        collected.
 
     Returns
     -------
@@ -56,14 +68,134 @@ def _saferef(listener):
 
     """
     if isinstance(listener, types.MethodType):
-        return weakref.WeakMethod(listener)
+        return weakref.WeakMethod(listener, callback)
     else:
-        return weakref.ref(listener)
+        return weakref.ref(listener, callback)
+
+
+class _WeakListenerSet:
+    """
+    An ordered collection of weakly referenced listeners.
+
+    Listeners are removed automatically (via weakref callbacks) when they are
+    garbage collected, so dead references never accumulate. Adding and
+    removing a listener are O(1), and the ``refs`` snapshot handed out for
+    dispatch is only rebuilt when the collection changes.
+
+    Parameters
+    ----------
+    on_change : callable, optional
+        Called with no arguments whenever the collection changes.
+    """
+
+    def __init__(self, on_change=None):
+        # The weak references to the listeners, in the order they were added.
+        # Only the keys are used: a dict is an insertion-ordered set.
+        self._refs = {}
+        self._snapshot = None
+        self._on_change = on_change
+
+        # Don't let the weakref callbacks keep the collection alive.
+        self_ref = weakref.ref(self)
+
+        def discard(ref):
+            collection = self_ref()
+            if collection is not None:
+                collection._discard(ref)
+
+        self._discard_callback = discard
+
+    def __len__(self):
+        return len(self._refs)
+
+    @property
+    def refs(self):
+        """
+        A tuple of weak references to the listeners, in the order that they
+        were added. The tuple is not affected by later changes.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._snapshot = tuple(self._refs)
+        return snapshot
+
+    def add(self, listener):
+        """
+        Add a listener. Adding a listener that is already present does
+        nothing.
+        """
+        ref = _saferef(listener, self._discard_callback)
+        if ref not in self._refs:
+            self._refs[ref] = None
+            self._changed()
+
+    def remove(self, listener):
+        """
+        Remove a listener.
+
+        Raises
+        ------
+        ValueError
+            If the listener is not in the collection.
+        """
+        try:
+            del self._refs[_saferef(listener)]
+        except KeyError:
+            raise ValueError(f"{listener!r} is not a listener") from None
+        self._changed()
+
+    def _discard(self, ref):
+        """ Remove the reference to a listener that has been collected. """
+        if ref in self._refs:
+            del self._refs[ref]
+            self._changed()
+
+    def _changed(self):
+        """ Invalidate the snapshot after a change. """
+        self._snapshot = None
+        if self._on_change is not None:
+            self._on_change()
 
 
 @provides(IExtensionRegistry)
 class ExtensionRegistry(HasTraits):
-    """ A base class for extension registry implementation. """
+    """ A base class for extension registry implementation.
+
+    The registry may be used from multiple threads. Changes to the registry
+    are serialized by a (reentrant) lock, while 'get_extensions' reads an
+    immutable snapshot of the extensions and so does not normally need to
+    take the lock. Listeners are called with the lock held, unless a
+    'listener_executor' is set, in which case they are called by the
+    executor (in the order that the changes were made).
+
+    """
+
+    #### 'ExtensionRegistry' interface ########################################
+
+    #: How extension point changed events are dispatched to listeners.
+    #:
+    #: - "immediate": listeners are called synchronously by each change.
+    #: - "deferred": events are queued, consecutive events for the same
+    #:   extension point are merged, and the queue is dispatched by
+    #:   'flush_events' (which is scheduled via 'flush_scheduler', if set).
+    #:
+    #: Note that until the queue is dispatched, connected 'ExtensionPoint'
+    #: traits (and anything else that relies on listeners) see the old
+    #: extensions.
+    dispatch_mode = Enum("immediate", "deferred")
+
+    #: In "deferred" mode, a callable used to schedule a call to
+    #: 'flush_events' when an event is queued, e.g. 'GUI.invoke_later' to
+    #: dispatch the events when the GUI event loop is next idle.
+    flush_scheduler = Callable()
+
+    #: A callable used to deliver events to listeners, e.g. 'GUI.invoke_later'
+    #: to call listeners on the GUI thread, or the 'submit' method of a
+    #: single-threaded 'concurrent.futures' executor. It is called with a
+    #: callable (that takes no arguments) for each event. If this is None (the
+    #: default) listeners are called directly by the thread that changed the
+    #: registry.
+    listener_executor = Callable()
 
     ###########################################################################
     # Protected 'ExtensionRegistry' interface.
@@ -78,9 +210,10 @@ class ExtensionRegistry(HasTraits):
     # Extension listeners.
     #
     # These are called when extensions are added to or removed from an
-    # extension point.
+    # extension point. Listeners are weakly referenced, and are removed
+    # automatically when they are garbage collected.
     #
-    # e.g. Dict(extension_point, [weakref.ref(callable)])
+    # e.g. Dict(extension_point, _WeakListenerSet)
     #
     # A listener is any Python callable with the following signature:-
     #
@@ -88,6 +221,57 @@ class ExtensionRegistry(HasTraits):
     #     ...
     _listeners = Dict
 
+    # The weak references to the listeners to each extension point (those
+    # listening to the extension point specifically first, followed by those
+    # listening to any extension point). This is cleared whenever any listener
+    # is added or removed.
+    #
+    # e.g. Dict(extension_point, (weakref.ref(callable), ...))
+    _listener_refs = Dict
+
+    # The queue of events waiting to be dispatched.
+    _pending_events = List
+
+    # The position in the queue of the most recent event for each extension
+    # point (i.e. the one that new events for the extension point are merged
+    # into).
+    _pending_positions = Dict
+
+    # The number of currently open 'deferred_dispatch' blocks.
+    _deferral_depth = Int
+
+    # Has a call to 'flush_events' been scheduled?
+    _flush_scheduled = Bool
+
+    # The lock that serializes changes to the registry.
+    _lock = Any
+
+    # Immutable snapshots of the extensions contributed to each extension
+    # point, as returned by 'get_extensions'. A snapshot is discarded whenever
+    # the extensions to its extension point change.
+    #
+    # e.g. Dict(extension_point, tuple)
+    _snapshots = Dict
+
+    # The indexes handed out by 'get_extension_index'. These are kept up to
+    # date by '_call_listeners'.
+    #
+    # e.g. Dict((extension_point, key), ExtensionIndex)
+    _indexes = Dict
+
+    ###########################################################################
+    # 'object' interface.
+    ###########################################################################
+
+    def __init__(self, **traits):
+        """ Constructor. """
+
+        # The lock is created before anything else so that it is never
+        # created lazily (and hence possibly twice) by concurrent threads.
+        self._lock = threading.RLock()
+
+        super().__init__(**traits)
+
     ###########################################################################
     # 'IExtensionRegistry' interface.
     ###########################################################################
@@ -95,19 +279,31 @@ class ExtensionRegistry(HasTraits):
     def add_extension_point_listener(self, listener, extension_point_id=None):
         """ Add a listener for extensions being added or removed. """
 
-        listeners = self._listeners.setdefault(extension_point_id, [])
-        listeners.append(_saferef(listener))
+        with self._lock:
+            self._get_listeners(extension_point_id).add(listener)
 
     def add_extension_point(self, extension_point):
         """ Add an extension point. """
 
-        self._extension_points[extension_point.id] = extension_point
+        with self._lock:
+            self._extension_points[extension_point.id] = extension_point
+            self._snapshots.pop(extension_point.id, None)
+            self._reset_indexes(extension_point.id)
+
         logger.debug("extension point <%s> added", extension_point.id)
 
     def get_extensions(self, extension_point_id):
         """ Return the extensions contributed to an extension point. """
 
-        return self._get_extensions(extension_point_id)[:]
+        snapshot = self._snapshots.get(extension_point_id)
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshots.get(extension_point_id)
+                if snapshot is None:
+                    snapshot = tuple(self._get_extensions(extension_point_id))
+                    self._snapshots[extension_point_id] = snapshot
+
+        return list(snapshot)
 
     def get_extension_point(self, extension_point_id):
         """ Return the extension point with the specified Id. """
@@ -124,47 +320,138 @@ class ExtensionRegistry(HasTraits):
     ):
         """ Remove a listener for extensions being added or removed. """
 
-        listeners = self._listeners.setdefault(extension_point_id, [])
-        listeners.remove(_saferef(listener))
+        with self._lock:
+            self._get_listeners(extension_point_id).remove(listener)
 
     def remove_extension_point(self, extension_point_id):
         """ Remove an extension point. """
 
-        self._check_extension_point(extension_point_id)
+        with self._lock:
+            self._check_extension_point(extension_point_id)
 
-        # Remove the extension point.
-        del self._extension_points[extension_point_id]
+            # Remove the extension point.
+            del self._extension_points[extension_point_id]
 
-        # Remove any extensions to the extension point.
-        if extension_point_id in self._extensions:
-            old = self._extensions[extension_point_id]
-            del self._extensions[extension_point_id]
+            # Remove any extensions to the extension point.
+            if extension_point_id in self._extensions:
+                old = self._extensions[extension_point_id]
+                del self._extensions[extension_point_id]
 
-        else:
-            old = []
+            else:
+                old = []
 
-        refs = self._get_listener_refs(extension_point_id)
-        self._call_listeners(refs, extension_point_id, [], old, 0)
+            refs = self._get_listener_refs(extension_point_id)
+            self._call_listeners(refs, extension_point_id, [], old, 0)
 
         logger.debug("extension point <%s> removed", extension_point_id)
 
     def set_extensions(self, extension_point_id, extensions):
         """ Set the extensions contributed to an extension point. """
 
-        self._check_extension_point(extension_point_id)
+        with self._lock:
+            self._check_extension_point(extension_point_id)
+
+            old = self._get_extensions(extension_point_id)
+            self._extensions[extension_point_id] = extensions
+
+            refs = self._get_listener_refs(extension_point_id)
+            self._call_listeners(
+                refs, extension_point_id, extensions, old, None
+            )
+
+    ###########################################################################
+    # 'ExtensionRegistry' interface.
+    ###########################################################################
+
+    @contextlib.contextmanager
+    def deferred_dispatch(self):
+        """ Return a context manager that defers dispatching events.
+
+        Events for changes made inside the block are queued (and consecutive
+        events for the same extension point merged) and then dispatched when
+        the outermost block exits, whatever the 'dispatch_mode'.
+
+        e.g.::
 
-        old = self._get_extensions(extension_point_id)
-        self._extensions[extension_point_id] = extensions
+            with registry.deferred_dispatch():
+                for extension in extensions:
+                    provider.extensions.append(extension)
 
-        refs = self._get_listener_refs(extension_point_id)
-        self._call_listeners(refs, extension_point_id, extensions, old, None)
+        """
+
+        with self._lock:
+            self._deferral_depth += 1
+
+        try:
+            yield
+
+        finally:
+            with self._lock:
+                self._deferral_depth -= 1
+                if self._deferral_depth == 0:
+                    self.flush_events()
+
+    def flush_events(self):
+        """ Dispatch any queued events to listeners. """
+
+        with self._lock:
+            self._flush_scheduled = False
+
+            events = self._pending_events
+            if not events:
+                return
+
+            self._pending_events = []
+            self._pending_positions = {}
+
+            for event in events:
+                refs = self._get_listener_refs(event.extension_point_id)
+                self._dispatch(refs, event)
+
+    def get_extension_index(self, extension_point_id, key="id"):
+        """ Return an index of the extensions to an extension point.
+
+        The index is a read-only mapping from the value of the attribute
+        called 'key' to the first extension with that value, e.g::
+
+            factory = registry.get_extension_index(TASKS).get(task_id)
+
+        The index is kept up to date as extensions are added and removed, so
+        it can be held on to and used for repeated lookups.
+
+        """
+
+        index = self._indexes.get((extension_point_id, key))
+        if index is None:
+            with self._lock:
+                index = self._indexes.get((extension_point_id, key))
+                if index is None:
+                    index = ExtensionIndex(
+                        key,
+                        functools.partial(
+                            self._get_extensions, extension_point_id
+                        ),
+                        self._lock,
+                    )
+                    self._indexes[(extension_point_id, key)] = index
+
+        return index
 
     ###########################################################################
     # Protected 'ExtensionRegistry' interface.
     ###########################################################################
 
     def _call_listeners(self, refs, extension_point_id, added, removed, index):
-        """ Call listeners that are listening to an extension point. """
+        """ Call listeners that are listening to an extension point.
+
+        If dispatch is deferred then the event is queued instead, and 'refs'
+        is ignored (the listeners are looked up when the event is dispatched).
+
+        This must be called for every change to the extensions, since it also
+        discards the snapshot of the extensions used by 'get_extensions' and
+        updates any indexes of the extensions.
+
+        """
 
         event = ExtensionPointChangedEvent(
             extension_point_id=extension_point_id,
@@ -173,10 +460,18 @@ class ExtensionRegistry(HasTraits):
             index=index,
         )
 
-        for ref in refs:
-            listener = ref()
-            if listener is not None:
-                listener(self, event)
+        with self._lock:
+            self._snapshots.pop(extension_point_id, None)
+
+            for (index_id, key), extension_index in self._indexes.items():
+                if index_id == extension_point_id:
+                    extension_index.extensions_changed(event)
+
+            if self._deferral_depth > 0 or self.dispatch_mode == "deferred":
+                self._queue_event(event)
+
+            else:
+                self._dispatch(refs, event)
 
     def _check_extension_point(self, extension_point_id):
         """ Check to see if the extension point exists.
@@ -193,17 +488,109 @@ class ExtensionRegistry(HasTraits):
 
         return self._extensions.setdefault(extension_point_id, [])
 
+    def _reset_indexes(self, extension_point_id=None):
+        """ Reset the indexes of the extensions to an extension point.
+
+        This is for changes that don't fire events (e.g. adding an extension
+        point that extensions have already been contributed to). If no
+        extension point is specified then all indexes are reset.
+
+        """
+
+        with self._lock:
+            for (index_id, key), extension_index in self._indexes.items():
+                if extension_point_id in (None, index_id):
+                    extension_index.reset()
+
     def _get_listener_refs(self, extension_point_id):
         """ Get weak references to all listeners to an extension point.
 
-        Returns a list containing the weak references to those listeners that
+        Returns a tuple containing the weak references to those listeners that
         are listening to this extension point specifically first, followed by
         those that are listening to any extension point.
 
         """
 
-        refs = []
-        refs.extend(self._listeners.get(extension_point_id, []))
-        refs.extend(self._listeners.get(None, []))
+        refs = self._listener_refs.get(extension_point_id)
+        if refs is None:
+            with self._lock:
+                refs = ()
+                if extension_point_id in self._listeners:
+                    refs += self._listeners[extension_point_id].refs
+                if None in self._listeners:
+                    refs += self._listeners[None].refs
+                self._listener_refs[extension_point_id] = refs
 
         return refs
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _dispatch(self, refs, event):
+        """ Deliver an event to listeners. """
+
+        if self.listener_executor is not None:
+            self.listener_executor(
+                functools.partial(self._notify, refs, event)
+            )
+
+        else:
+            self._notify(refs, event)
+
+    def _notify(self, refs, event):
+        """ Call listeners with an event. """
+
+        for ref in refs:
+            listener = ref()
+            if listener is not None:
+                listener(self, event)
+
+    def _queue_event(self, event):
+        """ Queue an event, merging it with the previous one if possible. """
+
+        position = self._pending_positions.get(event.extension_point_id)
+        if position is not None:
+            merged = merge_events(self._pending_events[position], event)
+            if merged is not None:
+                self._pending_events[position] = merged
+                return
+
+        self._pending_positions[event.extension_point_id] = len(
+            self._pending_events
+        )
+        self._pending_events.append(event)
+
+        if (
+            self.dispatch_mode == "deferred"
+            and self.flush_scheduler is not None
+            and not self._flush_scheduled
+        ):
+            self._flush_scheduled = True
+            self.flush_scheduler(self._scheduled_flush)
+
+    def _scheduled_flush(self):
+        """ Flush the queue of events when scheduled to do so. """
+
+        # If the flush happens inside a 'deferred_dispatch' block then leave
+        # the events for the block to dispatch.
+        with self._lock:
+            self._flush_scheduled = False
+            if self._deferral_depth == 0:
+                self.flush_events()
+
+    def _get_listeners(self, extension_point_id):
+        """ Return the listeners to an extension point, creating if needed. """
+
+        listeners = self._listeners.get(extension_point_id)
+        if listeners is None:
+            listeners = _WeakListenerSet(on_change=self._listeners_changed)
+            self._listeners[extension_point_id] = listeners
+
+        return listeners
+
+    def _listeners_changed(self):
+        """ Called when any listener is added or removed. """
+
+        with self._lock:
+            self._listener_refs.clear()
@@ -15,7 +15,7 @@ import os
 from os.path import exists, join
 
 # Enthought library imports.
-from traits.api import Instance, List, Property, Str, provides
+from traits.api import Enum, Instance, List, Property, Str, provides
 from traits.util.camel_case import camel_case_to_words
 
 # Local imports.
@@ -82,6 +82,16 @@ class Plugin(ExtensionProvider):
     #: The service registry that the object's services are stored in.
     service_registry = Property(Instance(IServiceRegistry))
 
+    #### 'Plugin' interface ###################################################
+
+    #: When the plugin should be started.
+    #:
+    #: "early" plugins are started when the application starts. If the
+    #: application has a staged startup (see 'Application.staged_startup')
+    #: then "deferred" plugins are started later, e.g. once the first window
+    #: has been shown. Otherwise they are started with everything else.
+    startup_phase = Enum("early", "deferred")
+
     #### Private interface ####################################################
 
     # The Ids of the services that were automatically registered.
@@ -13,6 +13,7 @@
 - :class:`~.IPythonKernelPlugin`
 - :attr:`~.IPYTHON_KERNEL_PROTOCOL`
 - :class:`~.IPythonKernelUIPlugin`
+- :class:`~.KernelStatistics`
 """
 from envisage.plugins.ipython_kernel.actions import StartQtConsoleAction
 from envisage.plugins.ipython_kernel.internal_ipkernel import InternalIPKernel
@@ -22,3 +23,4 @@ from envisage.plugins.ipython_kernel.ipython_kernel_plugin import (
 from envisage.plugins.ipython_kernel.ipython_kernel_ui_plugin import (
     IPythonKernelUIPlugin,
 )
+from envisage.plugins.ipython_kernel.kernel_statistics import KernelStatistics
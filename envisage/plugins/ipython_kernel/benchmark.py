@@ -0,0 +1,335 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+""" Measure the responsiveness of an embedded IPython kernel.
+
+Run with::
+
+    python -m envisage.plugins.ipython_kernel.benchmark
+
+An InternalIPKernel is started in this process, running on the main thread,
+and a client on a background thread connects to it over zmq just as an
+external console would. The report gives the round-trip times of execute
+requests and heartbeats, the throughput of output published on IOPub, and
+the kernel's own statistics.
+"""
+
+import argparse
+import contextlib
+import math
+import threading
+import time
+
+import jupyter_client
+import tornado.ioloop
+import zmq
+
+from envisage.plugins.ipython_kernel.internal_ipkernel import InternalIPKernel
+
+#: How long to wait for any one reply from the kernel, in seconds.
+TIMEOUT = 30.0
+
+
+def percentile(samples, fraction):
+    """ Return a percentile of some samples (using the nearest rank).
+
+    Parameters
+    ----------
+    samples -- list of float
+        The samples. There must be at least one.
+    fraction -- float
+        The fraction of samples that are at most the percentile, between 0
+        and 1 (e.g. 0.99 for the 99th percentile).
+    """
+    ordered = sorted(samples)
+    rank = max(math.ceil(fraction * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(samples):
+    """ Summarize round-trip times.
+
+    Returns
+    -------
+    dict
+        A dictionary with keys "count", "p50", "p99" and "max".
+    """
+    return dict(
+        count=len(samples),
+        p50=percentile(samples, 0.5),
+        p99=percentile(samples, 0.99),
+        max=max(samples),
+    )
+
+
+def run_benchmark(executes=200, heartbeats=200, lines=10000, line_length=80):
+    """ Benchmark an embedded kernel.
+
+    Parameters
+    ----------
+    executes -- int
+        The number of (trivial) execute requests to time.
+    heartbeats -- int
+        The number of heartbeats to time, both while the kernel is idle and
+        while it is busy.
+    lines -- int
+        The number of lines that the kernel prints to measure throughput.
+    line_length -- int
+        The length of each of those lines.
+
+    Returns
+    -------
+    dict
+        The results, with keys "execute" and "heartbeat_idle" (summaries of
+        round-trip times, as returned by 'summarize'), "heartbeat_busy" (ditto,
+        or None if the kernel finished printing before any heartbeat was
+        timed), "output" (a dictionary with keys "messages", "characters" and
+        "seconds") and "statistics" (the kernel's statistics, as returned by
+        'KernelStatistics.snapshot').
+    """
+    kernel = InternalIPKernel()
+    kernel.init_ipkernel()
+    try:
+        io_loop = tornado.ioloop.IOLoop.current()
+        results = {}
+        errors = []
+
+        def drive():
+            try:
+                results.update(
+                    _drive(
+                        kernel.ipkernel.connection_file,
+                        executes=executes,
+                        heartbeats=heartbeats,
+                        lines=lines,
+                        line_length=line_length,
+                    )
+                )
+            except BaseException as exc:
+                errors.append(exc)
+            finally:
+                io_loop.add_callback(io_loop.stop)
+
+        client_thread = threading.Thread(target=drive, name="kernel-client")
+        client_thread.start()
+
+        # This runs the kernel's IO loop until the client is done.
+        kernel.ipkernel.start()
+        client_thread.join()
+        if errors:
+            raise errors[0]
+
+        results["statistics"] = kernel.statistics.snapshot()
+
+    finally:
+        kernel.shutdown()
+
+    return results
+
+
+def format_results(results):
+    """ Format the results of a benchmark as a human-readable report. """
+
+    def times(name, summary):
+        if summary is None:
+            return "{:<24}(no samples)".format(name)
+
+        return "{:<24}p50 {:8.3f} ms  p99 {:8.3f} ms  max {:8.3f} ms".format(
+            name,
+            summary["p50"] * 1e3,
+            summary["p99"] * 1e3,
+            summary["max"] * 1e3,
+        )
+
+    output = results["output"]
+    seconds = output["seconds"]
+    statistics = results["statistics"]
+
+    lines = [
+        times("execute round trip", results["execute"]),
+        times("heartbeat (idle)", results["heartbeat_idle"]),
+        times("heartbeat (busy)", results["heartbeat_busy"]),
+        "{:<24}{:.0f} messages/s  {:.0f} characters/s".format(
+            "output throughput",
+            output["messages"] / seconds,
+            output["characters"] / seconds,
+        ),
+        "",
+        "kernel statistics:",
+    ]
+    for msg_type, counters in sorted(statistics["requests"].items()):
+        lines.append(
+            "  {:<22}{:6d} handled  mean {:8.3f} ms  max {:8.3f} ms".format(
+                msg_type,
+                counters["count"],
+                counters["total_time"] / counters["count"] * 1e3,
+                counters["max_time"] * 1e3,
+            )
+        )
+    lines.append(
+        "  {:<22}{:6d} messages  {} bytes".format(
+            "iopub", statistics["iopub_messages"], statistics["iopub_bytes"]
+        )
+    )
+
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """ Run the benchmark from the command line. """
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--executes", type=int, default=200)
+    parser.add_argument("--heartbeats", type=int, default=200)
+    parser.add_argument("--lines", type=int, default=10000)
+    parser.add_argument("--line-length", type=int, default=80)
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(
+        executes=args.executes,
+        heartbeats=args.heartbeats,
+        lines=args.lines,
+        line_length=args.line_length,
+    )
+    print(format_results(results))
+
+
+# Private functions ###########################################################
+
+
+def _drive(connection_file, executes, heartbeats, lines, line_length):
+    """ Connect to a kernel and run the benchmark against it. """
+
+    client = jupyter_client.BlockingKernelClient(
+        connection_file=connection_file
+    )
+    client.load_connection_file()
+    client.start_channels()
+    context = zmq.Context()
+    try:
+        client.wait_for_ready(timeout=TIMEOUT)
+        info = client.get_connection_info()
+        separator = ":" if info["transport"] == "tcp" else "-"
+        heartbeat_url = "{}://{}{}{}".format(
+            info["transport"], info["ip"], separator, info["hb_port"]
+        )
+
+        with _heartbeat_socket(context, heartbeat_url) as socket:
+            heartbeat_idle = [_ping(socket) for _ in range(heartbeats)]
+
+        execute_times = []
+        for _ in range(executes):
+            start = time.perf_counter()
+            msg_id = client.execute("pass", store_history=False)
+            _wait_for_reply(client, msg_id)
+            execute_times.append(time.perf_counter() - start)
+            _collect_output(client, msg_id)
+
+        # Time heartbeats while the kernel is busy printing.
+        busy = threading.Event()
+        heartbeat_busy = []
+
+        def ping_while_busy():
+            with _heartbeat_socket(context, heartbeat_url) as socket:
+                busy.wait(TIMEOUT)
+                while busy.is_set() and len(heartbeat_busy) < heartbeats:
+                    heartbeat_busy.append(_ping(socket))
+
+        ping_thread = threading.Thread(target=ping_while_busy)
+        ping_thread.start()
+        try:
+            code = "for _ in range({}):\n    print({!r})".format(
+                lines, "x" * line_length
+            )
+            start = time.perf_counter()
+            msg_id = client.execute(code, store_history=False)
+            busy.set()
+            messages, characters = _collect_output(client, msg_id)
+            seconds = time.perf_counter() - start
+        finally:
+            busy.clear()
+            ping_thread.join()
+
+        _wait_for_reply(client, msg_id)
+
+    finally:
+        context.destroy(linger=0)
+        client.stop_channels()
+
+    return dict(
+        execute=summarize(execute_times),
+        heartbeat_idle=summarize(heartbeat_idle),
+        heartbeat_busy=summarize(heartbeat_busy) if heartbeat_busy else None,
+        output=dict(messages=messages, characters=characters, seconds=seconds),
+    )
+
+
+@contextlib.contextmanager
+def _heartbeat_socket(context, url):
+    """ Connect a socket to the kernel's heartbeat. """
+
+    socket = context.socket(zmq.REQ)
+    socket.linger = 0
+    socket.connect(url)
+    try:
+        # Make sure that the connection is made before anything is timed.
+        _ping(socket)
+        yield socket
+
+    finally:
+        socket.close()
+
+
+def _ping(socket):
+    """ Time one heartbeat. """
+
+    start = time.perf_counter()
+    socket.send(b"ping")
+    if not socket.poll(TIMEOUT * 1e3):
+        raise RuntimeError("The kernel's heartbeat did not reply")
+    socket.recv()
+
+    return time.perf_counter() - start
+
+
+def _wait_for_reply(client, msg_id):
+    """ Wait for the reply to a request. """
+
+    while True:
+        reply = client.get_shell_msg(timeout=TIMEOUT)
+        if reply["parent_header"].get("msg_id") == msg_id:
+            return reply
+
+
+def _collect_output(client, msg_id):
+    """ Collect the output of a request until the kernel is idle again.
+
+    Returns the number of stream messages and the number of characters in
+    them.
+    """
+    messages = characters = 0
+    while True:
+        msg = client.get_iopub_msg(timeout=TIMEOUT)
+        if msg["parent_header"].get("msg_id") != msg_id:
+            continue
+
+        if msg["msg_type"] == "stream":
+            messages += 1
+            characters += len(msg["content"]["text"])
+
+        elif (
+            msg["msg_type"] == "status"
+            and msg["content"]["execution_state"] == "idle"
+        ):
+            return messages, characters
+
+
+if __name__ == "__main__":
+    main()
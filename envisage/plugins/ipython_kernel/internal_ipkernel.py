@@ -15,10 +15,12 @@ https://github.com/ipython/ipython/blob/2.x/examples/Embedding/internal_ipkernel
 """
 
 import atexit
+import concurrent.futures
 import warnings
 
 import ipykernel.connect
 
+from envisage.plugins.ipython_kernel.kernel_statistics import KernelStatistics
 from envisage.plugins.ipython_kernel.kernelapp import IPKernelApp
 from traits.api import Any, HasStrictTraits, Instance, List
 
@@ -63,9 +65,25 @@ class InternalIPKernel(HasStrictTraits):
     #: This is a list of tuples (name, value).
     initial_namespace = List()
 
+    #: Statistics on the work done by the kernel, for monitoring. This is
+    #: None until the kernel has been initialized, and is kept after the
+    #: kernel has been shut down.
+    statistics = Instance(KernelStatistics)
+
+    #: A future that completes once the kernel's sockets have been set up in
+    #: the background. This is None unless 'init_ipkernel_in_background' has
+    #: been called, and the initialization has not been finished yet.
+    _sockets_ready = Instance(concurrent.futures.Future)
+
+    #: The kernel whose sockets are being set up in the background.
+    _background_ipkernel = Instance(IPKernelApp)
+
     def init_ipkernel(self, gui_backend=None):
         """ Initialize the IPython kernel.
 
+        If 'init_ipkernel_in_background' has been called, this waits for the
+        kernel's sockets to be set up, and then finishes the initialization.
+
         Parameters
         ----------
         gui_backend -- string, optional
@@ -99,13 +117,59 @@ class InternalIPKernel(HasStrictTraits):
                 DeprecationWarning,
             )
 
-        # Start IPython kernel with GUI event loop support
-        self.ipkernel = _gui_kernel(gui_backend)
+        if self._sockets_ready is not None:
+            # Finish initializing the kernel whose sockets were set up in the
+            # background.
+            self._sockets_ready.result()
+            kernel = self._background_ipkernel
+            kernel.finish_initialize()
+            self._sockets_ready = None
+            self._background_ipkernel = None
+        else:
+            # Start IPython kernel with GUI event loop support
+            kernel = _gui_kernel(gui_backend)
+
+        self.ipkernel = kernel
+        self.statistics = self.ipkernel.statistics
 
         # This application will also act on the shell user namespace
         self.namespace = self.ipkernel.shell.user_ns
         self.namespace.update(dict(self.initial_namespace))
 
+    def init_ipkernel_in_background(self):
+        """ Start initializing the IPython kernel on a background thread.
+
+        Only the kernel's sockets (and the threads that serve them) are set
+        up in the background. The rest of the initialization changes
+        process-wide state (such as sys.stdout and sys.excepthook), and the
+        kernel's streams are attached to the IO loop of the thread that
+        creates them, so it is left to 'init_ipkernel', which must be called
+        from the main thread once the sockets are ready.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            A future that completes, with this object as its result, once
+            the kernel's sockets have been set up.
+        """
+        kernel = self._background_ipkernel = IPKernelApp.instance(
+            capture_fd_output=False
+        )
+
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="ipkernel"
+        )
+        try:
+            self._sockets_ready = executor.submit(
+                self._init_sockets_on_thread, kernel
+            )
+        finally:
+            # The thread is only needed for this one job, and goes away once
+            # the job is done.
+            executor.shutdown(wait=False)
+
+        return self._sockets_ready
+
     def new_qt_console(self):
         """ Start a new qtconsole connected to our kernel. """
         console = ipykernel.connect.connect_qtconsole(
@@ -128,6 +192,16 @@ class InternalIPKernel(HasStrictTraits):
 
         Existing IPython consoles are killed first.
         """
+        if self._sockets_ready is not None:
+            # The kernel's initialization was started in the background but
+            # never finished, so only its sockets need to be closed.
+            sockets_ready, self._sockets_ready = self._sockets_ready, None
+            kernel, self._background_ipkernel = self._background_ipkernel, None
+            if sockets_ready.exception() is None:
+                kernel.close()
+                atexit.unregister(kernel.close)
+            IPKernelApp.clear_instance()
+
         if self.ipkernel is not None:
             self.cleanup_consoles()
             self.ipkernel.close()
@@ -138,3 +212,16 @@ class InternalIPKernel(HasStrictTraits):
 
             # Remove stored singleton to facilitate garbage collection.
             IPKernelApp.clear_instance()
+
+    def _init_sockets_on_thread(self, kernel):
+        """ Set up the kernel's sockets on the current (background) thread.
+
+        Parameters
+        ----------
+        kernel -- IPKernelApp
+            The kernel to initialize. The steps of its initialization that
+            must happen on the main thread are put off until its
+            'finish_initialize' method is called.
+        """
+        kernel.initialize(["python"])
+        return self
@@ -10,6 +10,7 @@
 
 """ An IPython kernel plugin. """
 
+import concurrent.futures
 import logging
 import warnings
 
@@ -72,6 +73,29 @@ class IPythonKernelPlugin(Plugin):
     #: when creating the plugin.
     init_ipkernel = Bool(False)
 
+    #: Whether to start initializing the kernel on a background thread as
+    #: soon as the plugin is started, instead of when the service is first
+    #: used. Only the kernel's sockets are set up in the background; the rest
+    #: of the initialization, which changes process-wide state such as
+    #: sys.stdout, is finished on the main thread when the service is first
+    #: requested.
+    init_ipkernel_in_background = Bool(False)
+
+    #: A future that completes, with the InternalIPKernel as its result, once
+    #: the kernel's sockets have been set up in the background. This is None
+    #: unless the plugin has been started with
+    #: ``init_ipkernel_in_background=True``.
+    kernel_ready = Instance(concurrent.futures.Future)
+
+    def start(self):
+        """ Start the plugin. """
+        if self.init_ipkernel_in_background:
+            logger.debug(
+                "Initializing the embedded IPython kernel in the background"
+            )
+            kernel = self._kernel = self._new_kernel()
+            self.kernel_ready = kernel.init_ipkernel_in_background()
+
     def stop(self):
         """ Stop the plugin. """
         self._destroy_kernel()
@@ -82,7 +106,13 @@ class IPythonKernelPlugin(Plugin):
     _kernel = Instance(IPYTHON_KERNEL_PROTOCOL)
 
     def _create_kernel(self):
-        from .internal_ipkernel import InternalIPKernel
+        # A kernel that is being initialized in the background is provided
+        # once it is ready, and its initialization is finished here (on the
+        # main thread).
+        if self.kernel_ready is not None:
+            kernel = self.kernel_ready.result()
+            kernel.init_ipkernel()
+            return kernel
 
         # This shouldn't happen with a normal lifecycle, but add a warning
         # just in case.
@@ -94,10 +124,7 @@ class IPythonKernelPlugin(Plugin):
             return
 
         logger.debug("Creating the embedded IPython kernel")
-        kernel = self._kernel = InternalIPKernel()
-        bind_extension_point(
-            kernel, "initial_namespace", IPYTHON_NAMESPACE, self.application
-        )
+        kernel = self._kernel = self._new_kernel()
         if self.init_ipkernel:
             kernel.init_ipkernel()
         else:
@@ -117,6 +144,11 @@ class IPythonKernelPlugin(Plugin):
         """
         Destroy any existing kernel.
         """
+        kernel_ready, self.kernel_ready = self.kernel_ready, None
+        if kernel_ready is not None:
+            # Let any initialization that is in progress finish first.
+            concurrent.futures.wait([kernel_ready])
+
         if self._kernel is None:
             return
 
@@ -124,6 +156,18 @@ class IPythonKernelPlugin(Plugin):
         self._kernel.shutdown()
         self._kernel = None
 
+    def _new_kernel(self):
+        """
+        Create a new (uninitialized) kernel.
+        """
+        from .internal_ipkernel import InternalIPKernel
+
+        kernel = InternalIPKernel()
+        bind_extension_point(
+            kernel, "initial_namespace", IPYTHON_NAMESPACE, self.application
+        )
+        return kernel
+
     def _service_offers_default(self):
         ipython_kernel_service_offer = ServiceOffer(
             protocol=IPYTHON_KERNEL_PROTOCOL, factory=self._create_kernel,
@@ -0,0 +1,111 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+""" Counters describing the work done by an embedded IPython kernel. """
+
+import threading
+
+from traits.api import Any, HasStrictTraits
+
+
+class KernelStatistics(HasStrictTraits):
+    """ Counters describing the work done by an embedded IPython kernel.
+
+    The kernel updates the counters as it handles requests and publishes
+    output, possibly from several threads. Use 'snapshot' to read them (for
+    example, to feed them to a monitoring system).
+    """
+
+    #### Private interface ####################################################
+
+    # The number of requests handled, and the total and longest time taken to
+    # handle them, keyed by message type.
+    #
+    # e.g. Dict(Str, List(Int, Float, Float))
+    _requests = Any
+
+    # The number of messages published on the IOPub channel.
+    _iopub_messages = Any
+
+    # The number of bytes published on the IOPub channel.
+    _iopub_bytes = Any
+
+    # The lock that protects the counters.
+    _lock = Any
+
+    def __init__(self, **traits):
+        """ Constructor. """
+
+        # The lock is created up front as it is used by the kernel's threads.
+        self._lock = threading.Lock()
+        self._requests = {}
+        self._iopub_messages = 0
+        self._iopub_bytes = 0
+
+        super().__init__(**traits)
+
+    def record_request(self, msg_type, duration):
+        """ Record that the kernel has handled a request.
+
+        Parameters
+        ----------
+        msg_type -- str
+            The type of the request message, e.g. "execute_request".
+        duration -- float
+            The time taken to handle the request, in seconds.
+        """
+        with self._lock:
+            counters = self._requests.setdefault(msg_type, [0, 0.0, 0.0])
+            counters[0] += 1
+            counters[1] += duration
+            counters[2] = max(counters[2], duration)
+
+    def record_iopub_message(self, size):
+        """ Record that the kernel has published a message on IOPub.
+
+        Parameters
+        ----------
+        size -- int
+            The size of the message, in bytes.
+        """
+        with self._lock:
+            self._iopub_messages += 1
+            self._iopub_bytes += size
+
+    def reset(self):
+        """ Reset all of the counters to zero. """
+
+        with self._lock:
+            self._requests = {}
+            self._iopub_messages = 0
+            self._iopub_bytes = 0
+
+    def snapshot(self):
+        """ Return the current values of the counters.
+
+        Returns
+        -------
+        dict
+            A dictionary with keys "requests" (a dictionary mapping each type
+            of request handled to a dictionary with keys "count",
+            "total_time" and "max_time"), "iopub_messages" and "iopub_bytes".
+        """
+        with self._lock:
+            return dict(
+                requests={
+                    msg_type: dict(
+                        count=count, total_time=total_time, max_time=max_time
+                    )
+                    for msg_type, (count, total_time, max_time)
+                    in self._requests.items()
+                },
+                iopub_messages=self._iopub_messages,
+                iopub_bytes=self._iopub_bytes,
+            )
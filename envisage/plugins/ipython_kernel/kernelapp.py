@@ -17,14 +17,18 @@ import atexit
 import logging
 import os
 import sys
+import threading
+import time
 
 import ipykernel.ipkernel
 import ipykernel.kernelapp
 import ipykernel.zmqshell
 import IPython.utils.io
+import tornado.gen
 import zmq
 
 from envisage.plugins.ipython_kernel.heartbeat import Heartbeat
+from envisage.plugins.ipython_kernel.kernel_statistics import KernelStatistics
 
 
 # Envisage is not currently compatible with ipykernel >= 6 or IPython >= 8. See
@@ -52,6 +56,11 @@ class IPKernelApp(ipykernel.kernelapp.IPKernelApp):
     Patched version of the IPKernelApp, mostly to support clean shutdown.
     """
 
+    # Whether the steps of the initialization that change process-wide state
+    # were put off, because the application was initialized off the main
+    # thread. They are done by 'finish_initialize'.
+    _deferred_init = False
+
     # Methods overridden from the base class ##################################
 
     def init_heartbeat(self):
@@ -159,13 +168,62 @@ class IPKernelApp(ipykernel.kernelapp.IPKernelApp):
 
     # Methods extending the base class methods ################################
 
+    def init_blackhole(self):
+        """
+        Redirect sys.stdout and sys.stderr to os.devnull, if requested.
+
+        Extended to be put off until 'finish_initialize' when the
+        application is initialized off the main thread.
+        """
+        if self._defer_init():
+            return
+        super().init_blackhole()
+
+    def init_signal(self):
+        """
+        Set up signal handling.
+
+        Extended to be put off until 'finish_initialize' when the
+        application is initialized off the main thread (signal handlers can
+        only be installed from the main thread).
+        """
+        if self._defer_init():
+            return
+        super().init_signal()
+
+    def init_path(self):
+        """
+        Add the current working directory to sys.path.
+
+        Extended to be put off until 'finish_initialize' when the
+        application is initialized off the main thread.
+        """
+        if self._defer_init():
+            return
+        super().init_path()
+
+    def init_shell(self):
+        """
+        Keep a reference to the kernel's shell.
+
+        Extended to be put off until 'finish_initialize' when the
+        application is initialized off the main thread, as the kernel (and
+        so its shell) is only created then.
+        """
+        if self._defer_init():
+            return
+        super().init_shell()
+
     def init_crash_handler(self):
         """
         Set up a suitable exception hook.
 
         Extended to keep track of the original sys.excepthook value, so that it
-        can be restored later.
+        can be restored later, and to be put off until 'finish_initialize'
+        when the application is initialized off the main thread.
         """
+        if self._defer_init():
+            return
         self._original_sys_excepthook = sys.excepthook
         super().init_crash_handler()
 
@@ -174,8 +232,11 @@ class IPKernelApp(ipykernel.kernelapp.IPKernelApp):
         Redirect input streams and set a display hook.
 
         Extended to store the original sys attributes so that they
-        can be restored later.
+        can be restored later, and to be put off until 'finish_initialize'
+        when the application is initialized off the main thread.
         """
+        if self._defer_init():
+            return
         if self.outstream_class:
             self._original_sys_stdout = sys.stdout
             self._original_sys_stderr = sys.stderr
@@ -191,7 +252,18 @@ class IPKernelApp(ipykernel.kernelapp.IPKernelApp):
 
         Extended to store the original values of IPython.utils.io.stdout
         and IPython.utils.io.stderr, so that they can be restored later.
+
+        Also extended to keep statistics (in the new 'statistics'
+        attribute) on the requests the kernel handles and on the messages
+        it publishes.
+
+        This is put off until 'finish_initialize' when the application is
+        initialized off the main thread, as the kernel's streams are
+        attached to the IO loop of the thread that creates them, and its
+        shell uses the output streams set up by init_io.
         """
+        if self._defer_init():
+            return
         self._original_ipython_utils_io_stdout = getattr(
             IPython.utils.io, "stdout", _MISSING
         )
@@ -200,8 +272,89 @@ class IPKernelApp(ipykernel.kernelapp.IPKernelApp):
         )
         super().init_kernel()
 
+        self.statistics = KernelStatistics()
+        self.init_statistics()
+
     # New methods, mostly to control shutdown #################################
 
+    def finish_initialize(self):
+        """
+        Finish initializing the application on the main thread.
+
+        When the application is initialized off the main thread, only the
+        kernel's sockets (and the threads that serve them) are set up. The
+        steps that change process-wide state (sys.stdout, sys.stderr,
+        sys.displayhook, sys.excepthook, sys.path and the signal handlers)
+        and the creation of the kernel itself are put off until this method
+        is called. It does nothing if nothing was put off.
+        """
+        if not self._deferred_init:
+            return
+
+        if threading.current_thread() is not threading.main_thread():
+            raise RuntimeError(
+                "The kernel's initialization must be finished on the main "
+                "thread."
+            )
+
+        self._deferred_init = False
+
+        # The remaining steps of the base class initialize method, in order.
+        self.init_crash_handler()
+        self.init_blackhole()
+        self.init_io()
+        self.init_signal()
+        self.init_kernel()
+        self.init_path()
+        self.init_shell()
+        if self.shell:
+            self.init_gui_pylab()
+            self.init_extensions()
+            self.init_code()
+
+    def init_statistics(self):
+        """
+        Make the kernel update the statistics as it goes.
+
+        The handler for each type of request is wrapped to time it, and
+        every message sent through the IOPub thread is counted.
+        """
+        statistics = self.statistics
+
+        def timed(msg_type, handler):
+            @tornado.gen.coroutine
+            def timed_handler(stream, idents, msg):
+                start = time.perf_counter()
+                try:
+                    # Handlers may or may not be coroutines.
+                    result = handler(stream, idents, msg)
+                    if result is not None:
+                        yield result
+                finally:
+                    statistics.record_request(
+                        msg_type, time.perf_counter() - start
+                    )
+
+            return timed_handler
+
+        kernel = self.kernel
+        for handlers in (kernel.shell_handlers, kernel.control_handlers):
+            for msg_type, handler in list(handlers.items()):
+                handlers[msg_type] = timed(msg_type, handler)
+
+        # Both the kernel's IOPub socket and its output streams send their
+        # messages through the IOPub thread.
+        iopub_thread = self.iopub_thread
+        send_multipart = iopub_thread.send_multipart
+
+        def counted_send_multipart(msg_parts, *args, **kwargs):
+            statistics.record_iopub_message(
+                sum(len(part) for part in msg_parts)
+            )
+            return send_multipart(msg_parts, *args, **kwargs)
+
+        iopub_thread.send_multipart = counted_send_multipart
+
     def close(self):
         """
         Undo the effects of the initialize method:
@@ -213,16 +366,21 @@ class IPKernelApp(ipykernel.kernelapp.IPKernelApp):
         # v5.1.2, along with an atexit handler for that method. See
         # https://github.com/ipython/ipykernel/pull/412. For ipykernel versions
         # of 5.1.2 or later, this method overrides the base class version.
-        self.close_shell()
-        self.close_kernel()
-        self.close_io()
+
+        # If the initialization was never finished then only the sockets
+        # (and the connection file) were set up.
+        if not self._deferred_init:
+            self.close_shell()
+            self.close_kernel()
+            self.close_io()
         self.close_heartbeat()
         self.close_sockets()
 
         self.cleanup_connection_file()
         atexit.unregister(self.cleanup_connection_file)
 
-        self.close_crash_handler()
+        if not self._deferred_init:
+            self.close_crash_handler()
         self.close_profile_dir()
         self.cleanup_singletons()
 
@@ -328,6 +486,9 @@ class IPKernelApp(ipykernel.kernelapp.IPKernelApp):
         """
         iopub_socket = self.iopub_thread.socket
 
+        # Stop counting messages.
+        vars(self.iopub_thread).pop("send_multipart", None)
+
         # Remove the atexit handler that's registered.
         self.iopub_thread.stop()
         atexit.unregister(self.iopub_thread.stop)
@@ -387,3 +548,15 @@ class IPKernelApp(ipykernel.kernelapp.IPKernelApp):
         # and prevent a clean recreation of a new kernel app.
         ipykernel.zmqshell.ZMQInteractiveShell.clear_instance()
         ipykernel.ipkernel.IPythonKernel.clear_instance()
+
+    def _defer_init(self):
+        """
+        Return True if an initialization step that changes process-wide
+        state must be put off, because the application is being initialized
+        off the main thread.
+        """
+        if threading.current_thread() is threading.main_thread():
+            return False
+
+        self._deferred_init = True
+        return True
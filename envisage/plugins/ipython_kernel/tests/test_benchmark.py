@@ -0,0 +1,80 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import os
+import shutil
+import tempfile
+import unittest
+
+# Envisage is not currently compatible with ipykernel >= 6 or IPython >= 8. See
+# enthought/envisage#448.
+try:
+    import ipykernel
+    import IPython
+except ImportError:
+    ipykernel_available = False
+else:
+    ipykernel_available = (
+        ipykernel.version_info < (6,)
+        and IPython.version_info < (8,)
+    )
+
+if ipykernel_available:
+    from envisage.plugins.ipython_kernel.benchmark import (
+        format_results,
+        percentile,
+        run_benchmark,
+    )
+
+
+@unittest.skipUnless(
+    ipykernel_available, "skipping tests that require the ipykernel package"
+)
+class TestBenchmark(unittest.TestCase):
+    def setUp(self):
+        # Make sure that IPython-related files are written to a temporary
+        # directory instead of the home directory.
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+
+        self._old_ipythondir = os.environ.get("IPYTHONDIR")
+        os.environ["IPYTHONDIR"] = tmpdir
+
+    def tearDown(self):
+        # Restore previous state of the IPYTHONDIR environment variable.
+        old_ipythondir = self._old_ipythondir
+        if old_ipythondir is None:
+            del os.environ["IPYTHONDIR"]
+        else:
+            os.environ["IPYTHONDIR"] = old_ipythondir
+
+    def test_percentile(self):
+        samples = list(range(100, 0, -1))
+
+        self.assertEqual(50, percentile(samples, 0.5))
+        self.assertEqual(99, percentile(samples, 0.99))
+        self.assertEqual(1, percentile(samples, 0.0))
+        self.assertEqual(7, percentile([7], 0.99))
+
+    def test_run_benchmark(self):
+        results = run_benchmark(
+            executes=5, heartbeats=5, lines=100, line_length=10
+        )
+
+        self.assertEqual(5, results["execute"]["count"])
+        self.assertEqual(5, results["heartbeat_idle"]["count"])
+        self.assertEqual(1100, results["output"]["characters"])
+
+        # The kernel's own statistics agree.
+        statistics = results["statistics"]
+        self.assertEqual(6, statistics["requests"]["execute_request"]["count"])
+        self.assertGreater(statistics["iopub_messages"], 0)
+
+        self.assertIn("execute round trip", format_results(results))
@@ -132,6 +132,65 @@ class TestInternalIPKernel(unittest.TestCase):
         self.assertEqual(kernel.namespace["x"], 42.1)
         kernel.shutdown()
 
+    def test_init_in_background(self):
+        kernel = InternalIPKernel(initial_namespace=[("x", 42.1)])
+        kernel_ready = kernel.init_ipkernel_in_background()
+        self.assertIs(kernel_ready.result(), kernel)
+        self.assertIsNone(kernel.ipkernel)
+
+        kernel.init_ipkernel()
+        try:
+            self.assertIsInstance(
+                kernel.ipkernel, ipykernel.kernelapp.IPKernelApp
+            )
+            self.assertEqual(kernel.namespace["x"], 42.1)
+        finally:
+            kernel.shutdown()
+        self.assertIsNone(kernel.ipkernel)
+
+    def test_init_in_background_leaves_process_state_alone(self):
+        original_stdout = sys.stdout
+        original_stderr = sys.stderr
+        original_displayhook = sys.displayhook
+        original_excepthook = sys.excepthook
+
+        kernel = InternalIPKernel()
+        kernel.init_ipkernel_in_background().result()
+        try:
+            # Only the sockets are set up in the background.
+            self.assertIs(sys.stdout, original_stdout)
+            self.assertIs(sys.stderr, original_stderr)
+            self.assertIs(sys.displayhook, original_displayhook)
+            self.assertIs(sys.excepthook, original_excepthook)
+
+            # The rest is done on the main thread.
+            kernel.init_ipkernel()
+            self.assertIsNot(sys.stdout, original_stdout)
+            self.assertIsNot(sys.stderr, original_stderr)
+            self.assertIsNot(sys.displayhook, original_displayhook)
+            self.assertIsNot(sys.excepthook, original_excepthook)
+        finally:
+            kernel.shutdown()
+
+        self.assertIs(sys.stdout, original_stdout)
+        self.assertIs(sys.stderr, original_stderr)
+        self.assertIs(sys.displayhook, original_displayhook)
+        self.assertIs(sys.excepthook, original_excepthook)
+
+    def test_shutdown_without_finishing_init_in_background(self):
+        original_stdout = sys.stdout
+        original_excepthook = sys.excepthook
+
+        kernel = InternalIPKernel()
+        kernel.init_ipkernel_in_background()
+        kernel.shutdown()
+
+        self.assertIs(sys.stdout, original_stdout)
+        self.assertIs(sys.excepthook, original_excepthook)
+        self.assertFalse(ipykernel.kernelapp.IPKernelApp.initialized())
+        sockets = self.objects_of_type(zmq.Socket)
+        self.assertTrue(all(socket.closed for socket in sockets))
+
     def test_shutdown_restores_output_streams(self):
         original_stdin = sys.stdin
         original_stdout = sys.stdout
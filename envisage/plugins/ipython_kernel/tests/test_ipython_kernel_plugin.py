@@ -12,6 +12,7 @@ import contextlib
 import os
 import shutil
 import tempfile
+import threading
 import unittest
 from unittest import mock
 import warnings
@@ -160,6 +161,39 @@ class TestIPythonKernelPlugin(unittest.TestCase):
 
         self.assertEqual(len(kernel_instances), 1)
 
+    def test_kernel_service_in_background(self):
+        kernel_plugin = IPythonKernelPlugin(init_ipkernel_in_background=True)
+
+        with self.running_app(plugins=[kernel_plugin]) as app:
+            kernel_ready = kernel_plugin.kernel_ready
+            kernel = app.get_service(IPYTHON_KERNEL_PROTOCOL)
+            self.assertIs(kernel, kernel_ready.result())
+            self.assertIsNotNone(kernel.ipkernel)
+
+        self.assertIsNone(kernel_plugin.kernel_ready)
+        self.assertIsNone(kernel.ipkernel)
+
+    def test_kernel_sockets_set_up_on_background_thread(self):
+        from envisage.plugins.ipython_kernel.kernelapp import IPKernelApp
+
+        threads = []
+        original_initialize = IPKernelApp.initialize
+
+        def initialize(self, argv=None):
+            threads.append(threading.current_thread())
+            original_initialize(self, argv)
+
+        with mock.patch.object(IPKernelApp, "initialize", initialize):
+            kernel_plugin = IPythonKernelPlugin(
+                init_ipkernel_in_background=True
+            )
+            with self.running_app(plugins=[kernel_plugin]) as app:
+                kernel_plugin.kernel_ready.result()
+                app.get_service(IPYTHON_KERNEL_PROTOCOL)
+
+        thread, = threads
+        self.assertIsNot(thread, threading.current_thread())
+
     def test_no_init(self):
         # Testing deprecated behaviour where the kernel is not initialized.
         plugins = [IPythonKernelPlugin()]
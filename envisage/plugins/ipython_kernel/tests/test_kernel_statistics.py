@@ -0,0 +1,76 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import threading
+import unittest
+
+from envisage.plugins.ipython_kernel.kernel_statistics import KernelStatistics
+
+
+class TestKernelStatistics(unittest.TestCase):
+    def test_initial_snapshot(self):
+        statistics = KernelStatistics()
+
+        self.assertEqual(
+            dict(requests={}, iopub_messages=0, iopub_bytes=0),
+            statistics.snapshot(),
+        )
+
+    def test_record_request(self):
+        statistics = KernelStatistics()
+        statistics.record_request("execute_request", 0.5)
+        statistics.record_request("execute_request", 0.25)
+        statistics.record_request("kernel_info_request", 0.125)
+
+        requests = statistics.snapshot()["requests"]
+
+        self.assertEqual(
+            dict(count=2, total_time=0.75, max_time=0.5),
+            requests["execute_request"],
+        )
+        self.assertEqual(1, requests["kernel_info_request"]["count"])
+
+    def test_record_iopub_message_from_several_threads(self):
+        statistics = KernelStatistics()
+
+        def publish():
+            for _ in range(1000):
+                statistics.record_iopub_message(10)
+
+        threads = [threading.Thread(target=publish) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        snapshot = statistics.snapshot()
+        self.assertEqual(4000, snapshot["iopub_messages"])
+        self.assertEqual(40000, snapshot["iopub_bytes"])
+
+    def test_snapshot_is_a_copy(self):
+        statistics = KernelStatistics()
+        statistics.record_request("execute_request", 0.5)
+        snapshot = statistics.snapshot()
+
+        statistics.record_request("execute_request", 0.5)
+
+        self.assertEqual(1, snapshot["requests"]["execute_request"]["count"])
+
+    def test_reset(self):
+        statistics = KernelStatistics()
+        statistics.record_request("execute_request", 0.5)
+        statistics.record_iopub_message(10)
+
+        statistics.reset()
+
+        self.assertEqual(
+            dict(requests={}, iopub_messages=0, iopub_bytes=0),
+            statistics.snapshot(),
+        )
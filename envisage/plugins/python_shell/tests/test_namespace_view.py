@@ -0,0 +1,207 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import code
+import os
+import unittest
+
+from traits.api import Any, HasTraits
+from traitsui.table_filter import EvalTableFilter, RuleTableFilter
+
+from envisage.plugins.python_shell.view.api import PythonShellView
+from envisage.plugins.python_shell.view.namespace_view import NamespaceView
+
+# Decorator for skipping tests that require a GUI
+requires_gui = unittest.skipIf(
+    os.getenv("ETS_TOOLKIT", default="none") in {"null", "none"},
+    "Test requires a non-null GUI backend",
+)
+
+
+class Shell(HasTraits):
+    """ A minimal stand-in for the shell widget of a Python shell view. """
+
+    # The shell's interpreter.
+    _interpreter = Any
+
+    def interpreter(self):
+        """ Return the shell's interpreter. """
+
+        return self._interpreter
+
+
+class ShellView(PythonShellView):
+    """ A Python shell view with a stand-in shell (and no control). """
+
+    # The view's control, which only has to exist for the view to look for
+    # changes in the namespace.
+    control = Any(True)
+
+    def __init__(self, namespace, **traits):
+        shell = Shell(_interpreter=code.InteractiveInterpreter(namespace))
+        super().__init__(shell=shell, **traits)
+        self._namespace_values = dict(namespace)
+
+    def execute(self, **changes):
+        """ Change the namespace as a command would. """
+
+        for name, value in changes.items():
+            if value is None:
+                del self.namespace[name]
+            else:
+                self.namespace[name] = value
+
+        self._on_command_executed(self.shell)
+
+
+def first():
+    pass
+
+
+def second():
+    pass
+
+
+# A function that seems to come from another module.
+second.__module__ = "acme.foo"
+
+
+@requires_gui
+class TestNamespaceView(unittest.TestCase):
+    def setUp(self):
+        self.shell_view = ShellView(namespace=dict(x=1, y="y", f=first))
+        self.view = NamespaceView(shell_view=self.shell_view)
+
+        self.events = []
+        self.shell_view.on_trait_change(self.record, "namespace_changed")
+
+    def record(self, event):
+        self.events.append(
+            (sorted(event.added), sorted(event.changed), sorted(event.removed))
+        )
+
+    def rows(self):
+        """ The rows in the view, keyed by name. """
+
+        rows = {
+            binding.name: (binding.type, binding.module)
+            for binding in self.view.bindings
+        }
+        self.assertEqual(len(self.view.bindings), len(rows))
+
+        # The positions are in step with the rows.
+        self.assertEqual(
+            {
+                binding.name: index
+                for index, binding in enumerate(self.view.bindings)
+            },
+            self.view._positions,
+        )
+
+        return rows
+
+    def test_initial_rows(self):
+        self.assertEqual(
+            {
+                "x": ("builtins.int", ""),
+                "y": ("builtins.str", ""),
+                "f": ("builtins.function", __name__),
+            },
+            self.rows(),
+        )
+
+    def test_added_and_removed(self):
+        self.shell_view.execute(x=None, z=2.0)
+
+        self.assertEqual([(["z"], [], ["x"])], self.events)
+        self.assertEqual(
+            {
+                "y": ("builtins.str", ""),
+                "f": ("builtins.function", __name__),
+                "z": ("builtins.float", ""),
+            },
+            self.rows(),
+        )
+
+        # Removing the last row doesn't need to move any others.
+        self.shell_view.execute(z=None)
+
+        self.assertEqual({"y", "f"}, set(self.rows()))
+
+    def test_changed_module(self):
+        row = self.view.bindings[self.view._positions["f"]]
+        changes = []
+        row.observe(lambda event: changes.append(event.new), "module")
+
+        # The type is the same, but the module is not.
+        self.shell_view.execute(f=second)
+
+        self.assertEqual([([], ["f"], [])], self.events)
+        self.assertEqual(("builtins.function", "acme.foo"), self.rows()["f"])
+        self.assertEqual(["acme.foo"], changes)
+
+    def test_changed_type(self):
+        self.shell_view.execute(x="x")
+
+        self.assertEqual([([], ["x"], [])], self.events)
+        self.assertEqual(("builtins.str", ""), self.rows()["x"])
+
+    def test_unchanged_strings_are_not_updated(self):
+        row = self.view.bindings[self.view._positions["x"]]
+        changes = []
+        row.observe(lambda event: changes.append(event.new), "type, module")
+
+        self.shell_view.execute(x=2)
+
+        self.assertEqual([([], ["x"], [])], self.events)
+        self.assertEqual([], changes)
+
+    def test_same_value_is_not_a_change(self):
+        self.shell_view.execute(x=self.shell_view.namespace["x"])
+
+        self.assertEqual([], self.events)
+
+    def test_rows_can_be_filtered(self):
+        # The table editor's filters and search need HasTraits rows.
+        eval_filter = EvalTableFilter(expression="type == 'builtins.int'")
+        rule_filter = RuleTableFilter()
+
+        self.assertEqual(
+            ["x"],
+            [
+                binding.name
+                for binding in self.view.bindings
+                if eval_filter.filter(binding)
+            ],
+        )
+        for binding in self.view.bindings:
+            self.assertTrue(rule_filter.filter(binding))
+
+    def test_many_changes(self):
+        namespace = {"name%d" % i: i for i in range(100)}
+        shell_view = ShellView(namespace=namespace)
+        view = NamespaceView(shell_view=shell_view)
+
+        changes = {"name%d" % i: None for i in range(0, 100, 3)}
+        changes.update({"name%d" % i: str(i) for i in range(1, 100, 3)})
+        changes.update({"new%d" % i: i for i in range(10)})
+        shell_view.execute(**changes)
+
+        self.assertEqual(
+            {
+                name: "builtins." + type(value).__name__
+                for name, value in shell_view.namespace.items()
+            },
+            {binding.name: binding.type for binding in view.bindings},
+        )
+        self.assertEqual(
+            {binding.name: i for i, binding in enumerate(view.bindings)},
+            view._positions,
+        )
@@ -7,4 +7,4 @@
 # is also available online at http://www.enthought.com/licenses/BSD.txt
 #
 # Thanks for using Enthought open source!
-from .python_shell_view import PythonShellView
+from .python_shell_view import NamespaceChangedEvent, PythonShellView
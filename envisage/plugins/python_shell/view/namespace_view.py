@@ -19,13 +19,13 @@ from envisage.plugins.python_shell.view.python_shell_view import (
 from pyface.workbench.api import View
 
 from traits.api import (
-    HasTraits,
-    Str,
-    Property,
-    List,
-    Instance,
     DelegatesTo,
-    cached_property,
+    Dict,
+    HasStrictTraits,
+    Instance,
+    List,
+    observe,
+    Str,
 )
 
 from traitsui.api import Item, TableEditor, VGroup
@@ -81,6 +81,19 @@ def module_to_str(obj):
         return ""
 
 
+class NamespaceBinding(HasStrictTraits):
+    """ A row in the namespace view: a name bound in the namespace. """
+
+    # The name.
+    name = Str
+
+    # The type of the value bound to the name.
+    type = Str
+
+    # The module of the value bound to the name.
+    module = Str
+
+
 class NamespaceView(View):
     """ A view containing the contents of the Python shell namespace. """
 
@@ -98,9 +111,11 @@ class NamespaceView(View):
 
     #### 'NamespaceView' interface ############################################
 
-    # The bindings in the namespace.  This is a list of HasTraits objects with
-    # 'name', 'type' and 'module' string attributes.
-    bindings = Property(List, observe="namespace")
+    # The bindings in the namespace.  This is a list of NamespaceBinding
+    # objects with 'name', 'type' and 'module' string attributes, which is
+    # updated as names in the namespace change (the order of the rows is
+    # arbitrary, the table sorts them).
+    bindings = List(Instance(NamespaceBinding))
 
     shell_view = Instance(PythonShellView)
 
@@ -122,6 +137,11 @@ class NamespaceView(View):
         resizable=True,
     )
 
+    #### Private interface ####################################################
+
+    # The index of each name's row in 'bindings', keyed by name.
+    _positions = Dict
+
     ###########################################################################
     # 'View' interface.
     ###########################################################################
@@ -145,25 +165,67 @@ class NamespaceView(View):
     # 'NamespaceView' interface.
     ###########################################################################
 
-    #### Properties ###########################################################
+    #### Trait change handlers ################################################
+
+    @observe("shell_view")
+    def _reset_bindings(self, event):
+        """ Create the rows for all of the names in the namespace. """
+
+        shell_view = event.new
+        if shell_view is None:
+            bindings = []
+        else:
+            bindings = [
+                self._create_binding(name, value)
+                for name, value in shell_view.namespace.items()
+            ]
+
+        self._positions = {
+            binding.name: index for index, binding in enumerate(bindings)
+        }
+        self.bindings = bindings
+
+    @observe("shell_view:namespace_changed")
+    def _update_bindings(self, event):
+        """ Update the rows for the names that have changed. """
+
+        changes = event.new
+        namespace = self.shell_view.namespace
+        positions = self._positions
+        bindings = self.bindings
+
+        # Remove a row by moving the last row into its place, so that no other
+        # rows need to move.
+        for name in changes.removed:
+            index = positions.pop(name, None)
+            if index is not None:
+                last = bindings.pop()
+                if index < len(bindings):
+                    bindings[index] = last
+                    positions[last.name] = index
+
+        added = []
+        for name in changes.added + changes.changed:
+            value = namespace[name]
+            index = positions.get(name)
+            if index is None:
+                positions[name] = len(bindings) + len(added)
+                added.append(self._create_binding(name, value))
+            else:
+                # The table only hears about the strings that have changed.
+                bindings[index].trait_set(
+                    type=type_to_str(value), module=module_to_str(value)
+                )
+
+        bindings.extend(added)
 
-    @cached_property
-    def _get_bindings(self):
-        """ Property getter. """
-
-        if self.shell_view is None:
-            return []
-
-        class item(HasTraits):
-            name = Str
-            type = Str
-            module = Str
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
 
-        data = [
-            item(
-                name=name, type=type_to_str(value), module=module_to_str(value)
-            )
-            for name, value in self.shell_view.namespace.items()
-        ]
+    def _create_binding(self, name, value):
+        """ Create the row for a name bound to a value. """
 
-        return data
+        return NamespaceBinding(
+            name=name, type=type_to_str(value), module=module_to_str(value)
+        )
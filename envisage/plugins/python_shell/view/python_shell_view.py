@@ -20,7 +20,17 @@ from envisage.api import ExtensionPoint
 from envisage.plugins.python_shell.api import IPythonShell
 from pyface.api import PythonShell
 from pyface.workbench.api import View
-from traits.api import Any, Dict, Event, Instance, Property, provides, Str
+from traits.api import (
+    Any,
+    Dict,
+    Event,
+    HasTraits,
+    Instance,
+    List,
+    Property,
+    provides,
+    Str,
+)
 
 # Setup a logger for this module.
 logger = logging.getLogger(__name__)
@@ -47,6 +57,21 @@ class PseudoFile(object):
         return 1
 
 
+class NamespaceChangedEvent(HasTraits):
+    """ The names that a command added to, changed in or removed from the
+        interpreter's namespace.
+    """
+
+    # The names that were added.
+    added = List(Str)
+
+    # The names that were bound to a different value.
+    changed = List(Str)
+
+    # The names that were removed.
+    removed = List(Str)
+
+
 @provides(IPythonShell)
 class PythonShellView(View):
     """ A view containing an interactive Python shell. """
@@ -77,6 +102,10 @@ class PythonShellView(View):
     # Stdout text is posted to this event
     stdout_text = Event
 
+    # Fired when a command has added names to, changed names in or removed
+    # names from the interpreter's namespace.
+    namespace_changed = Event(Instance(NamespaceChangedEvent))
+
     #### 'IExtensionPointUser' interface ######################################
 
     # The extension registry that the object's extension points are stored in.
@@ -90,6 +119,12 @@ class PythonShellView(View):
     # Commands.
     _commands = ExtensionPoint(id="envisage.plugins.python_shell.commands")
 
+    # The values bound in the interpreter's namespace, keyed by name, as of
+    # the last command. This is a plain dictionary (rather than a 'Dict'
+    # trait) as it is updated one name at a time. It only ever refers to
+    # values that are also in the namespace.
+    _namespace_values = Any
+
     ###########################################################################
     # 'IExtensionPointUser' interface.
     ###########################################################################
@@ -125,12 +160,10 @@ class PythonShellView(View):
         for command in self._commands:
             self.execute_command(command)
 
-        # We take note of the starting set of names and types bound in the
+        # We take note of the starting names and values bound in the
         # interpreter's namespace so that we can show the user what they have
-        # added or removed in the namespace view.
-        self._namespace_types = set(
-            (name, type(value)) for name, value in self.namespace.items()
-        )
+        # added, changed or removed in the namespace view.
+        self._namespace_values = dict(self.namespace)
 
         # Register the view as a service.
         app = self.window.application
@@ -209,19 +242,37 @@ class PythonShellView(View):
         """ Dynamic trait change handler. """
 
         if self.control is not None:
-            # Get the set of tuples of names and types in the current
-            # namespace.
-            namespace_types = set(
-                (name, type(value)) for name, value in self.namespace.items()
-            )
-            # Figure out the changes in the namespace, if any.
-            added = namespace_types.difference(self._namespace_types)
-            removed = self._namespace_types.difference(namespace_types)
-            # Cache the new list, to use for comparison next time.
-            self._namespace_types = namespace_types
-            # Fire events if there are change.
-            if len(added) > 0 or len(removed) > 0:
-                self.trait_property_changed("namespace", {}, self.namespace)
+            # Compare the value bound to each name with the value it was
+            # bound to after the last command, updating them as we go. Values
+            # are compared by identity, as anything that the namespace view
+            # shows about a value (e.g. its module) might differ between two
+            # values of the same type.
+            namespace = self.namespace
+            namespace_values = self._namespace_values
+            added = []
+            changed = []
+            for name, value in namespace.items():
+                if name not in namespace_values:
+                    added.append(name)
+                elif namespace_values[name] is not value:
+                    changed.append(name)
+                else:
+                    continue
+
+                namespace_values[name] = value
+
+            removed = [
+                name for name in namespace_values if name not in namespace
+            ]
+            for name in removed:
+                del namespace_values[name]
+
+            # Fire events if there are changes.
+            if len(added) > 0 or len(changed) > 0 or len(removed) > 0:
+                self.namespace_changed = NamespaceChangedEvent(
+                    added=added, changed=changed, removed=removed
+                )
+                self.trait_property_changed("namespace", {}, namespace)
                 self.trait_property_changed("names", [], self.names)
 
     def _on_key_pressed(self, event):
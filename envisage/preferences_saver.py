@@ -0,0 +1,288 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+""" Saves changes to preferences in the background. """
+
+
+# Standard library imports.
+import logging
+import os
+import tempfile
+import threading
+import time
+
+# Enthought library imports.
+from apptools.preferences.api import Preferences
+from traits.api import Any, Event, Float, HasStrictTraits, Instance, observe
+
+
+# Logging.
+logger = logging.getLogger(__name__)
+
+
+class TrackedPreferences(Preferences):
+    """ A preferences node that reports changes to its root node.
+
+    Whenever the preferences in a node (or any of its descendants) are set,
+    removed or cleared, the root node fires its 'node_changed' event with
+    the path of the node that changed. Loading preferences from a file is
+    not a change.
+
+    """
+
+    #### 'TrackedPreferences' interface #######################################
+
+    # Fired on the root node with the path of any node whose preferences have
+    # changed.
+    node_changed = Event
+
+    ###########################################################################
+    # Protected 'Preferences' interface.
+    ###########################################################################
+
+    def _clear(self):
+        """ Remove all preferences from this node. """
+
+        changed = len(self._keys()) > 0
+        super()._clear()
+        if changed:
+            self._report_change()
+
+    def _create_child(self, name):
+        """ Create a child of this node with the specified name. """
+
+        with self._lk:
+            child = self._children[name] = type(self)(name=name, parent=self)
+
+        return child
+
+    def _remove(self, name):
+        """ Remove a preference value from this node. """
+
+        changed = name in self._keys()
+        super()._remove(name)
+        if changed:
+            self._report_change()
+
+    def _set(self, key, value):
+        """ Set the value of a preference in this node. """
+
+        changed = self._get(key) != str(value)
+        super()._set(key, value)
+        if changed:
+            self._report_change()
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _report_change(self):
+        """ Tell the root node that this node has changed. """
+
+        root = self
+        while root.parent is not None:
+            root = root.parent
+
+        root.node_changed = self.path
+
+
+class PreferencesSaver(HasStrictTraits):
+    """ Saves changes to preferences in the background.
+
+    The saver keeps track of which nodes of a 'TrackedPreferences' tree have
+    changed. Once there have been no more changes for 'delay' seconds, the
+    changed nodes are written to the preferences file on a background
+    thread (a single thread that is started on the first change and runs
+    until the saver is stopped). Only their sections of the file are
+    replaced, and the file is written to a temporary file first so that a
+    crash never leaves a corrupt file behind.
+
+    """
+
+    #### 'PreferencesSaver' interface #########################################
+
+    # The root node of the preferences to save. Changes are written to the
+    # node's 'filename'.
+    preferences = Instance(TrackedPreferences)
+
+    # The number of seconds to wait after a change before saving, so that a
+    # burst of changes is saved in one go.
+    delay = Float(1.0)
+
+    #### Private interface ####################################################
+
+    # The time (as given by 'time.monotonic') at which the changes should be
+    # saved, or None if there are no changes waiting.
+    _deadline = Any
+
+    # The paths of the nodes that have changed since they were last saved.
+    _dirty = Any
+
+    # The condition that protects the dirty nodes, the deadline and the
+    # background thread, and that wakes the background thread up.
+    _lock = Any
+
+    # The background thread that saves the changes (or None if it has not
+    # been started). A thread finishes as soon as it is no longer this one.
+    _thread = Any
+
+    # The lock that makes sure only one save happens at a time.
+    _write_lock = Any
+
+    ###########################################################################
+    # 'object' interface.
+    ###########################################################################
+
+    def __init__(self, **traits):
+        """ Constructor. """
+
+        # The locks are created up front as they are used by the background
+        # thread.
+        self._dirty = set()
+        self._lock = threading.Condition()
+        self._write_lock = threading.Lock()
+
+        super().__init__(**traits)
+
+    ###########################################################################
+    # 'PreferencesSaver' interface.
+    ###########################################################################
+
+    def flush(self):
+        """ Save any changes now (and wait until they are saved).
+
+        This does nothing if nothing has changed.
+
+        """
+
+        with self._lock:
+            self._deadline = None
+
+        self._write()
+
+    def stop(self):
+        """ Save any changes and stop tracking the preferences.
+
+        This also waits for the background thread to finish.
+
+        """
+
+        # Save first, as nothing is written once the preferences are gone.
+        self.flush()
+        self.preferences = None
+
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._lock.notify_all()
+
+        if thread is not None:
+            thread.join()
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    @observe("preferences:node_changed")
+    def _schedule_write(self, event):
+        """ Make a note of a changed node and push the deadline back. """
+
+        with self._lock:
+            self._dirty.add(event.new)
+            self._deadline = time.monotonic() + self.delay
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="preferences-saver", daemon=True
+                )
+                self._thread.start()
+
+            self._lock.notify_all()
+
+    def _run(self):
+        """ Save the changes whenever the deadline passes (until stopped). """
+
+        thread = threading.current_thread()
+        while True:
+            with self._lock:
+                while True:
+                    if self._thread is not thread:
+                        return
+
+                    if self._deadline is None:
+                        self._lock.wait()
+                        continue
+
+                    # Changes that arrive while we wait push the deadline
+                    # back, so we check it again whenever we wake up.
+                    remaining = self._deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+
+                    self._lock.wait(remaining)
+
+                self._deadline = None
+
+            self._write()
+
+    def _write(self):
+        """ Write the changed nodes to the preferences file. """
+
+        with self._write_lock:
+            with self._lock:
+                paths, self._dirty = self._dirty, set()
+                preferences = self.preferences
+
+            if len(paths) == 0 or preferences is None:
+                return
+
+            try:
+                self._write_nodes(preferences, paths)
+
+            except Exception:
+                logger.exception("Error while saving preferences")
+
+                # Try again next time.
+                with self._lock:
+                    self._dirty |= paths
+
+    def _write_nodes(self, preferences, paths):
+        """ Replace the sections of the preferences file for some nodes. """
+
+        filename = preferences.filename
+        if len(filename) == 0:
+            return
+
+        # Do the import here so that we don't make 'ConfigObj' a requirement
+        # if preferences aren't ever persisted (just like 'Preferences').
+        from configobj import ConfigObj
+
+        logger.debug("saving preferences %s to <%s>", sorted(paths), filename)
+
+        config_obj = ConfigObj(filename, encoding="utf-8")
+        for path in paths:
+            node = preferences.node(path) if len(path) > 0 else preferences
+            values = {key: node.get(key) for key in node.keys()}
+            if len(values) > 0:
+                config_obj[path] = values
+
+            else:
+                config_obj.pop(path, None)
+
+        fd, temp_filename = tempfile.mkstemp(
+            dir=os.path.dirname(filename) or None,
+            prefix=os.path.basename(filename) + ".",
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                config_obj.write(f)
+            os.replace(temp_filename, filename)
+
+        except BaseException:
+            os.unlink(temp_filename)
+            raise
@@ -51,10 +51,13 @@ class ProviderExtensionRegistry(ExtensionRegistry):
     def add_provider(self, provider):
         """ Add an extension provider. """
 
-        events = self._add_provider(provider)
+        with self._lock:
+            events = self._add_provider(provider)
 
-        for extension_point_id, (refs, added, index) in events.items():
-            self._call_listeners(refs, extension_point_id, added, [], index)
+            for extension_point_id, (refs, added, index) in events.items():
+                self._call_listeners(
+                    refs, extension_point_id, added, [], index
+                )
 
     def get_providers(self):
         """ Return all of the providers in the registry. """
@@ -68,10 +71,13 @@ class ProviderExtensionRegistry(ExtensionRegistry):
 
         """
 
-        events = self._remove_provider(provider)
+        with self._lock:
+            events = self._remove_provider(provider)
 
-        for extension_point_id, (refs, removed, index) in events.items():
-            self._call_listeners(refs, extension_point_id, [], removed, index)
+            for extension_point_id, (refs, removed, index) in events.items():
+                self._call_listeners(
+                    refs, extension_point_id, [], removed, index
+                )
 
     ###########################################################################
     # Protected 'ExtensionRegistry' interface.
@@ -130,6 +136,12 @@ class ProviderExtensionRegistry(ExtensionRegistry):
         # And finally, tag it into the list of providers.
         self._providers.append(provider)
 
+        # The provider may have added extension points, which changes the
+        # extensions of extension points that were previously unknown.
+        self._snapshots.clear()
+        for extension_point in provider.get_extension_points():
+            self._reset_indexes(extension_point.id)
+
         return events
 
     def _add_provider_extensions(self, provider):
@@ -175,6 +187,11 @@ class ProviderExtensionRegistry(ExtensionRegistry):
         # And finally take it out of the list of providers.
         self._providers.remove(provider)
 
+        # The provider may have removed extension points.
+        self._snapshots.clear()
+        for extension_point in provider.get_extension_points():
+            self._reset_indexes(extension_point.id)
+
         return events
 
     def _remove_provider_extensions(self, provider):
@@ -224,6 +241,14 @@ class ProviderExtensionRegistry(ExtensionRegistry):
 
         logger.debug("provider <%s> extension point changed", obj)
 
+        with self._lock:
+            self._provider_extension_point_changed(obj, event)
+
+    #### Methods ##############################################################
+
+    def _provider_extension_point_changed(self, obj, event):
+        """ Update the registry when a provider's extensions change. """
+
         extension_point_id = event.extension_point_id
 
         # If the extension point has not yet been accessed then we don't fire a
@@ -267,8 +292,6 @@ class ProviderExtensionRegistry(ExtensionRegistry):
             refs, extension_point_id, event.added, event.removed, index
         )
 
-    #### Methods ##############################################################
-
     def _initialize_extensions(self, extension_point_id):
         """ Initialize the extensions to an extension point. """
 
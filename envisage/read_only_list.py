@@ -0,0 +1,49 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+""" A list that cannot be modified in place. """
+
+
+class ReadOnlyList(list):
+    """ A list that cannot be modified in place.
+
+    This is used to hand out cached values (e.g. the contributions to an
+    extension point) without letting callers corrupt the cache. It is still a
+    'list', so it can be iterated over, indexed, sliced, concatenated and
+    assigned to 'List' traits as usual. To modify the contents, take a copy
+    first e.g. 'list(value)' or 'value[:]'.
+
+    """
+
+    def _read_only(self, *args, **kwargs):
+        """ Raise an error for any attempt to modify the list. """
+
+        raise TypeError(
+            "this list is read-only; take a copy (e.g. 'list(value)') if "
+            "you need to modify it"
+        )
+
+    __delitem__ = _read_only
+    __iadd__ = _read_only
+    __imul__ = _read_only
+    __setitem__ = _read_only
+    append = _read_only
+    clear = _read_only
+    extend = _read_only
+    insert = _read_only
+    pop = _read_only
+    remove = _read_only
+    reverse = _read_only
+    sort = _read_only
+
+    def __reduce_ex__(self, protocol):
+        """ Support copying and pickling. """
+
+        # The default implementation rebuilds the list by calling 'extend'.
+        return (type(self), (list(self),))
@@ -14,4 +14,5 @@ from .file_resource_protocol import FileResourceProtocol
 from .http_resource_protocol import HTTPResourceProtocol
 from .no_such_resource_error import NoSuchResourceError
 from .package_resource_protocol import PackageResourceProtocol
-from .resource_manager import ResourceManager
+from .pooled_http_resource_protocol import PooledHTTPResourceProtocol
+from .resource_manager import ResourceManager, ResourceResult
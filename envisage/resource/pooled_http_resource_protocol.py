@@ -0,0 +1,343 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+""" A resource protocol for HTTP documents with pooling and caching. """
+
+
+# Standard library imports.
+import hashlib
+import http.client
+import io
+import json
+import os
+import tempfile
+import threading
+from urllib.parse import urljoin, urlsplit
+
+# Enthought library imports.
+from traits.api import Any, Dict, Float, HasTraits, Int, provides, Str
+
+# Local imports.
+from .i_resource_protocol import IResourceProtocol
+from .no_such_resource_error import NoSuchResourceError
+
+
+# The HTTP status codes that we follow as redirects.
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+# Errors that indicate that a pooled (kept-alive) connection has been closed
+# by the server while it was idle in the pool.
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+
+@provides(IResourceProtocol)
+class PooledHTTPResourceProtocol(HasTraits):
+    """ A resource protocol for HTTP documents.
+
+    Unlike the 'HTTPResourceProtocol', this protocol:
+
+    - keeps connections alive and reuses them for subsequent requests to the
+      same host (up to 'max_connections_per_host' idle connections per host).
+    - optionally caches documents on disk in 'cache_directory'. Cached
+      documents are revalidated using conditional requests (based on the
+      'ETag' and 'Last-Modified' response headers), and the cached copy is
+      used whenever the server answers '304 Not Modified'.
+    - applies a 'timeout' to connecting to and reading from the server.
+
+    An address for this protocol is a string in the form::
+
+        'host[:port]/path'
+
+    e.g::
+
+        'localhost:8080/acme/preferences.ini'
+
+    The protocol is safe to use from multiple threads.
+    """
+
+    #### 'PooledHTTPResourceProtocol' interface ###############################
+
+    # The directory used to cache documents. If this is empty (the default),
+    # documents are not cached.
+    cache_directory = Str()
+
+    # The maximum number of idle connections kept open for each host.
+    max_connections_per_host = Int(4)
+
+    # The maximum number of redirects followed for a single request.
+    max_redirects = Int(5)
+
+    # The timeout (in seconds) for connecting to and reading from a server.
+    timeout = Float(30.0)
+
+    #### Private interface ####################################################
+
+    # Idle connections, keyed by '(host, port)'.
+    _idle_connections = Dict()
+
+    # Lock protecting the pool of idle connections and the cache directory.
+    _lock = Any()
+
+    ###########################################################################
+    # 'IResourceProtocol' interface.
+    ###########################################################################
+
+    def file(self, address):
+        """ Return a readable file-like object for the specified address. """
+
+        url = "http://" + address
+
+        for _ in range(self.max_redirects + 1):
+            status, headers, body = self._get(url)
+            if status in REDIRECT_STATUSES and "Location" in headers:
+                url = urljoin(url, headers["Location"])
+                continue
+
+            if status >= 400:
+                raise NoSuchResourceError(url)
+
+            return body
+
+        raise NoSuchResourceError("too many redirects: " + url)
+
+    ###########################################################################
+    # 'PooledHTTPResourceProtocol' interface.
+    ###########################################################################
+
+    def close(self):
+        """ Close all idle connections held by the protocol. """
+
+        with self._lock:
+            connections = [
+                connection
+                for idle in self._idle_connections.values()
+                for connection in idle
+            ]
+            self._idle_connections.clear()
+
+        for connection in connections:
+            connection.close()
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    #### Trait initializers ###################################################
+
+    def __lock_default(self):
+        """ Trait initializer. """
+
+        return threading.Lock()
+
+    #### Methods ##############################################################
+
+    def _get(self, url):
+        """ GET a URL, revalidating any cached copy.
+
+        Returns a tuple '(status, headers, file)' where 'file' is a readable
+        file-like object containing the document.
+        """
+
+        parts = urlsplit(url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise NoSuchResourceError(url)
+
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        key = (parts.hostname, parts.port or http.client.HTTP_PORT)
+        metadata = self._read_cache_metadata(url)
+
+        request_headers = {"Host": parts.netloc}
+        if metadata is not None:
+            if metadata.get("etag"):
+                request_headers["If-None-Match"] = metadata["etag"]
+            if metadata.get("last_modified"):
+                request_headers["If-Modified-Since"] = metadata[
+                    "last_modified"
+                ]
+
+        status, headers, body = self._request(key, path, request_headers)
+
+        if status == 304 and metadata is not None:
+            cached = self._open_cached(url)
+            if cached is not None:
+                return 200, headers, cached
+
+            # The cached document has vanished; fetch it unconditionally.
+            request_headers.pop("If-None-Match", None)
+            request_headers.pop("If-Modified-Since", None)
+            status, headers, body = self._request(key, path, request_headers)
+
+        if status == 200:
+            self._write_cache(url, headers, body)
+
+        return status, headers, io.BytesIO(body)
+
+    def _request(self, key, path, headers):
+        """ Make a GET request using a pooled connection.
+
+        The response body is read in full so that the connection can be
+        returned to the pool.
+        """
+
+        # A pooled connection may have been closed by the server since it was
+        # last used, in which case we retry (once) with a fresh connection.
+        connection, reused = self._acquire_connection(key)
+        try:
+            try:
+                response = self._send(connection, path, headers)
+
+            except STALE_CONNECTION_ERRORS:
+                if not reused:
+                    raise
+
+                connection.close()
+                connection = self._new_connection(key)
+                response = self._send(connection, path, headers)
+
+            body = response.read()
+
+        except OSError as e:
+            connection.close()
+            raise NoSuchResourceError(
+                "http://%s:%d%s (%s)" % (key[0], key[1], path, e)
+            )
+
+        except http.client.HTTPException as e:
+            connection.close()
+            raise NoSuchResourceError(
+                "http://%s:%d%s (%s)" % (key[0], key[1], path, e)
+            )
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._release_connection(key, connection)
+
+        return response.status, response.headers, body
+
+    def _send(self, connection, path, headers):
+        """ Send a GET request and return the response. """
+
+        connection.request("GET", path, headers=headers)
+
+        return connection.getresponse()
+
+    def _acquire_connection(self, key):
+        """ Return a connection to a host and whether it has been used. """
+
+        with self._lock:
+            idle = self._idle_connections.get(key)
+            if idle:
+                return idle.pop(), True
+
+        return self._new_connection(key), False
+
+    def _release_connection(self, key, connection):
+        """ Return a connection to the pool of idle connections. """
+
+        with self._lock:
+            idle = self._idle_connections.setdefault(key, [])
+            if len(idle) < self.max_connections_per_host:
+                idle.append(connection)
+                return
+
+        connection.close()
+
+    def _new_connection(self, key):
+        """ Create a new connection to a host. """
+
+        host, port = key
+
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    #### Disk cache ###########################################################
+
+    def _cache_path(self, url):
+        """ Return the path of the cache entry for a URL (sans extension). """
+
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+        return os.path.join(self.cache_directory, digest)
+
+    def _read_cache_metadata(self, url):
+        """ Return the cached validators for a URL (or None if not cached). """
+
+        if not self.cache_directory:
+            return None
+
+        try:
+            with open(self._cache_path(url) + ".json", encoding="utf-8") as f:
+                metadata = json.load(f)
+
+        except (OSError, ValueError):
+            return None
+
+        if metadata.get("url") != url:
+            return None
+
+        return metadata
+
+    def _open_cached(self, url):
+        """ Open the cached copy of a document (or None if not cached). """
+
+        try:
+            return open(self._cache_path(url) + ".body", "rb")
+
+        except OSError:
+            return None
+
+    def _write_cache(self, url, headers, body):
+        """ Cache a document if the server sent any validators for it. """
+
+        if not self.cache_directory:
+            return
+
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if etag is None and last_modified is None:
+            return
+
+        metadata = dict(url=url, etag=etag, last_modified=last_modified)
+        path = self._cache_path(url)
+
+        # Write the document before its metadata, and replace each file
+        # atomically, so that a reader never sees metadata that refers to a
+        # partially written document.
+        try:
+            os.makedirs(self.cache_directory, exist_ok=True)
+            self._atomic_write(path + ".body", body)
+            self._atomic_write(
+                path + ".json", json.dumps(metadata).encode("utf-8")
+            )
+
+        except OSError:
+            # Caching is an optimization only.
+            pass
+
+    def _atomic_write(self, path, data):
+        """ Write data to a file atomically. """
+
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+
+        except BaseException:
+            os.unlink(temp_path)
+            raise
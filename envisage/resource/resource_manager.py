@@ -10,14 +10,24 @@
 """ The default resource manager. """
 
 
+# Standard library imports.
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
 # Enthought library imports.
-from traits.api import Dict, HasTraits, Str, provides
+from traits.api import Dict, HasTraits, Int, Str, provides
 
 # Local imports.
 from .i_resource_manager import IResourceManager
 from .i_resource_protocol import IResourceProtocol
 
 
+#: The result of fetching a single resource with 'fetch_many'. Exactly one of
+#: 'file' (a readable file-like object) and 'error' (the exception raised when
+#: trying to open the resource) is not None.
+ResourceResult = namedtuple("ResourceResult", ["url", "file", "error"])
+
+
 @provides(IResourceManager)
 class ResourceManager(HasTraits):
     """ The default resource manager. """
@@ -27,6 +37,12 @@ class ResourceManager(HasTraits):
     # The protocols used by the manager to resolve resource URLs.
     resource_protocols = Dict(Str, IResourceProtocol)
 
+    #### 'ResourceManager' interface ##########################################
+
+    # The maximum number of resources opened concurrently by 'fetch_many' and
+    # 'files'.
+    max_workers = Int(8)
+
     ###########################################################################
     # 'IResourceManager' interface.
     ###########################################################################
@@ -62,3 +78,64 @@ class ResourceManager(HasTraits):
             raise ValueError("unknown protocol in URL %s" % url)
 
         return protocol.file(address)
+
+    ###########################################################################
+    # 'ResourceManager' interface.
+    ###########################################################################
+
+    def files(self, urls):
+        """ Return readable file-like objects for the specified urls.
+
+        The resources are opened concurrently, and the files are returned in
+        the same order as the urls. If any resource cannot be opened, the
+        other files are closed and the first error (in url order) is raised.
+
+        """
+
+        results = self.fetch_many(urls)
+
+        error = next(
+            (result.error for result in results if result.error is not None),
+            None,
+        )
+        if error is not None:
+            for result in results:
+                if result.file is not None:
+                    result.file.close()
+
+            raise error
+
+        return [result.file for result in results]
+
+    def fetch_many(self, urls):
+        """ Open many resources concurrently.
+
+        Returns a list of 'ResourceResult' named tuples, with the fields
+        'url', 'file' and 'error', in the same order as the urls. Errors are
+        reported per url (in 'error') rather than raised.
+
+        """
+
+        urls = list(urls)
+        if len(urls) <= 1 or self.max_workers <= 1:
+            return [self._fetch(url) for url in urls]
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(urls))
+        ) as executor:
+            return list(executor.map(self._fetch, urls))
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _fetch(self, url):
+        """ Open a single resource, capturing any error. """
+
+        try:
+            f = self.file(url)
+
+        except Exception as e:
+            return ResourceResult(url, None, e)
+
+        return ResourceResult(url, f, None)
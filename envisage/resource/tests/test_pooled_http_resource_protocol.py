@@ -0,0 +1,249 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+""" Tests for the pooled HTTP resource protocol. """
+
+
+# Standard library imports.
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Enthought library imports.
+from envisage.resource.api import (
+    NoSuchResourceError,
+    PooledHTTPResourceProtocol,
+    ResourceManager,
+)
+
+
+class DocumentHandler(BaseHTTPRequestHandler):
+    """ A request handler serving the documents of its server. """
+
+    # Use HTTP/1.1 so that connections are kept alive.
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        """ Serve a GET request. """
+
+        server = self.server
+        server.requests.append((self.path, dict(self.headers)))
+
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/etag.txt")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if self.path == "/slow":
+            server.release.wait()
+
+        document = server.documents.get(self.path)
+        if document is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body, etag = document
+        if etag is not None and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        if etag is not None:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """ Don't log requests. """
+
+
+class DocumentServer(ThreadingHTTPServer):
+    """ A local HTTP server that records the requests it serves. """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), DocumentHandler)
+        self.documents = {}
+        self.requests = []
+        self.connections = 0
+        self.release = threading.Event()
+
+    def get_request(self):
+        """ Accept a connection, counting it. """
+
+        self.connections += 1
+        return super().get_request()
+
+
+class PooledHTTPResourceProtocolTestCase(unittest.TestCase):
+    """ Tests for the pooled HTTP resource protocol. """
+
+    def setUp(self):
+        self.server = DocumentServer()
+        self.server.documents["/plain.txt"] = (b"plain\n", None)
+        self.server.documents["/etag.txt"] = (b"tagged\n", '"v1"')
+        self.address = "127.0.0.1:%d" % self.server.server_address[1]
+
+        self.server_thread = threading.Thread(
+            target=self.server.serve_forever, kwargs=dict(poll_interval=0.05)
+        )
+        self.server_thread.start()
+
+        self.cache_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+        self.server_thread.join()
+        shutil.rmtree(self.cache_directory)
+
+    def test_file(self):
+        protocol = PooledHTTPResourceProtocol()
+        self.addCleanup(protocol.close)
+
+        with protocol.file(self.address + "/plain.txt") as f:
+            self.assertEqual(f.read(), b"plain\n")
+
+    def test_no_such_resource(self):
+        protocol = PooledHTTPResourceProtocol()
+        self.addCleanup(protocol.close)
+
+        with self.assertRaises(NoSuchResourceError):
+            protocol.file(self.address + "/bogus.txt")
+
+    def test_connection_refused(self):
+        protocol = PooledHTTPResourceProtocol()
+        address = self.address
+        self.server.shutdown()
+        self.server.server_close()
+
+        with self.assertRaises(NoSuchResourceError):
+            protocol.file(address + "/plain.txt")
+
+    def test_connections_are_reused(self):
+        protocol = PooledHTTPResourceProtocol()
+        self.addCleanup(protocol.close)
+
+        for _ in range(5):
+            with protocol.file(self.address + "/plain.txt") as f:
+                self.assertEqual(f.read(), b"plain\n")
+
+        self.assertEqual(len(self.server.requests), 5)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_reconnect_after_close(self):
+        protocol = PooledHTTPResourceProtocol()
+        self.addCleanup(protocol.close)
+
+        protocol.file(self.address + "/plain.txt").close()
+        protocol.close()
+        with protocol.file(self.address + "/plain.txt") as f:
+            self.assertEqual(f.read(), b"plain\n")
+
+        self.assertEqual(self.server.connections, 2)
+
+    def test_conditional_get_uses_cache(self):
+        protocol = PooledHTTPResourceProtocol(
+            cache_directory=self.cache_directory
+        )
+        self.addCleanup(protocol.close)
+
+        with protocol.file(self.address + "/etag.txt") as f:
+            self.assertEqual(f.read(), b"tagged\n")
+
+        # A new protocol (e.g. in a new session) revalidates the cached copy.
+        protocol = PooledHTTPResourceProtocol(
+            cache_directory=self.cache_directory
+        )
+        self.addCleanup(protocol.close)
+
+        with protocol.file(self.address + "/etag.txt") as f:
+            self.assertEqual(f.read(), b"tagged\n")
+
+        (_, first_headers), (_, second_headers) = self.server.requests
+        self.assertNotIn("If-None-Match", first_headers)
+        self.assertEqual(second_headers["If-None-Match"], '"v1"')
+
+    def test_modified_document_replaces_cache(self):
+        protocol = PooledHTTPResourceProtocol(
+            cache_directory=self.cache_directory
+        )
+        self.addCleanup(protocol.close)
+
+        protocol.file(self.address + "/etag.txt").close()
+        self.server.documents["/etag.txt"] = (b"retagged\n", '"v2"')
+
+        with protocol.file(self.address + "/etag.txt") as f:
+            self.assertEqual(f.read(), b"retagged\n")
+
+        with protocol.file(self.address + "/etag.txt") as f:
+            self.assertEqual(f.read(), b"retagged\n")
+
+        _, headers = self.server.requests[-1]
+        self.assertEqual(headers["If-None-Match"], '"v2"')
+
+    def test_documents_without_validators_are_not_cached(self):
+        protocol = PooledHTTPResourceProtocol(
+            cache_directory=self.cache_directory
+        )
+        self.addCleanup(protocol.close)
+
+        protocol.file(self.address + "/plain.txt").close()
+
+        self.assertEqual(os.listdir(self.cache_directory), [])
+
+    def test_missing_cached_document_is_refetched(self):
+        protocol = PooledHTTPResourceProtocol(
+            cache_directory=self.cache_directory
+        )
+        self.addCleanup(protocol.close)
+
+        protocol.file(self.address + "/etag.txt").close()
+        for filename in os.listdir(self.cache_directory):
+            if filename.endswith(".body"):
+                os.remove(os.path.join(self.cache_directory, filename))
+
+        with protocol.file(self.address + "/etag.txt") as f:
+            self.assertEqual(f.read(), b"tagged\n")
+
+    def test_redirect(self):
+        protocol = PooledHTTPResourceProtocol()
+        self.addCleanup(protocol.close)
+
+        with protocol.file(self.address + "/redirect") as f:
+            self.assertEqual(f.read(), b"tagged\n")
+
+    def test_timeout(self):
+        protocol = PooledHTTPResourceProtocol(timeout=0.1)
+        self.addCleanup(protocol.close)
+
+        with self.assertRaises(NoSuchResourceError):
+            protocol.file(self.address + "/slow")
+
+    def test_resource_manager(self):
+        protocol = PooledHTTPResourceProtocol()
+        self.addCleanup(protocol.close)
+        rm = ResourceManager()
+        rm.resource_protocols["http"] = protocol
+
+        with rm.file("http://" + self.address + "/plain.txt") as f:
+            self.assertEqual(f.read(), b"plain\n")
@@ -180,3 +180,75 @@ class ResourceManagerTestCase(unittest.TestCase):
 
         with self.assertRaises(ValueError):
             rm.file("bogus://foo/bar/baz")
+
+    def test_files(self):
+        """ files """
+
+        rm = ResourceManager()
+
+        opened = rm.files(
+            [
+                "pkgfile://envisage.resource/api.py",
+                "http://localhost:1234/file.dat",
+                "pkgfile://envisage.resource/tests/__init__.py",
+            ]
+        )
+        contents = [f.read() for f in opened]
+        for f in opened:
+            f.close()
+
+        resource = files("envisage.resource")
+        self.assertEqual(
+            contents,
+            [
+                (resource / "api.py").read_bytes(),
+                "This is a test file.\n",
+                (resource / "tests" / "__init__.py").read_bytes(),
+            ],
+        )
+
+    def test_files_with_missing_resource(self):
+        """ files with a missing resource """
+
+        rm = ResourceManager()
+
+        with self.assertRaises(NoSuchResourceError):
+            rm.files(
+                [
+                    "pkgfile://envisage.resource/api.py",
+                    "http://localhost:1234/bogus.dat",
+                ]
+            )
+
+    def test_fetch_many(self):
+        """ fetch many """
+
+        rm = ResourceManager()
+        urls = [
+            "http://localhost:1234/bogus.dat",
+            "pkgfile://envisage.resource/api.py",
+            "bogus://foo/bar/baz",
+        ] * 5
+
+        results = rm.fetch_many(urls)
+
+        self.assertEqual([result.url for result in results], urls)
+        for result in results:
+            if result.url.startswith("pkgfile"):
+                self.assertIsNone(result.error)
+                result.file.close()
+            else:
+                self.assertIsNone(result.file)
+                self.assertIsInstance(
+                    result.error, (NoSuchResourceError, ValueError)
+                )
+
+    def test_fetch_many_without_concurrency(self):
+        """ fetch many with a single worker """
+
+        rm = ResourceManager(max_workers=1)
+
+        (result,) = rm.fetch_many(["http://localhost:1234/file.dat"])
+
+        self.assertIsNone(result.error)
+        self.assertEqual(result.file.read(), "This is a test file.\n")
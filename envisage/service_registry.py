@@ -14,7 +14,7 @@
 import logging
 
 # Enthought library imports.
-from traits.api import Dict, Event, HasTraits, Int, provides
+from traits.api import Dict, Event, HasTraits, Instance, Int, provides
 
 # Local imports.
 from .i_service_registry import IServiceRegistry
@@ -31,7 +31,15 @@ class NoSuchServiceError(Exception):
 
 @provides(IServiceRegistry)
 class ServiceRegistry(HasTraits):
-    """ The service registry. """
+    """ The service registry.
+
+    A registry can have a 'parent' registry, in which case it is a child
+    registry (e.g. for the services of a single window). Lookups by protocol
+    search the child's own services first, and then fall back to the parent.
+    Service Ids, however, are local to each registry, so the methods that
+    take a service Id only know about the child's own services.
+
+    """
 
     ####  IServiceRegistry interface ##########################################
 
@@ -41,6 +49,12 @@ class ServiceRegistry(HasTraits):
     #: An event that is fired when a service is unregistered.
     unregistered = Event
 
+    ####  'ServiceRegistry' interface #########################################
+
+    #: The registry to look services up in if they are not found in this one
+    #: (or None if there is no such registry).
+    parent = Instance(IServiceRegistry)
+
     ####  Private interface ###################################################
 
     # The services in the registry.
@@ -84,7 +98,17 @@ class ServiceRegistry(HasTraits):
     def get_service(self, protocol, query="", minimize="", maximize=""):
         """ Return at most one service that matches the specified query. """
 
-        services = self.get_services(protocol, query, minimize, maximize)
+        # Unless we are minimizing or maximizing something, our own services
+        # take precedence over the parent's, so we only need to ask the
+        # parent if we have no matching services ourselves.
+        if minimize == "" and maximize == "":
+            services = self._get_local_services(protocol, query)
+            if len(services) == 0 and self.parent is not None:
+                return self.parent.get_service(protocol, query)
+
+        else:
+            services = self.get_services(protocol, query, minimize, maximize)
+
         if len(services) > 0:
             service = services[0]
 
@@ -105,29 +129,15 @@ class ServiceRegistry(HasTraits):
         return obj
 
     def get_services(self, protocol, query="", minimize="", maximize=""):
-        """ Return all services that match the specified query. """
-
-        services = []
-        for service_id, (name, obj, properties) in self._services.items():
-            if self._get_protocol_name(protocol) == name:
-                # If the protocol is a string then we need to import it!
-                if isinstance(protocol, str):
-                    actual_protocol = ImportManager().import_symbol(protocol)
+        """ Return all services that match the specified query.
 
-                # Otherwise, it is an actual protocol, so just use it!
-                else:
-                    actual_protocol = protocol
+        Our own services come before any of the parent's.
 
-                # If the registered service is actually a factory then use it
-                # to create the actual object.
-                obj = self._resolve_factory(
-                    actual_protocol, name, obj, properties, service_id
-                )
+        """
 
-                # If a query was specified then only add the service if it
-                # matches it!
-                if len(query) == 0 or self._eval_query(obj, properties, query):
-                    services.append(obj)
+        services = self._get_local_services(protocol, query)
+        if self.parent is not None:
+            services.extend(self.parent.get_services(protocol, query))
 
         # Are we minimizing or maximising anything? If so then sort the list
         # of services by the specified attribute/property.
@@ -219,6 +229,33 @@ class ServiceRegistry(HasTraits):
 
         return result
 
+    def _get_local_services(self, protocol, query):
+        """ Return our own services that match the specified query. """
+
+        services = []
+        for service_id, (name, obj, properties) in self._services.items():
+            if self._get_protocol_name(protocol) == name:
+                # If the protocol is a string then we need to import it!
+                if isinstance(protocol, str):
+                    actual_protocol = ImportManager().import_symbol(protocol)
+
+                # Otherwise, it is an actual protocol, so just use it!
+                else:
+                    actual_protocol = protocol
+
+                # If the registered service is actually a factory then use it
+                # to create the actual object.
+                obj = self._resolve_factory(
+                    actual_protocol, name, obj, properties, service_id
+                )
+
+                # If a query was specified then only add the service if it
+                # matches it!
+                if len(query) == 0 or self._eval_query(obj, properties, query):
+                    services.append(obj)
+
+        return services
+
     def _get_protocol_name(self, protocol_or_name):
         """ Returns the full class name for a protocol. """
 
@@ -516,3 +516,50 @@ class ApplicationTestCase(unittest.TestCase):
 
         # Make sure we can't get one that isn't there ;^)
         self.assertEqual(None, application.get_plugin("BOGUS"))
+
+    def test_staged_startup(self):
+        """ staged startup """
+
+        early = SimplePlugin(id="early")
+        deferred = SimplePlugin(id="deferred", startup_phase="deferred")
+        application = TestApplication(
+            plugins=[deferred, early], staged_startup=True
+        )
+
+        application.start()
+        self.assertTrue(early.started)
+        self.assertFalse(deferred.started)
+
+        application.start_deferred_plugins()
+        self.assertTrue(deferred.started)
+
+        application.stop()
+        self.assertTrue(early.stopped)
+        self.assertTrue(deferred.stopped)
+
+    def test_deferred_plugins_without_staged_startup(self):
+        """ deferred plugins without staged startup """
+
+        deferred = SimplePlugin(startup_phase="deferred")
+        application = TestApplication(plugins=[deferred])
+
+        application.start()
+        self.assertTrue(deferred.started)
+
+    def test_stop_before_deferred_plugins_are_started(self):
+        """ stop before deferred plugins are started """
+
+        early = SimplePlugin(id="early")
+        deferred = SimplePlugin(id="deferred", startup_phase="deferred")
+        application = TestApplication(
+            plugins=[early, deferred], staged_startup=True
+        )
+
+        application.start()
+        application.stop()
+        self.assertTrue(early.stopped)
+        self.assertFalse(deferred.stopped)
+
+        # The deferred plugin is forgotten once the application has stopped.
+        application.start_deferred_plugins()
+        self.assertFalse(deferred.started)
@@ -150,6 +150,31 @@ class CorePluginTestCase(unittest.TestCase):
         # Make sure we can get one of the preferences.
         self.assertEqual("42", application.preferences.get("enthought.test.x"))
 
+    def test_multiple_preferences(self):
+        """ multiple preferences files are loaded in order """
+
+        class PluginA(Plugin):
+            id = "A"
+            preferences = List(contributes_to="envisage.preferences")
+
+            def _preferences_default(self):
+                """ Trait initializer. """
+
+                return [
+                    "file://" + resource_filename(PKG, "preferences.ini"),
+                    "pkgfile://envisage.tests/preferences_override.ini",
+                ]
+
+        core = CorePlugin()
+        a = PluginA()
+
+        application = TestApplication(plugins=[core, a])
+        application.run()
+
+        # The later file overrides the earlier one.
+        self.assertEqual("43", application.preferences.get("enthought.test.x"))
+        self.assertEqual("1", application.preferences.get("enthought.test.y"))
+
     def test_dynamically_added_preferences(self):
         """ dynamically added preferences """
 
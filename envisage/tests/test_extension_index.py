@@ -0,0 +1,252 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+""" Tests for extension indexes. """
+
+# Standard library imports.
+import unittest
+
+# Enthought library imports.
+from envisage.api import (
+    Application,
+    ExtensionPoint,
+    ExtensionProvider,
+    ExtensionRegistry,
+    IExtensionRegistry,
+    ProviderExtensionRegistry,
+)
+from traits.api import HasTraits, List, provides, Str
+
+
+class Item(HasTraits):
+    """ An extension with an Id. """
+
+    id = Str
+
+    name = Str
+
+
+class Provider(ExtensionProvider):
+    """ A provider of extensions to 'my.ep'. """
+
+    extension_points = List
+
+    items = List
+
+    def get_extension_points(self):
+        """ Return the extension points offered by the provider. """
+
+        return self.extension_points
+
+    def get_extensions(self, extension_point_id):
+        """ Return the provider's contributions to an extension point. """
+
+        if extension_point_id == "my.ep":
+            return self.items
+
+        return []
+
+    def _items_items_changed(self, event):
+        """ Static trait change handler. """
+
+        self._fire_extension_point_changed(
+            "my.ep", event.added, event.removed, event.index
+        )
+
+
+@provides(IExtensionRegistry)
+class UnindexedRegistry(HasTraits):
+    """ An extension registry that doesn't keep indexes. """
+
+    extensions = List
+
+    def add_extension_point_listener(self, listener, extension_point_id=None):
+        """ Add a listener for extensions being added or removed. """
+
+    def remove_extension_point_listener(
+        self, listener, extension_point_id=None
+    ):
+        """ Remove a listener for extensions being added or removed. """
+
+    def get_extensions(self, extension_point_id):
+        """ Return the extensions contributed to an extension point. """
+
+        return list(self.extensions) if extension_point_id == "my.ep" else []
+
+
+class ExtensionIndexTestCase(unittest.TestCase):
+    """ Tests for extension indexes. """
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+
+        # We do all of the testing via the application to make sure it offers
+        # the same interface!
+        self.registry = Application(extension_registry=ExtensionRegistry())
+        self.registry.add_extension_point(ExtensionPoint(List, "my.ep"))
+
+    def test_lookup(self):
+        a, b = Item(id="a"), Item(id="b")
+        self.registry.set_extensions("my.ep", [a, b, 42])
+
+        index = self.registry.get_extension_index("my.ep")
+
+        self.assertIs(a, index["a"])
+        self.assertIs(b, index.get("b"))
+        self.assertIsNone(index.get("c"))
+        self.assertEqual({"a", "b"}, set(index))
+        self.assertEqual(2, len(index))
+
+    def test_same_index_is_returned(self):
+        index = self.registry.get_extension_index("my.ep")
+
+        self.assertIs(index, self.registry.get_extension_index("my.ep"))
+        self.assertIsNot(
+            index, self.registry.get_extension_index("my.ep", key="name")
+        )
+
+    def test_other_key(self):
+        a = Item(id="a", name="Alpha")
+        self.registry.set_extensions("my.ep", [a])
+
+        index = self.registry.get_extension_index("my.ep", key="name")
+
+        self.assertIs(a, index["Alpha"])
+        self.assertNotIn("a", index)
+
+    def test_duplicate_keys(self):
+        first, second = Item(id="a"), Item(id="a")
+        self.registry.set_extensions("my.ep", [first, second])
+
+        index = self.registry.get_extension_index("my.ep")
+
+        self.assertIs(first, index["a"])
+        self.assertEqual([first, second], index.get_all("a"))
+        self.assertEqual([], index.get_all("b"))
+
+    def test_index_follows_set_extensions(self):
+        index = self.registry.get_extension_index("my.ep")
+        self.assertEqual(0, len(index))
+
+        a = Item(id="a")
+        self.registry.set_extensions("my.ep", [a])
+        self.assertIs(a, index["a"])
+
+        self.registry.set_extensions("my.ep", [])
+        self.assertNotIn("a", index)
+
+    def test_index_follows_remove_extension_point(self):
+        self.registry.set_extensions("my.ep", [Item(id="a")])
+        index = self.registry.get_extension_index("my.ep")
+        self.assertIn("a", index)
+
+        self.registry.remove_extension_point("my.ep")
+
+        self.assertEqual(0, len(index))
+
+    def test_registry_without_indexes(self):
+        first, second = Item(id="a"), Item(id="a")
+        registry = UnindexedRegistry(extensions=[first, second, 42])
+        application = Application(extension_registry=registry)
+
+        index = application.get_extension_index("my.ep")
+
+        self.assertIs(first, index["a"])
+        self.assertEqual([first, second], index.get_all("a"))
+        self.assertEqual({"a"}, set(index))
+        self.assertEqual({}, application.get_extension_index("other.ep"))
+
+
+class ProviderExtensionIndexTestCase(unittest.TestCase):
+    """ Tests for extension indexes on provider extension registries. """
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+
+        self.registry = ProviderExtensionRegistry()
+        self.registry.add_extension_point(ExtensionPoint(List, "my.ep"))
+
+    def test_index_follows_providers(self):
+        a, b = Item(id="a"), Item(id="b")
+        first = Provider(items=[a])
+        second = Provider(items=[b])
+
+        index = self.registry.get_extension_index("my.ep")
+        self.assertEqual(0, len(index))
+
+        self.registry.add_provider(first)
+        self.assertIs(a, index["a"])
+
+        self.registry.add_provider(second)
+        self.assertIs(b, index["b"])
+
+        self.registry.remove_provider(first)
+        self.assertNotIn("a", index)
+        self.assertIs(b, index["b"])
+
+    def test_index_follows_provider_changes(self):
+        a, b, c = Item(id="a"), Item(id="b"), Item(id="c")
+        provider = Provider(items=[a, b])
+        self.registry.add_provider(provider)
+
+        index = self.registry.get_extension_index("my.ep")
+        self.assertEqual({"a", "b"}, set(index))
+
+        provider.items.append(c)
+        self.assertIs(c, index["c"])
+
+        provider.items.remove(a)
+        self.assertEqual({"b", "c"}, set(index))
+
+        provider.items[0] = a
+        self.assertEqual({"a", "c"}, set(index))
+
+    def test_index_follows_extension_points_of_providers(self):
+        a = Item(id="a")
+        registry = ProviderExtensionRegistry()
+        registry.add_provider(Provider(items=[a]))
+
+        # The extension point is unknown, and so it has no extensions...
+        index = registry.get_extension_index("my.ep")
+        self.assertEqual(0, len(index))
+
+        # ... until a provider offers it.
+        provider = Provider(extension_points=[ExtensionPoint(List, "my.ep")])
+        registry.add_provider(provider)
+        self.assertIs(a, index["a"])
+
+        registry.remove_provider(provider)
+        self.assertEqual(0, len(index))
+
+    def test_duplicate_key_inserted_before_existing_extension(self):
+        first, second = Item(id="a"), Item(id="a")
+        provider = Provider(items=[second])
+        self.registry.add_provider(provider)
+
+        index = self.registry.get_extension_index("my.ep")
+        self.assertIs(second, index["a"])
+
+        provider.items.insert(0, first)
+        self.assertIs(first, index["a"])
+        self.assertEqual([first, second], index.get_all("a"))
+
+        provider.items.remove(first)
+        self.assertIs(second, index["a"])
+
+    def test_index_is_updated_when_dispatch_is_deferred(self):
+        a = Item(id="a")
+        provider = Provider()
+        self.registry.add_provider(provider)
+        index = self.registry.get_extension_index("my.ep")
+
+        with self.registry.deferred_dispatch():
+            provider.items.append(a)
+
+            # The index always agrees with 'get_extensions'.
+            self.assertIs(a, index["a"])
@@ -111,8 +111,8 @@ class ExtensionPointTestCase(unittest.TestCase):
         # Make sure the trait change handler was *not* called.
         self.assertEqual(False, f.x_changed_called)
 
-    def test_mutate_extension_point_no_effect(self):
-        """ Extension point is recomputed so mutation has no effect. """
+    def test_mutate_extension_point_not_allowed(self):
+        """ Extension point values are read-only. """
 
         registry = self.registry
 
@@ -128,7 +128,8 @@ class ExtensionPointTestCase(unittest.TestCase):
 
         # when
         f = Foo()
-        f.x.append(42)
+        with self.assertRaises(TypeError):
+            f.x.append(42)
 
         # then
         # The registry is not changed, and the extension point is still the
@@ -253,6 +254,90 @@ class ExtensionPointTestCase(unittest.TestCase):
 
         self.assertEqual([42], registry.get_extensions("my.ep"))
 
+    def test_connected_extension_point_is_cached(self):
+        """ connected extension point values are cached """
+
+        registry = self.registry
+
+        # Add an extension point.
+        registry.add_extension_point(self._create_extension_point("my.ep"))
+
+        # Set the extensions.
+        registry.set_extensions("my.ep", [1, 2, 3])
+
+        # Declare a class that consumes the extension.
+        class Foo(TestBase):
+            x = ExtensionPoint(List(Int), id="my.ep")
+
+        f = Foo()
+
+        # Values are recomputed until the object is connected.
+        self.assertIsNot(f.x, f.x)
+
+        ExtensionPoint.connect_extension_point_traits(f)
+        value = f.x
+        self.assertIs(value, f.x)
+        self.assertEqual([1, 2, 3], value)
+
+        # Changing the extension point invalidates the cached value.
+        registry.set_extensions("my.ep", [4, 5])
+        self.assertEqual([1, 2, 3], value)
+        self.assertEqual([4, 5], f.x)
+        self.assertIs(f.x, f.x)
+
+        # Disconnecting stops caching.
+        ExtensionPoint.disconnect_extension_point_traits(f)
+        registry.set_extensions("my.ep", [6])
+        self.assertEqual([6], f.x)
+        self.assertIsNot(f.x, f.x)
+
+    def test_cached_value_sees_change_in_listener(self):
+        """ change handlers see the new value of a cached extension point """
+
+        registry = self.registry
+
+        # Add an extension point.
+        registry.add_extension_point(self._create_extension_point("my.ep"))
+
+        # Declare a class that consumes the extension.
+        class Foo(TestBase):
+            x = ExtensionPoint(List(Int), id="my.ep")
+
+            seen = List()
+
+            def _x_changed(self):
+                """ Static trait change handler. """
+
+                self.seen.append(list(self.x))
+
+        f = Foo()
+        ExtensionPoint.connect_extension_point_traits(f)
+        self.assertEqual([], f.x)
+
+        registry.set_extensions("my.ep", [1, 2])
+        registry.set_extensions("my.ep", [3])
+
+        self.assertEqual([[1, 2], [3]], f.seen)
+
+    def test_cached_value_of_unknown_extension_point(self):
+        """ values of unknown extension points are not cached """
+
+        registry = self.registry
+
+        # Declare a class that consumes the extension.
+        class Foo(TestBase):
+            x = ExtensionPoint(List(Int), id="my.ep")
+
+        f = Foo()
+        ExtensionPoint.connect_extension_point_traits(f)
+        self.assertEqual([], f.x)
+
+        # The extension point is added without a change event being fired.
+        registry.add_extension_point(self._create_extension_point("my.ep"))
+        registry.extension_registry._extensions["my.ep"] = [1, 2, 3]
+
+        self.assertEqual([1, 2, 3], f.x)
+
     def test_extension_point_str_representation(self):
         """ test the string representation of the extension point """
         ep_repr = "ExtensionPoint(id={!r})"
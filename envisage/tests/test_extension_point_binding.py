@@ -15,7 +15,7 @@ import unittest
 # Enthought library imports.
 from envisage.api import ExtensionPoint
 from envisage.api import bind_extension_point
-from traits.api import HasTraits, List
+from traits.api import HasTraits, Int, List, TraitError
 
 # Local imports.
 from envisage.tests.mutable_extension_registry import MutableExtensionRegistry
@@ -218,6 +218,72 @@ class ExtensionPointBindingTestCase(unittest.TestCase):
         self.assertEqual(1, len(f.x))
         self.assertEqual(3, len(f.y))
 
+    def test_index_events_patch_bound_list(self):
+        """ index events patch the bound list in place """
+
+        registry = self.extension_registry
+
+        # Add an extension point.
+        registry.add_extension_point(self._create_extension_point("my.ep"))
+        registry.add_extensions("my.ep", [1, 2, 3])
+
+        # Declare a class that consumes the extension.
+        class Foo(HasTraits):
+            x = List(Int)
+
+        f = Foo()
+        bind_extension_point(f, "x", "my.ep")
+        value = f.x
+        f.on_trait_change(listener)
+
+        # Count how often the extensions are fetched from now on.
+        fetches = []
+        get_extensions = registry.get_extensions
+        registry.get_extensions = lambda id: fetches.append(id) or (
+            get_extensions(id)
+        )
+
+        registry.add_extensions("my.ep", [4, 5])
+
+        self.assertEqual([], fetches)
+        self.assertIs(value, f.x)
+        self.assertEqual([1, 2, 3, 4, 5], f.x)
+        self.assertEqual("x_items", listener.trait_name)
+        self.assertEqual([4, 5], listener.new.added)
+        self.assertEqual(3, listener.new.index)
+
+        # Invalid extensions are still rejected.
+        with self.assertRaises(TraitError):
+            registry.add_extension("my.ep", "a string")
+        self.assertEqual([1, 2, 3, 4, 5], f.x)
+
+    def test_index_events_refetch_out_of_date_list(self):
+        """ index events refetch the list if it does not match the event """
+
+        registry = self.extension_registry
+
+        # Add an extension point.
+        registry.add_extension_point(self._create_extension_point("my.ep"))
+        registry.add_extensions("my.ep", [1, 2, 3])
+
+        # Declare a class that consumes the extension.
+        class Foo(HasTraits):
+            x = List(Int)
+
+        f = Foo()
+        bind_extension_point(f, "x", "my.ep")
+
+        # Change the registry without telling the binding...
+        registry._get_extensions("my.ep")[0] = 42
+
+        # ... and then tell it about a change that doesn't match its list.
+        del registry._get_extensions("my.ep")[0]
+        registry._call_listeners(
+            registry._get_listener_refs("my.ep"), "my.ep", [], [42], 0
+        )
+
+        self.assertEqual([2, 3], f.x)
+
     ###########################################################################
     # Private interface.
     ###########################################################################
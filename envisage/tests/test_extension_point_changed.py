@@ -59,7 +59,8 @@ class ExtensionPointChangedTestCase(unittest.TestCase):
         application.start()
 
         # when
-        a.x.append(42)
+        with self.assertRaises(TypeError):
+            a.x.append(42)
 
         # then
         self.assertIsNone(listener.obj)
@@ -0,0 +1,165 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+""" Tests for merging extension point changed events. """
+
+# Standard library imports.
+import unittest
+
+# Enthought library imports.
+from envisage.extension_point_changed_event import (
+    ExtensionPointChangedEvent,
+    merge_events,
+)
+from traits.api import HasTraits, List
+
+
+# The starting list for all tests.
+TEST_LIST = [7, 9, 2, 3, 4, 1, 6, 5, 8, 0]
+
+
+class Contributions(HasTraits):
+    """ Records the list events fired when a list is modified. """
+
+    x = List
+
+    events = List
+
+    def _x_items_changed(self, event):
+        self.events.append(
+            ExtensionPointChangedEvent(
+                extension_point_id="my.ep",
+                added=event.added,
+                removed=event.removed,
+                index=event.index,
+            )
+        )
+
+
+def replay(extensions, event):
+    """ Apply an event to a list the way a listener would. """
+
+    extensions = extensions[:]
+    if event.index is None:
+        return list(event.added)
+
+    if isinstance(event.index, slice):
+        if event.added:
+            extensions[event.index] = event.added
+        else:
+            del extensions[event.index]
+
+    else:
+        extensions[event.index:event.index + len(event.removed)] = (
+            event.added
+        )
+
+    return extensions
+
+
+class MergeEventsTestCase(unittest.TestCase):
+    """ Tests for merging extension point changed events. """
+
+    def assertMerges(self, *operations):
+        """ Check that the events fired by operations merge into one. """
+
+        contributions = Contributions(x=TEST_LIST)
+        for operation in operations:
+            operation(contributions.x)
+
+        merged = contributions.events[0]
+        for event in contributions.events[1:]:
+            merged = merge_events(merged, event)
+            self.assertIsNotNone(merged)
+
+        self.assertEqual(contributions.x, replay(TEST_LIST, merged))
+
+        return merged
+
+    def test_appends(self):
+        merged = self.assertMerges(*[lambda x: x.append(42)] * 5)
+
+        self.assertEqual(10, merged.index)
+        self.assertEqual([42] * 5, merged.added)
+        self.assertEqual([], merged.removed)
+
+    def test_inserts(self):
+        merged = self.assertMerges(
+            lambda x: x.insert(3, "a"),
+            lambda x: x.insert(3, "b"),
+            lambda x: x.insert(5, "c"),
+            lambda x: x.insert(4, "d"),
+        )
+
+        self.assertEqual(3, merged.index)
+        self.assertEqual(["b", "d", "a", "c"], merged.added)
+
+    def test_deletes(self):
+        merged = self.assertMerges(
+            lambda x: x.pop(4),
+            lambda x: x.pop(4),
+            lambda x: x.pop(3),
+            lambda x: x.remove(6),
+        )
+
+        self.assertEqual(3, merged.index)
+        self.assertEqual([3, 4, 1, 6], merged.removed)
+
+    def test_replacement_then_anything(self):
+        contributions = Contributions(x=[1, 2, 3, 4])
+        contributions.x[::2] = ["a", "b"]
+        contributions.x.insert(1, "c")
+        del contributions.x[::2]
+        contributions.x[0:1] = ["d", "e"]
+
+        merged = ExtensionPointChangedEvent(
+            extension_point_id="my.ep",
+            added=[1, 2, 3, 4],
+            removed=TEST_LIST,
+            index=None,
+        )
+        for event in contributions.events:
+            merged = merge_events(merged, event)
+
+        self.assertIsNone(merged.index)
+        self.assertEqual(TEST_LIST, merged.removed)
+        self.assertEqual(contributions.x, merged.added)
+
+    def test_anything_then_replacement(self):
+        contributions = Contributions(x=TEST_LIST)
+        contributions.x.insert(3, "a")
+        del contributions.x[::3]
+        contributions.x[::2] = "abcd"
+
+        before = TEST_LIST
+        for event in contributions.events:
+            replacement = ExtensionPointChangedEvent(
+                extension_point_id="my.ep",
+                added=[1],
+                removed=replay(before, event),
+                index=None,
+            )
+            merged = merge_events(event, replacement)
+
+            self.assertIsNone(merged.index)
+            self.assertEqual(before, merged.removed)
+            self.assertEqual([1], merged.added)
+
+            before = replacement.removed
+
+    def test_unmergeable(self):
+        contributions = Contributions(x=TEST_LIST)
+        contributions.x.insert(3, "a")
+        contributions.x.pop(0)
+        contributions.x[1] = "b"
+        contributions.x[::2] = "abcde"
+
+        events = contributions.events
+        for first, second in zip(events, events[1:]):
+            self.assertIsNone(merge_events(first, second))
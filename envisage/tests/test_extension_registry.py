@@ -10,7 +10,9 @@
 """ Tests for the base extension registry. """
 
 # Standard library imports.
+import concurrent.futures
 import contextlib
+import threading
 import unittest
 
 # Enthought library imports.
@@ -69,6 +71,197 @@ class ExtensionRegistryTestCase(ExtensionRegistryTestMixin, unittest.TestCase):
         self.assertEqual([1, 2, 3], registry.get_extensions("my.ep"))
 
 
+class DeferredDispatchTestCase(unittest.TestCase):
+    """ Tests for deferred dispatch of extension point changed events. """
+
+    def setUp(self):
+        self.registry = ExtensionRegistry()
+        self.registry.add_extension_point(
+            ExtensionPoint(id="my.ep", trait_type=List())
+        )
+        self.registry.add_extension_point(
+            ExtensionPoint(id="your.ep", trait_type=List())
+        )
+
+        self.events = []
+        self.listener = make_function_listener(self.events)
+        self.registry.add_extension_point_listener(self.listener)
+
+    def test_deferred_dispatch_block(self):
+        registry = self.registry
+
+        with registry.deferred_dispatch():
+            registry.set_extensions("my.ep", [1, 2, 3])
+            registry.set_extensions("your.ep", [4])
+            with registry.deferred_dispatch():
+                registry.set_extensions("my.ep", [5, 6])
+            registry.set_extensions("my.ep", [7])
+
+            # Nothing is dispatched until the outermost block exits...
+            self.assertEqual([], self.events)
+
+        # ... and then consecutive events are merged.
+        my_event, your_event = self.events
+        self.assertEqual("my.ep", my_event.extension_point_id)
+        self.assertEqual([], my_event.removed)
+        self.assertEqual([7], my_event.added)
+        self.assertIsNone(my_event.index)
+        self.assertEqual("your.ep", your_event.extension_point_id)
+        self.assertEqual([4], your_event.added)
+
+        # Dispatch is immediate again after the block.
+        registry.set_extensions("my.ep", [8])
+        self.assertEqual(3, len(self.events))
+
+    def test_deferred_dispatch_block_with_error(self):
+        registry = self.registry
+
+        with self.assertRaises(ZeroDivisionError):
+            with registry.deferred_dispatch():
+                registry.set_extensions("my.ep", [1, 2, 3])
+                1 / 0
+
+        self.assertEqual(1, len(self.events))
+
+    def test_deferred_mode(self):
+        registry = self.registry
+        registry.dispatch_mode = "deferred"
+
+        registry.set_extensions("my.ep", [1, 2, 3])
+        registry.set_extensions("my.ep", [4])
+        self.assertEqual([], self.events)
+
+        registry.flush_events()
+        (event,) = self.events
+        self.assertEqual([4], event.added)
+
+        # Flushing again does nothing.
+        registry.flush_events()
+        self.assertEqual(1, len(self.events))
+
+    def test_deferred_mode_with_flush_scheduler(self):
+        scheduled = []
+
+        registry = self.registry
+        registry.dispatch_mode = "deferred"
+        registry.flush_scheduler = scheduled.append
+
+        registry.set_extensions("my.ep", [1, 2, 3])
+        registry.set_extensions("your.ep", [4])
+        self.assertEqual(1, len(scheduled))
+
+        scheduled.pop()()
+        self.assertEqual(2, len(self.events))
+
+        # A new flush is scheduled for later changes.
+        registry.set_extensions("my.ep", [5])
+        self.assertEqual(1, len(scheduled))
+
+    def test_scheduled_flush_inside_deferred_dispatch_block(self):
+        scheduled = []
+
+        registry = self.registry
+        registry.dispatch_mode = "deferred"
+        registry.flush_scheduler = scheduled.append
+
+        with registry.deferred_dispatch():
+            registry.set_extensions("my.ep", [1, 2, 3])
+            scheduled.pop()()
+            self.assertEqual([], self.events)
+
+        self.assertEqual(1, len(self.events))
+
+    def test_listeners_are_looked_up_at_dispatch(self):
+        registry = self.registry
+
+        with registry.deferred_dispatch():
+            registry.set_extensions("my.ep", [1, 2, 3])
+            registry.remove_extension_point_listener(self.listener)
+
+        self.assertEqual([], self.events)
+
+
+class ConcurrencyTestCase(unittest.TestCase):
+    """ Tests for using the registry from multiple threads. """
+
+    def setUp(self):
+        self.registry = ExtensionRegistry()
+        self.registry.add_extension_point(
+            ExtensionPoint(id="my.ep", trait_type=List())
+        )
+
+        self.events = []
+        self.listener = make_function_listener(self.events)
+        self.registry.add_extension_point_listener(self.listener, "my.ep")
+
+    def test_listener_executor(self):
+        submitted = []
+        registry = self.registry
+        registry.listener_executor = submitted.append
+
+        registry.set_extensions("my.ep", [1, 2, 3])
+        registry.set_extensions("my.ep", [4])
+
+        # The registry has changed, but the listeners have not been called.
+        self.assertEqual([4], registry.get_extensions("my.ep"))
+        self.assertEqual([], self.events)
+
+        for call in submitted:
+            call()
+
+        self.assertEqual(
+            [[1, 2, 3], [4]], [event.added for event in self.events]
+        )
+
+    def test_listener_executor_thread(self):
+        registry = self.registry
+        threads = []
+
+        def listener(registry, event):
+            threads.append(threading.current_thread())
+
+        registry.add_extension_point_listener(listener, "my.ep")
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            registry.listener_executor = executor.submit
+            registry.set_extensions("my.ep", [1, 2, 3])
+
+        self.assertEqual(1, len(threads))
+        self.assertIsNot(threading.current_thread(), threads[0])
+
+    def test_readers_do_not_wait_for_writers(self):
+        registry = self.registry
+        registry.set_extensions("my.ep", [1, 2, 3])
+        registry.get_extensions("my.ep")
+
+        def write():
+            # Block the registry's lock as a long running change would.
+            with registry._lock:
+                writing.set()
+                finish_writing.wait()
+
+        writing = threading.Event()
+        finish_writing = threading.Event()
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            writing.wait()
+            self.assertEqual([1, 2, 3], registry.get_extensions("my.ep"))
+
+        finally:
+            finish_writing.set()
+            writer.join()
+
+    def test_get_extensions_returns_copy(self):
+        registry = self.registry
+        registry.set_extensions("my.ep", [1, 2, 3])
+
+        extensions = registry.get_extensions("my.ep")
+        extensions.append(4)
+
+        self.assertEqual([1, 2, 3], registry.get_extensions("my.ep"))
+
+
 def make_function_listener(events):
     """
     Return a simple non-method extension point listener.
@@ -162,6 +355,63 @@ class ExtensionPointListenerLifetimeTestCase(unittest.TestCase):
         with self.assertDoesNotModify(self.events):
             self.registry.set_extensions("my.ep", [1, 2, 3])
 
+    def test_dead_listeners_are_pruned(self):
+        listeners = [make_function_listener(self.events) for _ in range(10)]
+        objs = [ListensToExtensionPoint(self.events) for _ in range(10)]
+        for listener in listeners:
+            self.registry.add_extension_point_listener(listener, "my.ep")
+        for obj in objs:
+            self.registry.add_extension_point_listener(obj.listener, "my.ep")
+
+        registry_listeners = self.registry.extension_registry._listeners
+        self.assertEqual(20, len(registry_listeners["my.ep"]))
+
+        del listener, listeners, obj, objs
+
+        self.assertEqual(0, len(registry_listeners["my.ep"]))
+        with self.assertDoesNotModify(self.events):
+            self.registry.set_extensions("my.ep", [1, 2, 3])
+
+    def test_add_listener_twice(self):
+        listener = make_function_listener(self.events)
+        self.registry.add_extension_point_listener(listener, "my.ep")
+        self.registry.add_extension_point_listener(listener, "my.ep")
+
+        with self.assertAppendsTo(self.events):
+            self.registry.set_extensions("my.ep", [1, 2, 3])
+
+        self.registry.remove_extension_point_listener(listener, "my.ep")
+        with self.assertRaises(ValueError):
+            self.registry.remove_extension_point_listener(listener, "my.ep")
+
+    def test_listener_added_during_dispatch(self):
+        listener = make_function_listener(self.events)
+
+        def add_listener(registry, event):
+            self.registry.add_extension_point_listener(listener, "my.ep")
+
+        self.registry.add_extension_point_listener(add_listener, "my.ep")
+
+        # The new listener is only called for later changes.
+        with self.assertDoesNotModify(self.events):
+            self.registry.set_extensions("my.ep", [1, 2, 3])
+        with self.assertAppendsTo(self.events):
+            self.registry.set_extensions("my.ep", [4])
+
+    def test_listener_refs_are_reused(self):
+        listener = make_function_listener(self.events)
+        self.registry.add_extension_point_listener(listener, "my.ep")
+        self.registry.add_extension_point_listener(listener)
+
+        registry = self.registry.extension_registry
+        refs = registry._get_listener_refs("my.ep")
+        self.assertEqual(2, len(refs))
+        self.assertIs(refs, registry._get_listener_refs("my.ep"))
+
+        # Any change to the listeners invalidates the references.
+        self.registry.remove_extension_point_listener(listener)
+        self.assertEqual(1, len(registry._get_listener_refs("my.ep")))
+
     # Helper assertions #######################################################
 
     @contextlib.contextmanager
@@ -0,0 +1,188 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+""" Tests for saving preferences in the background. """
+
+# Standard library imports.
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# Enthought library imports.
+from configobj import ConfigObj
+
+from envisage.api import Application, PreferencesSaver, TrackedPreferences
+from envisage.tests.ets_config_patcher import ETSConfigPatcher
+
+
+class PreferencesSaverTestCase(unittest.TestCase):
+    """ Tests for saving preferences in the background. """
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+        self.filename = os.path.join(self.tmpdir, "preferences.ini")
+        with open(self.filename, "w") as f:
+            f.write("[acme.foo]\nx = 1\n[acme.bar]\ny = 2\n")
+
+        self.preferences = TrackedPreferences(filename=self.filename)
+        self.saver = PreferencesSaver(preferences=self.preferences, delay=60)
+        self.addCleanup(self.saver.stop)
+
+    def read(self):
+        """ Read the preferences file. """
+
+        return ConfigObj(self.filename, encoding="utf-8").dict()
+
+    def test_changes_are_saved_in_background(self):
+        saved = threading.Event()
+        write_nodes = PreferencesSaver._write_nodes
+
+        def write_and_notify(saver, preferences, paths):
+            write_nodes(saver, preferences, paths)
+            saved.set()
+
+        self.saver.delay = 0.01
+        with mock.patch.object(
+            PreferencesSaver, "_write_nodes", write_and_notify
+        ):
+            self.preferences.set("acme.foo.x", 42)
+
+            self.assertTrue(saved.wait(10.0))
+
+        self.assertEqual("42", self.read()["acme.foo"]["x"])
+
+    def test_changes_are_debounced(self):
+        with mock.patch.object(PreferencesSaver, "_write_nodes") as write:
+            with mock.patch(
+                "threading.Thread", wraps=threading.Thread
+            ) as thread:
+                for i in range(20):
+                    self.preferences.set("acme.foo.x", i)
+                self.preferences.set("acme.bar.y", 43)
+
+            # A burst of changes only needs the one background thread...
+            self.assertEqual(1, thread.call_count)
+            write.assert_not_called()
+
+            # ... and all of the changes are saved together.
+            self.saver.flush()
+
+        write.assert_called_once_with(
+            self.preferences, {"acme.foo", "acme.bar"}
+        )
+
+    def test_deadline_follows_the_last_change(self):
+        with mock.patch("time.monotonic", return_value=100.0):
+            self.preferences.set("acme.foo.x", 42)
+        with mock.patch("time.monotonic", return_value=130.0):
+            self.preferences.set("acme.bar.y", 43)
+
+        self.assertEqual(190.0, self.saver._deadline)
+
+        self.saver.flush()
+
+        self.assertIsNone(self.saver._deadline)
+
+    def test_only_changed_nodes_are_saved(self):
+        self.preferences.set("acme.foo.x", 42)
+        self.preferences.set("acme.baz.z", 3)
+        self.preferences.remove("acme.baz.z")
+
+        # Someone else changes a node that we haven't changed.
+        config_obj = ConfigObj(self.filename, encoding="utf-8")
+        config_obj["acme.bar"]["y"] = "99"
+        config_obj.write()
+
+        self.saver.flush()
+
+        self.assertEqual(
+            {"acme.foo": {"x": "42"}, "acme.bar": {"y": "99"}}, self.read()
+        )
+        self.assertEqual(["preferences.ini"], os.listdir(self.tmpdir))
+
+    def test_unchanged_values_are_not_changes(self):
+        self.preferences.set("acme.foo.x", 1)
+        self.preferences.clear("acme.qux")
+
+        self.assertIsNone(self.saver._deadline)
+        self.assertIsNone(self.saver._thread)
+
+    def test_flush_without_changes(self):
+        with mock.patch.object(PreferencesSaver, "_write_nodes") as write:
+            self.saver.flush()
+
+        write.assert_not_called()
+
+    def test_failed_save_is_retried(self):
+        self.preferences.set("acme.foo.x", 42)
+
+        with mock.patch("os.replace", side_effect=OSError("disk full")):
+            with self.assertLogs("envisage.preferences_saver"):
+                self.saver.flush()
+
+        self.assertEqual("1", self.read()["acme.foo"]["x"])
+        self.assertEqual(["preferences.ini"], os.listdir(self.tmpdir))
+
+        self.saver.flush()
+
+        self.assertEqual("42", self.read()["acme.foo"]["x"])
+
+    def test_stop_saves_changes(self):
+        # Use a saver of our own, as the fixture's one is stopped on cleanup.
+        saver = PreferencesSaver(preferences=self.preferences, delay=60)
+        self.preferences.set("acme.foo.x", 42)
+
+        thread = saver._thread
+
+        saver.stop()
+
+        self.assertEqual("42", self.read()["acme.foo"]["x"])
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(saver._thread)
+
+        # Later changes are no longer tracked.
+        self.preferences.set("acme.foo.x", 43)
+
+        self.assertIsNone(saver._thread)
+
+
+class ApplicationPreferencesTestCase(unittest.TestCase):
+    """ Tests for saving application preferences in the background. """
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+
+        ets_config_patcher = ETSConfigPatcher()
+        ets_config_patcher.start()
+        self.addCleanup(ets_config_patcher.stop)
+
+    def test_stop_saves_only_changes(self):
+        application = Application(save_preferences_in_background=True)
+        application.start()
+        application.preferences.set("acme.foo.x", 42)
+
+        application.stop()
+
+        filename = os.path.join(application.home, "preferences.ini")
+        config_obj = ConfigObj(filename, encoding="utf-8")
+        self.assertEqual("42", config_obj["acme.foo"]["x"])
+
+        # Nothing has changed since, so nothing is saved.
+        with mock.patch.object(PreferencesSaver, "_write_nodes") as write:
+            application.start()
+            application.stop()
+
+        write.assert_not_called()
@@ -10,6 +10,7 @@
 """ Tests for the provider extension registry. """
 
 # Standard library imports.
+import threading
 import unittest
 
 # Enthought library imports.
@@ -234,6 +235,135 @@ class ProviderExtensionRegistryTestCase(
         self.assertEqual(4, len(extensions))
         self.assertEqual([42, 43, 1, 2], extensions)
 
+    def test_deferred_dispatch_merges_provider_changes(self):
+        """ deferred dispatch merges provider changes """
+
+        registry = self.registry
+
+        class Provider(ExtensionProvider):
+            """ An extension provider. """
+
+            x = List(Int)
+
+            def get_extension_points(self):
+                """ Return the extension points offered by the provider. """
+
+                return [ExtensionPoint(List, "my.ep")]
+
+            def get_extensions(self, extension_point_id):
+                """ Return the provider's contributions to an extension point.
+
+                """
+
+                if extension_point_id == "my.ep":
+                    return self.x
+
+                return []
+
+            def _x_items_changed(self, event):
+                """ Static trait change handler. """
+
+                self._fire_extension_point_changed(
+                    "my.ep", event.added, event.removed, event.index
+                )
+
+        a = Provider(x=[1, 2])
+        b = Provider(x=[3])
+        registry.add_provider(a)
+        registry.add_provider(b)
+        self.assertEqual([1, 2, 3], registry.get_extensions("my.ep"))
+
+        events = []
+
+        def listener(registry, event):
+            events.append(event)
+
+        registry.add_extension_point_listener(listener, "my.ep")
+
+        with registry.deferred_dispatch():
+            for i in range(500):
+                a.x.append(i)
+
+        (event,) = events
+        self.assertEqual(list(range(500)), event.added)
+        self.assertEqual([], event.removed)
+        self.assertEqual(2, event.index)
+
+        # Changes that cannot be merged are dispatched in order.
+        del events[:]
+        with registry.deferred_dispatch():
+            a.x.append(500)
+            b.x.pop()
+            b.x.append(4)
+
+        self.assertEqual(
+            [([500], [], 2 + 500), ([], [3], 503), ([4], [], 503)],
+            [(event.added, event.removed, event.index) for event in events],
+        )
+        self.assertEqual(
+            [1, 2] + list(range(501)) + [4], registry.get_extensions("my.ep")
+        )
+
+    def test_concurrent_reads(self):
+        """ reads from other threads see consistent extensions """
+
+        registry = self.registry
+
+        class Provider(ExtensionProvider):
+            """ An extension provider. """
+
+            x = List(Int)
+
+            def get_extensions(self, extension_point_id):
+                """ Return the provider's contributions to an extension point.
+
+                """
+
+                if extension_point_id == "my.ep":
+                    return self.x
+
+                return []
+
+        class ExtensionPointProvider(Provider):
+            """ An extension provider that offers the extension point. """
+
+            def get_extension_points(self):
+                """ Return the extension points offered by the provider. """
+
+                return [ExtensionPoint(List, "my.ep")]
+
+        registry.add_provider(ExtensionPointProvider(x=list(range(50))))
+        providers = [Provider(x=list(range(50))) for _ in range(10)]
+
+        # Every read must see a whole number of providers' contributions.
+        torn_reads = []
+        stop = threading.Event()
+
+        def read():
+            while not stop.is_set():
+                extensions = registry.get_extensions("my.ep")
+                if extensions != list(range(50)) * (len(extensions) // 50):
+                    torn_reads.append(extensions)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+
+        try:
+            for _ in range(20):
+                for provider in providers:
+                    registry.add_provider(provider)
+                for provider in providers:
+                    registry.remove_provider(provider)
+
+        finally:
+            stop.set()
+            for reader in readers:
+                reader.join()
+
+        self.assertEqual([], torn_reads)
+        self.assertEqual(list(range(50)), registry.get_extensions("my.ep"))
+
     def test_add_provider(self):
         """ add provider """
 
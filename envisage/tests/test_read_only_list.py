@@ -0,0 +1,75 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+""" Tests for read-only lists. """
+
+# Standard library imports.
+import copy
+import pickle
+import unittest
+
+# Enthought library imports.
+from envisage.read_only_list import ReadOnlyList
+from traits.api import HasTraits, Int, List
+
+
+class ReadOnlyListTestCase(unittest.TestCase):
+    """ Tests for read-only lists. """
+
+    def test_modification_not_allowed(self):
+        value = ReadOnlyList([3, 1, 2])
+
+        modifications = [
+            lambda: value.append(4),
+            lambda: value.extend([4]),
+            lambda: value.insert(0, 4),
+            lambda: value.pop(),
+            lambda: value.remove(1),
+            lambda: value.clear(),
+            lambda: value.sort(),
+            lambda: value.reverse(),
+            lambda: value.__setitem__(0, 4),
+            lambda: value.__delitem__(0),
+            lambda: value.__iadd__([4]),
+            lambda: value.__imul__(2),
+        ]
+        for modification in modifications:
+            with self.assertRaises(TypeError):
+                modification()
+
+        self.assertEqual([3, 1, 2], value)
+
+    def test_copies_are_modifiable(self):
+        value = ReadOnlyList([3, 1, 2])
+
+        copied = value[:]
+        copied.sort()
+        self.assertEqual([1, 2, 3], copied)
+        self.assertEqual([3, 1, 2, 4], value + [4])
+        self.assertEqual([1, 2, 3], sorted(value))
+
+    def test_copy_and_pickle(self):
+        value = ReadOnlyList([1, [2, 3]])
+
+        for copied in [
+            copy.copy(value),
+            copy.deepcopy(value),
+            pickle.loads(pickle.dumps(value)),
+        ]:
+            self.assertIsInstance(copied, ReadOnlyList)
+            self.assertEqual(value, copied)
+
+    def test_assign_to_list_trait(self):
+        class Foo(HasTraits):
+            x = List(Int)
+
+        f = Foo(x=ReadOnlyList([1, 2]))
+        f.x.append(3)
+
+        self.assertEqual([1, 2, 3], f.x)
@@ -506,3 +506,44 @@ class ServiceRegistryTestCase(unittest.TestCase):
         self.assertNotEqual(None, service)
         self.assertEqual(Foo, type(service))
         self.assertEqual(z, service)
+
+    def test_child_registry(self):
+        """ child registry """
+
+        class IFoo(Interface):
+            price = Int
+
+        @provides(IFoo)
+        class Foo(HasTraits):
+            price = Int
+
+        parent_foo = Foo(price=10)
+        parent_id = self.service_registry.register_service(IFoo, parent_foo)
+
+        child = ServiceRegistry(parent=self.service_registry)
+
+        # The child falls back to the parent's services...
+        self.assertIs(parent_foo, child.get_service(IFoo))
+        self.assertEqual([parent_foo], child.get_services(IFoo))
+
+        # ... but its own services come first.
+        child_foo = Foo(price=20)
+        child_id = child.register_service(IFoo, child_foo)
+
+        self.assertIs(child_foo, child.get_service(IFoo))
+        self.assertEqual([child_foo, parent_foo], child.get_services(IFoo))
+        self.assertIs(parent_foo, child.get_service(IFoo, "price < 15"))
+        self.assertIs(parent_foo, child.get_service(IFoo, minimize="price"))
+
+        # The parent doesn't know about the child's services.
+        self.assertEqual(
+            [parent_foo], self.service_registry.get_services(IFoo)
+        )
+
+        # Service Ids are local to each registry.
+        self.assertIs(child_foo, child.get_service_from_id(child_id))
+        self.assertIs(
+            parent_foo, self.service_registry.get_service_from_id(parent_id)
+        )
+        child.unregister_service(child_id)
+        self.assertIs(parent_foo, child.get_service(IFoo))
@@ -9,8 +9,544 @@
 # Thanks for using Enthought open source!
 
 import unittest
+from unittest import mock
+
+import pyface.action.api as pyface
+from traits.api import (
+    Any,
+    Event,
+    HasTraits,
+    Instance,
+    Interface,
+    List,
+    provides,
+    Str,
+)
+
+from envisage.api import (
+    Application,
+    ServiceOffer,
+    ServiceRegistry,
+)
+from envisage.ui.action.api import Action, ActionSet, Group, Menu
+from envisage.ui.workbench.lazy_action import LazyAction
+from envisage.ui.workbench.workbench_action_manager_builder import (
+    WorkbenchActionManagerBuilder,
+)
+from envisage.ui.workbench.workbench_action_set import WorkbenchActionSet
+from envisage.ui.workbench.window_action_sets_mixin import (
+    WindowActionSetsMixin,
+)
+from envisage.ui.workbench.window_services_mixin import WindowServicesMixin
 
 
 class TestWorkbenchDefaultAction(unittest.TestCase):
     def test_workbench_default_action(self):
         import envisage.ui.workbench.default_action_set  # noqa: F401
+
+
+class Window(HasTraits):
+    """ A stand-in for a workbench window. """
+
+    application = Instance(Application, ())
+
+
+class WindowAction(pyface.Action):
+    """ An action that remembers the window that it is in. """
+
+    window = Any
+
+
+class DeepAction(WindowAction):
+    """ Another action. """
+
+
+class PerformAction(WindowAction):
+    """ An action that remembers being performed. """
+
+    events = List
+
+    def perform(self, event):
+        self.events.append(event)
+
+
+class ViewMenuManager(pyface.MenuManager):
+    """ A menu that creates some of its own items. """
+
+    window = Any
+
+    def __init__(self, **traits):
+        super().__init__(pyface.Group(pyface.Action(name="view"), id="Views"),
+                         **traits)
+
+
+class TemplateActionSet(ActionSet):
+    """ An action set with a bit of everything. """
+
+    groups = [Group(id="Last", path="MenuBar"), Group(id="First",
+              path="MenuBar", before="Last")]
+
+    menus = [
+        Menu(name="&View", path="MenuBar", group="Last",
+             class_name=__name__ + ":ViewMenuManager"),
+        Menu(name="&File", path="MenuBar", group="First",
+             groups=[Group(id="OpenGroup"), Group(id="ExitGroup")]),
+        Menu(name="&File", path="MenuBar", group="First",
+             groups=[Group(id="SaveGroup", before="ExitGroup")]),
+    ]
+
+    actions = [
+        Action(name="Exit", path="MenuBar/File", group="ExitGroup",
+               class_name=__name__ + ":WindowAction"),
+        Action(name="Open", path="MenuBar/File", group="OpenGroup",
+               class_name=__name__ + ":WindowAction"),
+        Action(name="Deep", path="MenuBar/File/Recent/More",
+               class_name=__name__ + ":DeepAction"),
+        Action(name="Mode", path="MenuBar/View", group="Views",
+               before="view", class_name=__name__ + ":DeepAction"),
+    ]
+
+
+class TemplateBuilder(WorkbenchActionManagerBuilder):
+    """ A builder that does not need a real workbench window. """
+
+    window = Any
+
+    def _create_menu_bar_manager(self):
+        menu_bar_manager = pyface.MenuManager(id="MenuBar")
+        self._record(menu_bar_manager, None)
+
+        return menu_bar_manager
+
+
+class Part(HasTraits):
+    """ A stand-in for a perspective or a view. """
+
+    id = Str
+
+    # The Ids of the parts that are activated in turn when the part is shown
+    # as a perspective.
+    part_ids = List(Str)
+
+
+class PyfaceWindow(Window):
+    """ A stand-in for a pyface workbench window. """
+
+    opened = Event
+
+    active_part = Any
+
+    active_perspective = Any
+
+    action_sets = List
+
+    _action_manager_builder = Any
+
+    def get_action_set_items(self, action_set):
+        return self._action_manager_builder.get_action_set_items(action_set)
+
+    def _active_perspective_changed(self, old, new):
+        # Showing a perspective changes the active part (maybe several times).
+        for part_id in new.part_ids:
+            self.active_part = Part(id=part_id)
+
+
+class StateWindow(WindowActionSetsMixin, PyfaceWindow):
+    """ A stand-in for a workbench window that action sets can follow. """
+
+
+class StateActionSet(WorkbenchActionSet):
+    """ A workbench action set that does not need a real workbench window. """
+
+    groups = [Group(id="Main", path="MenuBar")]
+
+    menus = [
+        Menu(name="&File", path="MenuBar", group="Main",
+             groups=[Group(id="OpenGroup")]),
+    ]
+
+    window = Any
+
+
+class Workbench(HasTraits):
+    """ A stand-in for a workbench. """
+
+    application = Instance(Application)
+
+
+class ServiceWindow(WindowServicesMixin):
+    """ A stand-in for a workbench window that has 'per window' services. """
+
+    workbench = Instance(Workbench)
+
+    opening = Event
+
+    closed = Event
+
+    _service_offers = List
+
+
+class IFoo(Interface):
+    """ A service protocol. """
+
+
+@provides(IFoo)
+class Foo(HasTraits):
+    """ A service. """
+
+    window = Any
+
+
+def describe(action_manager):
+    """ Describe the structure of an action manager. """
+
+    description = []
+    for group in action_manager.groups:
+        items = []
+        for item in group.items:
+            if isinstance(item, pyface.ActionManager):
+                items.append((type(item), item.name, describe(item)))
+
+            else:
+                items.append((type(item.action), item.action.name))
+
+        description.append((group.id, items))
+
+    return description
+
+
+class TestWorkbenchActionManagerBuilder(unittest.TestCase):
+    def build(self, templates, action_set_factory=TemplateActionSet):
+        window = Window()
+        action_set = action_set_factory()
+        builder = TemplateBuilder(
+            window=window, action_sets=[action_set], templates=templates
+        )
+
+        return builder.create_menu_bar_manager("MenuBar"), window, action_set
+
+    def test_menu_bar_from_template(self):
+        templates = {}
+        expected, _, _ = self.build(None)
+
+        first, _, _ = self.build(templates)
+        self.assertEqual(1, len(templates))
+
+        with mock.patch.object(Application, "import_symbol") as import_symbol:
+            with mock.patch.object(
+                TemplateBuilder, "_add_groups_and_menus"
+            ) as add_groups_and_menus:
+                second, window, action_set = self.build(templates)
+
+        import_symbol.assert_not_called()
+        add_groups_and_menus.assert_not_called()
+
+        self.assertEqual(describe(expected), describe(first))
+        self.assertEqual(describe(expected), describe(second))
+
+        # The second menu bar has its own actions.
+        item = second.find_item("File/Recent/More/Deep")
+        self.assertEqual("Deep", item.action.name)
+        self.assertIs(window, item.action.window)
+        self.assertIs(action_set, item.action._action_set_)
+        self.assertIsNot(first.find_item("File/Recent/More/Deep"), item)
+
+    def test_different_action_sets_replace_the_template(self):
+        class OtherActionSet(TemplateActionSet):
+            aliases = {"Other": "MenuBar"}
+
+        templates = {}
+        expected, _, _ = self.build(None)
+        self.build(templates)
+        self.build(templates, OtherActionSet)
+
+        # Only the latest template for the menu bar is kept...
+        self.assertEqual(1, len(templates))
+
+        # ... so the original action sets are built from scratch again.
+        add_groups_and_menus = TemplateBuilder._add_groups_and_menus
+        calls = []
+
+        def record(builder, *args, **kwargs):
+            calls.append(args)
+            return add_groups_and_menus(builder, *args, **kwargs)
+
+        with mock.patch.object(
+            TemplateBuilder, "_add_groups_and_menus", record
+        ):
+            menu_bar, _, _ = self.build(templates)
+
+        self.assertNotEqual([], calls)
+        self.assertEqual(describe(expected), describe(menu_bar))
+        self.assertEqual(1, len(templates))
+
+    def test_lazy_action(self):
+        class LazyActionSet(ActionSet):
+            actions = [
+                Action(name="Run", path="MenuBar", accelerator="Ctrl+R",
+                       class_name=__name__ + ":PerformAction", lazy=True),
+            ]
+
+        with mock.patch.object(
+            Application, "import_symbol", return_value=PerformAction
+        ) as import_symbol:
+            menu_bar_manager, window, action_set = self.build(
+                None, LazyActionSet
+            )
+            action = menu_bar_manager.find_item("Run").action
+
+            self.assertIsInstance(action, LazyAction)
+            self.assertEqual("Run", action.name)
+            self.assertEqual("Ctrl+R", action.accelerator)
+            import_symbol.assert_not_called()
+
+            action.perform("event")
+
+        import_symbol.assert_called_once_with(__name__ + ":PerformAction")
+        implementation = action.implementation
+        self.assertEqual(["event"], implementation.events)
+        self.assertIs(window, implementation.window)
+        self.assertIs(action_set, implementation._action_set_)
+
+        # The implementation is only created once, and its state is shared.
+        action.perform("again")
+        self.assertIs(implementation, action.implementation)
+        implementation.enabled = False
+        self.assertFalse(action.enabled)
+
+    def test_action_set_items(self):
+        templates = {}
+        for _ in range(2):
+            window = Window()
+            action_set, other_action_set = TemplateActionSet(), ActionSet()
+            builder = TemplateBuilder(
+                window=window,
+                action_sets=[action_set, other_action_set],
+                templates=templates,
+            )
+            menu_bar_manager = builder.create_menu_bar_manager("MenuBar")
+
+            items = builder.get_action_set_items(action_set)
+
+            file_menu = menu_bar_manager.find_item("File")
+            self.assertEqual(
+                {
+                    menu_bar_manager.find_group("First"),
+                    menu_bar_manager.find_group("Last"),
+                    menu_bar_manager.find_item("View"),
+                    file_menu,
+                    file_menu.find_group("OpenGroup"),
+                    file_menu.find_group("SaveGroup"),
+                    file_menu.find_group("ExitGroup"),
+                },
+                set(items),
+            )
+            self.assertEqual(7, len(items))
+            self.assertEqual([], builder.get_action_set_items(
+                other_action_set
+            ))
+
+
+class TestWorkbenchActionSet(unittest.TestCase):
+    def setUp(self):
+        self.window = StateWindow()
+        self.action_set = StateActionSet()
+        builder = self.window._action_manager_builder = TemplateBuilder(
+            window=self.window, action_sets=[self.action_set]
+        )
+        builder.create_menu_bar_manager("MenuBar")
+        self.window.action_sets = [self.action_set]
+        self.items = self.window.get_action_set_items(self.action_set)
+        self.assertEqual(3, len(self.items))
+
+    def states(self, trait_name):
+        return {getattr(item, trait_name) for item in self.items}
+
+    def test_enabled_and_visible(self):
+        self.action_set.window = self.window
+
+        self.action_set.enabled = False
+        self.assertEqual({False}, self.states("enabled"))
+        self.assertEqual({True}, self.states("visible"))
+
+        self.action_set.visible = False
+        self.assertEqual({False}, self.states("visible"))
+
+        self.action_set.enabled = True
+        self.assertEqual({True}, self.states("enabled"))
+
+    def test_refresh_updates_items_once(self):
+        self.action_set.trait_set(
+            enabled_for_perspectives=["perspective"],
+            enabled_for_views=["view"],
+            window=self.window,
+        )
+
+        with mock.patch.object(
+            self.window,
+            "get_action_set_items",
+            wraps=self.window.get_action_set_items,
+        ) as get_action_set_items:
+            # Enabled for the perspective, but then not for the view.
+            self.window.trait_set(
+                active_perspective=Part(id="perspective"),
+                active_part=Part(id="other"),
+                trait_change_notify=False,
+            )
+            self.action_set.refresh()
+
+        self.assertFalse(self.action_set.enabled)
+        self.assertEqual({False}, self.states("enabled"))
+        get_action_set_items.assert_called_once_with(self.action_set)
+
+    def test_window_refreshes_action_sets(self):
+        self.action_set.trait_set(
+            enabled_for_views=["view"], window=self.window
+        )
+
+        self.window.active_part = Part(id="other")
+        self.assertEqual({False}, self.states("enabled"))
+
+        self.window.active_part = Part(id="view")
+        self.assertEqual({True}, self.states("enabled"))
+
+        self.window.trait_set(
+            active_part=Part(id="other"), trait_change_notify=False
+        )
+        self.window.opened = self.window
+        self.assertEqual({False}, self.states("enabled"))
+
+    def test_perspective_switch_refreshes_once(self):
+        other = StateActionSet(window=self.window)
+        self.window.action_sets.append(other)
+        self.action_set.trait_set(
+            enabled_for_perspectives=["perspective"],
+            visible_for_views=["view"],
+            window=self.window,
+        )
+
+        with mock.patch.object(
+            self.action_set, "refresh", wraps=self.action_set.refresh
+        ) as refresh, mock.patch.object(
+            other, "refresh", wraps=other.refresh
+        ) as other_refresh:
+            self.window.active_perspective = Part(
+                id="perspective", part_ids=["editor", "other", "view"]
+            )
+
+        refresh.assert_called_once_with()
+        other_refresh.assert_called_once_with()
+        self.assertEqual({True}, self.states("enabled"))
+        self.assertEqual({True}, self.states("visible"))
+
+    def test_reentrant_refresh(self):
+        self.action_set.trait_set(
+            enabled_for_views=["view"],
+            visible_for_views=["view"],
+            window=self.window,
+        )
+        self.window.active_part = Part(id="view")
+
+        # A listener that activates the view again when the action set is
+        # disabled (so that the window's action sets become stale while they
+        # are being refreshed).
+        def activate_view(enabled):
+            if not enabled:
+                self.window.active_part = Part(id="view")
+
+        self.action_set.on_trait_change(activate_view, "enabled")
+
+        with mock.patch.object(
+            self.action_set, "refresh", wraps=self.action_set.refresh
+        ) as refresh:
+            self.window.active_part = Part(id="other")
+
+        self.assertEqual(2, refresh.call_count)
+        self.assertEqual("view", self.window.active_part.id)
+        self.assertEqual({True}, self.states("enabled"))
+        self.assertEqual({True}, self.states("visible"))
+
+    def test_reentrant_action_set_refresh(self):
+        self.action_set.trait_set(
+            enabled_for_views=["view"], window=self.window
+        )
+
+        # A listener that refreshes the action set while it is refreshing.
+        def refresh(enabled):
+            self.action_set.refresh()
+
+        self.action_set.on_trait_change(refresh, "enabled")
+        self.window.trait_set(
+            active_part=Part(id="other"), trait_change_notify=False
+        )
+        self.action_set.refresh()
+
+        self.assertEqual({False}, self.states("enabled"))
+
+
+class TestWorkbenchWindowServices(unittest.TestCase):
+    def setUp(self):
+        self.application = Application(id="test")
+        self.app_foo = Foo()
+        self.application.register_service(IFoo, self.app_foo)
+
+    def test_fall_back_to_application_services(self):
+        window = ServiceWindow(
+            workbench=Workbench(application=self.application)
+        )
+
+        self.assertIs(self.app_foo, window.get_service(IFoo))
+
+        window_foo = Foo()
+        window.register_service(IFoo, window_foo)
+
+        self.assertIs(window_foo, window.get_service(IFoo))
+        self.assertEqual([window_foo, self.app_foo], window.get_services(IFoo))
+        self.assertEqual([self.app_foo], self.application.get_services(IFoo))
+
+    def test_registry_created_before_the_workbench(self):
+        window = ServiceWindow()
+        registry = window.service_registry
+        self.assertIsNone(registry.parent)
+
+        window.workbench = Workbench()
+        window.workbench.application = self.application
+
+        self.assertIs(registry, window.service_registry)
+        self.assertIs(self.app_foo, window.get_service(IFoo))
+
+    def test_explicit_registry_is_left_alone(self):
+        registry = ServiceRegistry()
+        window = ServiceWindow(service_registry=registry)
+        window.workbench = Workbench(application=self.application)
+
+        self.assertIsNone(registry.parent)
+        self.assertIsNone(window.get_service(IFoo))
+
+    def test_service_offers_are_dropped_on_close(self):
+        window = ServiceWindow(
+            workbench=Workbench(application=self.application),
+            _service_offers=[
+                ServiceOffer(protocol=IFoo, factory=Foo),
+                ServiceOffer(protocol=IFoo, factory=Foo),
+            ],
+        )
+        registry = window.service_registry
+        unregistered = []
+
+        def record(service_id):
+            unregistered.append(service_id)
+
+        registry.on_trait_change(record, "unregistered")
+
+        window.opening = True
+        service_ids = window._service_ids
+        services = window.get_services(IFoo)
+        self.assertEqual(3, len(services))
+        self.assertIs(window, services[0].window)
+
+        window.closed = True
+
+        self.assertIs(registry, window.service_registry)
+        self.assertEqual(service_ids[::-1], unregistered)
+        self.assertEqual([self.app_foo], window.get_services(IFoo))
@@ -9,6 +9,8 @@
 # Thanks for using Enthought open source!
 """ Builds menus, menu bars and tool bars from action sets. """
 
+# Standard library imports.
+import heapq
 
 # Enthought library imports.
 from pyface.action.api import ActionManager, MenuManager
@@ -55,39 +57,60 @@ class AbstractActionManagerBuilder(HasTraits):
 
         return menu_bar_manager
 
-    # fixme: V3 refactor loooong (and confusing) method!
     def create_tool_bar_managers(self, root):
         """ Creates all tool bar managers from the builder's action sets. """
 
+        # Sort the groups and actions for the root by the tool bar that they
+        # belong to (the second component of their path), or None for the old
+        # style (single) tool bar if their path is just the root.
+        #
+        # The definitions are shared (e.g. with the builders for any other
+        # windows), so instead of changing their paths, we make a note of
+        # their paths relative to their tool bar.
+        #
+        # e.g. {tool_bar_name : ([group, ...], [action, ...])}
+        tool_bar_items = {}
+        paths = {}
+        for kind, items in enumerate(
+            [
+                self._action_set_manager.get_groups(root),
+                self._action_set_manager.get_actions(root),
+            ]
+        ):
+            for item in items:
+                if item.path == root:
+                    name = None
+
+                else:
+                    components = item.path.split("/")
+                    if len(components) < 2 or components[0] != root:
+                        continue
+
+                    name = components[1]
+                    paths[item] = "/".join(components[1:])
+
+                tool_bar_items.setdefault(name, ([], []))[kind].append(item)
+
         ########################################
         # New style (i.e multi) tool bars.
         ########################################
 
         tool_bar_managers = []
         for tool_bar in self._action_set_manager.get_tool_bars(root):
-            # Get all of the groups for the tool bar.
-            groups = []
-            for group in self._action_set_manager.get_groups(root):
-                if group.path.startswith("%s/%s" % (root, tool_bar.name)):
-                    group.path = "/".join(group.path.split("/")[1:])
-                    groups.append(group)
-
-            # Get all of the actions for the tool bar.
-            actions = []
-            for action in self._action_set_manager.get_actions(root):
-                if action.path.startswith("%s/%s" % (root, tool_bar.name)):
-                    action.path = "/".join(action.path.split("/")[1:])
-                    actions.append(action)
+            # Get all of the groups and actions for the tool bar (if there
+            # are several tool bars with the same name, the first one gets
+            # them).
+            groups, actions = tool_bar_items.pop(tool_bar.name, ([], []))
 
             # We don't add the tool bar if it is empty!
             if len(groups) + len(actions) > 0:
                 tool_bar_manager = self._create_tool_bar_manager(tool_bar)
 
                 # Add all groups and menus.
-                self._add_groups_and_menus(tool_bar_manager, groups)
+                self._add_groups_and_menus(tool_bar_manager, groups, paths)
 
                 # Add all of the actions ot the menu manager.
-                self._add_actions(tool_bar_manager, actions)
+                self._add_actions(tool_bar_manager, actions, paths)
 
                 # Include the tool bar!
                 tool_bar_managers.append(tool_bar_manager)
@@ -96,17 +119,7 @@ class AbstractActionManagerBuilder(HasTraits):
         # Scoop up old groups and actions for the old style (single) tool bar.
         ######################################################################
 
-        # Get all of the groups for the tool bar.
-        groups = []
-        for group in self._action_set_manager.get_groups(root):
-            if group.path == root:
-                groups.append(group)
-
-        # Get all of the actions for the tool bar.
-        actions = []
-        for action in self._action_set_manager.get_actions(root):
-            if action.path == root:
-                actions.append(action)
+        groups, actions = tool_bar_items.get(None, ([], []))
 
         # We don't add the tool bar if it is empty!
         if len(groups) + len(actions) > 0:
@@ -173,6 +186,17 @@ class AbstractActionManagerBuilder(HasTraits):
 
         raise NotImplementedError
 
+    def _get_action_id(self, action_definition):
+        """ Returns the ID that the implementation of an action will have.
+
+        This is only used to explain why actions could not be placed, and it
+        must not create the implementation (which might mean importing its
+        class). By default, an action's ID is its name.
+
+        """
+
+        return getattr(action_definition, "id", "") or action_definition.name
+
     ###########################################################################
     # Private interface.
     ###########################################################################
@@ -187,41 +211,63 @@ class AbstractActionManagerBuilder(HasTraits):
 
     #### Methods ##############################################################
 
-    def _add_actions(self, action_manager, actions):
-        """ Add the specified actions to an action manager. """
+    def _add_actions(self, action_manager, actions, paths=None):
+        """ Add the specified actions to an action manager.
 
-        while len(actions) > 0:
-            start = len(actions)
+        'paths' optionally maps actions to the paths to use for them instead
+        of their own.
 
-            for action in actions[:]:
-                # Resolve the action's path to find the action manager that it
-                # should be added to.
-                #
-                # If any of the menus in path are missing then this creates
-                # them automatically (think 'mkdirs'!).
-                target = self._make_submenus(action_manager, action.path)
+        """
+
+        paths = paths or {}
+
+        # The action managers that the actions are added to, keyed by path.
+        targets = {}
+
+        def place(action):
+            path = paths.get(action, action.path)
+            provided = []
+
+            # Resolve the action's path to find the action manager that it
+            # should be added to.
+            #
+            # If any of the menus in path are missing then this creates
+            # them automatically (think 'mkdirs'!).
+            target = targets.get(path)
+            if target is None:
+                target = self._make_submenus(action_manager, path)
+                targets[path] = target
+
+                # Other actions may be waiting to go 'before' or 'after' the
+                # menus on the path.
+                components = path.split("/")
+                for i in range(1, len(components)):
+                    parent = "/".join(components[:i])
+                    provided.append(("item", parent, components[i]))
+
+            # Attempt to place the action.
+            item = self._add_action(target, action)
+            if item is None:
+                anchor = action.before or action.after
+                return ("item", path, anchor), provided
 
-                # Attempt to place the action.
-                #
-                # If the action needs to be placed 'before' or 'after' some
-                # other action, but the other action has not yet been added
-                # then we will try again later!
-                if self._add_action(target, action):
-                    actions.remove(action)
+            provided.append(("item", path, item.id))
+            return None, provided
 
-            end = len(actions)
+        def provides(action):
+            path = paths.get(action, action.path)
+            return [("item", path, self._get_action_id(action))]
 
-            # If we didn't succeed in placing *any* actions then we must have a
-            # problem!
-            if start == end:
-                raise ValueError("Could not place %s" % actions)
+        unplaced = self._place_items(actions, place)
+        if len(unplaced) > 0:
+            raise ValueError(self._explain_unplaced(unplaced, provides))
 
     def _add_action(self, action_manager, action):
         """ Add an action to an action manager.
 
-        Return True if the action was added successfully.
+        Return the item that was added to the action manager.
 
-        Return False if the action needs to be placed 'before' or 'after' some
+        Return None if the action needs to be placed 'before' or 'after' some
         other action, but the other action has not yet been added.
 
         """
@@ -234,55 +280,90 @@ class AbstractActionManagerBuilder(HasTraits):
         if len(action.before) > 0:
             item = group.find(action.before)
             if item is None:
-                return False
+                return None
 
             index = group.items.index(item)
 
         elif len(action.after) > 0:
             item = group.find(action.after)
             if item is None:
-                return False
+                return None
 
             index = group.items.index(item) + 1
 
         else:
             index = len(group.items)
 
-        group.insert(index, self._create_action(action))
+        return group.insert(index, self._create_action(action))
 
-        return True
+    def _add_groups_and_menus(
+        self, action_manager, groups_and_menus, paths=None
+    ):
+        """ Add the specified groups and menus to an action manager.
+
+        'paths' optionally maps groups and menus to the paths to use for them
+        instead of their own.
+
+        """
+
+        paths = paths or {}
+
+        # The reason we put the groups and menus together is that we might
+        # need to add a group before we can add a menu and we might need to
+        # add a menu before we can add a group!
+        targets = {}
+
+        def place(item):
+            path = paths.get(item, item.path)
+
+            # Resolve the path to find the menu manager that we are about to
+            # add the sub-menu or group to. Action managers are never removed,
+            # so once we have found one we can remember it.
+            target = targets.get(path)
+            if target is None:
+                target = self._find_action_manager(action_manager, path)
+                if target is None:
+                    return ("menu", path), []
+
+                targets[path] = target
+
+            anchor = item.before or item.after
+
+            # Attempt to place a group.
+            if isinstance(item, Group):
+                if not self._add_group(target, item):
+                    return ("group", path, anchor), []
 
-    def _add_groups_and_menus(self, action_manager, groups_and_menus):
-        """ Add the specified groups and menus to an action manager. """
-
-        # The reason we put the groups and menus together is that as we iterate
-        # over the list trying to add them, we might need to add a group before
-        # we can add a menu and we might need to add a menu before we can add a
-        # group! Hence, we take multiple passes over the list and we only barf
-        # if, in any single iteration, we cannot add anything.
-        while len(groups_and_menus) > 0:
-            start = len(groups_and_menus)
-
-            for item in groups_and_menus[:]:
-                # Resolve the path to find the menu manager that we are about
-                # to add the sub-menu or group to.
-                target = self._find_action_manager(action_manager, item.path)
-                if target is not None:
-                    # Attempt to place a group.
-                    if isinstance(item, Group):
-                        if self._add_group(target, item):
-                            groups_and_menus.remove(item)
-
-                    # Attempt to place a menu.
-                    elif self._add_menu(target, item):
-                        groups_and_menus.remove(item)
-
-            end = len(groups_and_menus)
-
-            # If we didn't succeed in adding *any* menus or groups then we
-            # must have a problem!
-            if start == end:
-                raise ValueError("Could not place %s" % groups_and_menus)
+                return None, [("group", path, item.id)]
+
+            # Attempt to place a menu.
+            if not self._add_menu(target, item):
+                if self._find_group(target, item.group) is None:
+                    group_id = item.group or "additions"
+                    return ("group", path, group_id), []
+
+                return ("item", path, anchor), []
+
+            # If the menu already existed then its groups may be new.
+            menu_path = "%s/%s" % (path, item.id)
+            provided = [("item", path, item.id), ("menu", menu_path)]
+            provided.extend(
+                ("group", menu_path, group.id) for group in item.groups
+            )
+
+            return None, provided
+
+        def provides(item):
+            path = paths.get(item, item.path)
+            if isinstance(item, Group):
+                return [("group", path, item.id)]
+
+            menu_path = "%s/%s" % (path, item.id)
+            return [("item", path, item.id), ("menu", menu_path)]
+
+        unplaced = self._place_items(groups_and_menus, place)
+        if len(unplaced) > 0:
+            raise ValueError(self._explain_unplaced(unplaced, provides))
 
     def _add_group(self, action_manager, group):
         """ Add a group to an action manager.
@@ -370,6 +451,51 @@ class AbstractActionManagerBuilder(HasTraits):
 
         return True
 
+    def _describe_missing(self, key):
+        """ Describe whatever is identified by a key from '_place_items'. """
+
+        kind, path, *id = key
+        if kind == "menu":
+            return "no menu at path '%s'" % path
+
+        return "no %s '%s' in '%s'" % (kind, id[0], path)
+
+    def _explain_unplaced(self, unplaced, provides):
+        """ Explain why the first of some items could not be placed.
+
+        'unplaced' is a list of '(item, missing)' tuples as returned by
+        '_place_items', and 'provides' is called with an item and returns
+        the keys of whatever the item would provide once it is placed.
+
+        If the item is waiting for another item that could not be placed
+        either then we follow the chain of items to find the real problem,
+        which is either something that is missing altogether or a cycle in
+        the 'before' and 'after' constraints.
+
+        """
+
+        missing = dict(unplaced)
+        providers = {}
+        for item, _ in unplaced:
+            for key in provides(item):
+                providers.setdefault(key, item)
+
+        chain = []
+        item = unplaced[0][0]
+        while item not in chain:
+            chain.append(item)
+            if missing[item] not in providers:
+                return "Could not place %s: %s" % (
+                    item, self._describe_missing(missing[item])
+                )
+
+            item = providers[missing[item]]
+
+        cycle = chain[chain.index(item):] + [item]
+        return "Could not place %s: 'before' and 'after' form a cycle (%s)" % (
+            item, " -> ".join(str(other) for other in cycle)
+        )
+
     def _find_group(self, action_manager, id):
         """ Find the group with the specified ID. """
 
@@ -426,3 +552,71 @@ class AbstractActionManagerBuilder(HasTraits):
             menu_manager = item
 
         return menu_manager
+
+    def _place_items(self, items, place):
+        """ Place items that may have to go 'before' or 'after' each other.
+
+        'place' is called with an item and returns a tuple '(missing,
+        provided)'. 'missing' is None if the item was placed, otherwise it
+        is a key identifying whatever the item is waiting for, e.g.
+        '("item", path, id)', '("group", path, id)' or '("menu", path)'.
+        'provided' is a list of the keys of anything that was added to the
+        action managers (whether or not the item was placed).
+
+        Rather than repeatedly trying every item until nothing more can be
+        placed, an item that cannot be placed waits until whatever it is
+        waiting for is provided, so the items are placed in (what amounts
+        to) a topological sort of their constraints. The items are tried in
+        the same order as successive passes over the list would try them,
+        and so they end up in exactly the same places.
+
+        Return a list of '(item, missing)' tuples for the items that could
+        not be placed.
+
+        """
+
+        # The indexes of the items waiting for each key.
+        #
+        # e.g. {key : [index, ...]}
+        waiting = {}
+
+        # The items to try again, as (pass, index) tuples.
+        queue = []
+
+        def wake(pass_, index, key):
+            # Items later in the list would be tried again in this pass,
+            # earlier ones in the next.
+            for other in waiting.pop(key, []):
+                next_pass = pass_ if other > index else pass_ + 1
+                heapq.heappush(queue, (next_pass, other))
+
+        def attempt(pass_, index):
+            missing, provided = place(items[index])
+            if missing is not None:
+                waiting.setdefault(missing, []).append(index)
+
+            for key in provided:
+                wake(pass_, index, key)
+
+                # A new menu may already contain sub-menus.
+                if key[0] == "menu":
+                    prefix = key[1] + "/"
+                    for other in list(waiting):
+                        if other[0] == "menu" and other[1].startswith(prefix):
+                            wake(pass_, index, other)
+
+        # The first pass tries everything...
+        for index in range(len(items)):
+            attempt(0, index)
+
+        # ... and subsequent passes only the items that might now fit.
+        while len(queue) > 0:
+            attempt(*heapq.heappop(queue))
+
+        unplaced = sorted(
+            (index, missing)
+            for missing, indexes in waiting.items()
+            for index in indexes
+        )
+
+        return [(items[index], missing) for index, missing in unplaced]
@@ -11,7 +11,8 @@
 
 
 # Enthought library imports.
-from traits.api import Str
+from pyface.ui_traits import Image
+from traits.api import Bool, Str
 
 # Local imports.
 from .location import Location
@@ -28,6 +29,22 @@ class Action(Location):
     # The name of the class that implements the action.
     class_name = Str
 
+    #### Lazy actions #########################################################
+
+    # Should the class that implements the action only be imported when the
+    # action is first performed? Until then, the action appears with the
+    # name, accelerator, image and tooltip given here.
+    lazy = Bool(False)
+
+    # The keyboard accelerator (if any) for a lazy action.
+    accelerator = Str
+
+    # The image (if any) for a lazy action.
+    image = Image
+
+    # The tooltip (if any) for a lazy action.
+    tooltip = Str
+
     ###########################################################################
     # 'object' interface
     ###########################################################################
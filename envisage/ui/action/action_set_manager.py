@@ -11,7 +11,7 @@
 
 
 # Enthought library imports.
-from traits.api import HasTraits, List
+from traits.api import Any, Dict, HasTraits, List, observe
 
 # Local imports.
 from .action_set import ActionSet
@@ -25,6 +25,20 @@ class ActionSetManager(HasTraits):
     # The action sets that this manager manages.
     action_sets = List(ActionSet)
 
+    #### Private interface ####################################################
+
+    # The items of every action set, by root and then by kind. This is built
+    # when it is first needed, and discarded whenever the action sets change.
+    #
+    # e.g. {root : {'actions' : [action, ...], 'groups' : [group, ...]}}
+    _index = Any
+
+    # The same index for each individual action set. These are kept when
+    # other action sets are added or removed.
+    #
+    # e.g. {action_set : {root : {'actions' : [action, ...]}}}
+    _action_set_indexes = Dict
+
     ###########################################################################
     # 'ActionSetManager' interface.
     ###########################################################################
@@ -32,41 +46,91 @@ class ActionSetManager(HasTraits):
     def get_actions(self, root):
         """ Return all action definitions for a root. """
 
-        return self._get_items(self.action_sets, "actions", root)
+        return self._get_items("actions", root)
 
     def get_groups(self, root):
         """ Return all group definitions for a root. """
 
-        return self._get_items(self.action_sets, "groups", root)
+        return self._get_items("groups", root)
 
     def get_menus(self, root):
         """ Return all menu definitions for a root. """
 
-        return self._get_items(self.action_sets, "menus", root)
+        return self._get_items("menus", root)
 
     def get_tool_bars(self, root):
         """ Return all tool bar definitions for a root. """
 
-        return self._get_items(self.action_sets, "tool_bars", root)
+        return self._get_items("tool_bars", root)
 
     ###########################################################################
     # 'Private' interface.
     ###########################################################################
 
-    def _get_items(self, action_sets, attribute_name, root):
+    #### Trait change handlers ################################################
+
+    @observe("action_sets.items")
+    def _forget_removed_action_sets(self, event):
+        """ Static trait change handler. """
+
+        # Keep the indexes of the action sets that are still here.
+        action_sets = set(self.action_sets)
+        self._action_set_indexes = {
+            action_set: index
+            for action_set, index in self._action_set_indexes.items()
+            if action_set in action_sets
+        }
+
+        self._index = None
+
+    @observe(
+        "action_sets:items:[actions,groups,menus,tool_bars,aliases].items,"
+        "action_sets:items:[actions,groups,menus,tool_bars]:items:path"
+    )
+    def _forget_all_action_sets(self, event):
+        """ Static trait change handler. """
+
+        # The contents of an action set have changed.
+        self._action_set_indexes = {}
+        self._index = None
+
+    #### Methods ##############################################################
+
+    def _get_items(self, attribute_name, root):
         """ Return all actions, groups or menus for a particular root.
 
         e.g. To get all of the groups::
 
-            self._get_items(action_sets, 'groups', root)
+            self._get_items('groups', root)
 
         """
 
-        items = []
-        for action_set in action_sets:
-            for item in getattr(action_set, attribute_name):
-                if self._get_root(item.path, action_set.aliases) == root:
-                    items.append(item)
+        index = self._index
+        if index is None:
+            index = {}
+            for action_set in self.action_sets:
+                action_set_index = self._get_action_set_index(action_set)
+                for item_root, items_by_kind in action_set_index.items():
+                    root_index = index.setdefault(item_root, {})
+                    for kind, items in items_by_kind.items():
+                        root_index.setdefault(kind, []).extend(items)
+
+            self._index = index
+
+        return list(index.get(root, {}).get(attribute_name, []))
+
+    def _get_action_set_index(self, action_set):
+        """ Return the items of an action set by root and then by kind. """
+
+        index = self._action_set_indexes.get(action_set)
+        if index is None:
+            index = {}
+            for attribute_name in ["actions", "groups", "menus", "tool_bars"]:
+                for item in getattr(action_set, attribute_name):
+                    root = self._get_root(item.path, action_set.aliases)
+                    index.setdefault(root, {}).setdefault(
+                        attribute_name, []
+                    ).append(item)
 
                     # fixme: Hacky, but the model needs to maintain the
                     # action set that contributed the item.
@@ -78,7 +142,9 @@ class ActionSetManager(HasTraits):
                         for group in item.groups:
                             group._action_set_ = action_set
 
-        return items
+            self._action_set_indexes[action_set] = index
+
+        return index
 
     def _get_root(self, path, aliases):
         """ Return the effective root for a path.
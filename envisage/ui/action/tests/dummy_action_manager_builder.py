@@ -44,6 +44,11 @@ class DummyActionManagerBuilder(AbstractActionManagerBuilder):
 
         return Action(name=action_definition.class_name)
 
+    def _get_action_id(self, action_definition):
+        """ Return the ID that the implementation of an action will have. """
+
+        return action_definition.class_name
+
     def _create_group(self, group_definition):
         """ Create a group implementation from a definition. """
 
@@ -57,3 +62,13 @@ class DummyActionManagerBuilder(AbstractActionManagerBuilder):
             menu_manager.insert(-1, Group(id=group_definition.id))
 
         return menu_manager
+
+    def _create_tool_bar_manager(self, tool_bar_definition):
+        """ Create a tool bar manager implementation from a definition. """
+
+        # A menu manager is near enough for our purposes!
+        tool_bar_manager = MenuManager(id=tool_bar_definition.name)
+        for group_definition in tool_bar_definition.groups:
+            tool_bar_manager.insert(-1, Group(id=group_definition.id))
+
+        return tool_bar_manager
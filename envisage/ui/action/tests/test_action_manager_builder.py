@@ -13,7 +13,7 @@
 import unittest
 
 # Enthought library imports.
-from envisage.ui.action.api import Action, ActionSet, Group, Menu
+from envisage.ui.action.api import Action, ActionSet, Group, Menu, ToolBar
 
 # Local imports.
 from .dummy_action_manager_builder import DummyActionManagerBuilder
@@ -678,3 +678,145 @@ class ActionManagerBuilderTestCase(unittest.TestCase):
 
         ids = [group.id for group in menu.groups]
         self.assertEqual(["NewGroup", "ExitGroup", "additions"], ids)
+
+    def test_actions_in_a_chain(self):
+        """ actions in a chain """
+
+        # Each action goes after the next one in the list, so they have to be
+        # placed in the reverse order.
+        names = ["Action%d" % i for i in range(100)]
+        actions = [
+            Action(class_name=name, path="MenuBar/File", after=after)
+            for name, after in zip(names, names[1:] + [""])
+        ]
+
+        # Create a builder containing the action set.
+        builder = DummyActionManagerBuilder(
+            action_sets=[ActionSet(actions=actions)]
+        )
+
+        # Create a menu bar manager for the 'MenuBar'.
+        menu_manager = builder.create_menu_bar_manager("MenuBar")
+
+        menu = menu_manager.find_item("File")
+        additions = menu.find_group("additions")
+        ids = [item.id for item in additions.items]
+        self.assertEqual(names[::-1], ids)
+
+    def test_unplaced_action_reports_missing_sibling(self):
+        """ unplaced action reports missing sibling """
+
+        action_sets = [
+            ActionSet(
+                actions=[
+                    Action(
+                        class_name="Save",
+                        name="Save",
+                        path="MenuBar/File",
+                        after="New",
+                    ),
+                    Action(
+                        class_name="New",
+                        name="New",
+                        path="MenuBar/File",
+                        after="Bogus",
+                    ),
+                ]
+            ),
+        ]
+
+        # Create a builder containing the action set.
+        builder = DummyActionManagerBuilder(action_sets=action_sets)
+
+        # The problem is with the action that 'Save' is waiting for.
+        with self.assertRaisesRegex(ValueError, r"\(New\): no item 'Bogus'"):
+            builder.create_menu_bar_manager("MenuBar")
+
+    def test_actions_in_a_cycle(self):
+        """ actions in a cycle """
+
+        action_sets = [
+            ActionSet(
+                actions=[
+                    Action(class_name="A", path="MenuBar/File", before="B"),
+                    Action(class_name="B", path="MenuBar/File", after="C"),
+                    Action(class_name="C", path="MenuBar/File", after="A"),
+                ]
+            ),
+        ]
+
+        # Create a builder containing the action set.
+        builder = DummyActionManagerBuilder(action_sets=action_sets)
+
+        with self.assertRaisesRegex(ValueError, "cycle"):
+            builder.create_menu_bar_manager("MenuBar")
+
+    def test_menu_with_missing_parent(self):
+        """ menu with missing parent """
+
+        action_sets = [
+            ActionSet(
+                menus=[
+                    Menu(name="New", path="MenuBar/File"),
+                    Menu(name="Bogus", path="MenuBar", group="Bogus"),
+                ]
+            )
+        ]
+
+        # Create a builder containing the action set.
+        builder = DummyActionManagerBuilder(action_sets=action_sets)
+
+        with self.assertRaisesRegex(ValueError, "no menu at path"):
+            builder.create_menu_bar_manager("MenuBar")
+
+    def test_tool_bars(self):
+        """ tool bars """
+
+        action_sets = [
+            ActionSet(
+                tool_bars=[
+                    ToolBar(name="Main", path="ToolBar"),
+                    ToolBar(name="Extra", path="ToolBar"),
+                    ToolBar(name="Empty", path="ToolBar"),
+                ],
+                groups=[Group(id="Group", path="ToolBar/Extra")],
+                actions=[
+                    Action(class_name="Exit", path="ToolBar"),
+                    Action(class_name="New", path="ToolBar/Main"),
+                    Action(
+                        class_name="Open", path="ToolBar/Extra", group="Group"
+                    ),
+                    Action(class_name="Cut", path="MenuBar/Edit"),
+                ],
+            )
+        ]
+
+        # Create a builder containing the action set.
+        builder = DummyActionManagerBuilder(action_sets=action_sets)
+
+        # Build the tool bars twice, as if for two windows.
+        for i in range(2):
+            tool_bar_managers = builder.create_tool_bar_managers("ToolBar")
+
+            # The old style tool bar comes first, and empty tool bars are
+            # left out.
+            ids = [manager.id for manager in tool_bar_managers]
+            self.assertEqual(["Tool Bar", "Main", "Extra"], ids)
+
+            old_style, main, extra = tool_bar_managers
+            self.assertEqual(
+                ["Exit"], [item.id for item in old_style.groups[-1].items]
+            )
+            self.assertEqual(
+                ["New"], [item.id for item in main.groups[-1].items]
+            )
+            self.assertEqual(
+                ["Open"], [item.id for item in extra.find_group("Group").items]
+            )
+
+        # The definitions are left alone.
+        paths = [action.path for action in action_sets[0].actions]
+        self.assertEqual(
+            ["ToolBar", "ToolBar/Main", "ToolBar/Extra", "MenuBar/Edit"], paths
+        )
+        self.assertEqual("ToolBar/Extra", action_sets[0].groups[0].path)
@@ -0,0 +1,126 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+""" Tests for the action set manager. """
+
+# Standard library imports.
+import unittest
+from unittest import mock
+
+# Enthought library imports.
+from envisage.ui.action.api import Action, ActionSet, Group, Menu, ToolBar
+from envisage.ui.action.action_set_manager import ActionSetManager
+
+
+class ActionSetManagerTestCase(unittest.TestCase):
+    """ Tests for the action set manager. """
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+
+        self.file = ActionSet(
+            id="file",
+            aliases={"MenuBar": "my.menubar"},
+            actions=[
+                Action(name="New", path="MenuBar/File"),
+                Action(name="Open", path="ToolBar"),
+            ],
+            groups=[Group(id="FileGroup", path="MenuBar")],
+            menus=[
+                Menu(name="File", path="MenuBar", groups=[Group(id="New")])
+            ],
+            tool_bars=[ToolBar(name="Main", path="ToolBar")],
+        )
+        self.edit = ActionSet(
+            id="edit", actions=[Action(name="Cut", path="my.menubar/Edit")]
+        )
+
+        self.manager = ActionSetManager(action_sets=[self.file, self.edit])
+
+    def test_get_items_by_root(self):
+        """ get items by root """
+
+        actions = self.manager.get_actions("my.menubar")
+        self.assertEqual(["New", "Cut"], [action.name for action in actions])
+
+        actions = self.manager.get_actions("ToolBar")
+        self.assertEqual(["Open"], [action.name for action in actions])
+
+        groups = self.manager.get_groups("my.menubar")
+        self.assertEqual(self.file.groups, groups)
+        menus = self.manager.get_menus("my.menubar")
+        self.assertEqual(self.file.menus, menus)
+        self.assertEqual(
+            self.file.tool_bars, self.manager.get_tool_bars("ToolBar")
+        )
+        self.assertEqual([], self.manager.get_menus("Bogus"))
+
+    def test_items_are_tagged_with_their_action_set(self):
+        """ items are tagged with their action set """
+
+        menu, = self.manager.get_menus("my.menubar")
+
+        self.assertIs(self.file, menu._action_set_)
+        self.assertIs(self.file, menu.groups[0]._action_set_)
+
+    def test_lists_are_copies(self):
+        """ lists are copies """
+
+        self.manager.get_actions("my.menubar").append(Action(name="Bogus"))
+
+        self.assertEqual(2, len(self.manager.get_actions("my.menubar")))
+
+    def test_adding_an_action_set_keeps_the_others_indexed(self):
+        """ adding an action set keeps the others indexed """
+
+        self.manager.get_actions("my.menubar")
+        view = ActionSet(
+            id="view", actions=[Action(name="Zoom", path="my.menubar/View")]
+        )
+
+        with mock.patch.object(
+            ActionSetManager, "_get_root", wraps=self.manager._get_root
+        ) as get_root:
+            self.manager.action_sets.append(view)
+            actions = self.manager.get_actions("my.menubar")
+
+        self.assertEqual(
+            ["New", "Cut", "Zoom"], [action.name for action in actions]
+        )
+        self.assertEqual(1, get_root.call_count)
+
+    def test_removing_an_action_set(self):
+        """ removing an action set """
+
+        self.manager.get_actions("my.menubar")
+
+        self.manager.action_sets.remove(self.file)
+
+        actions = self.manager.get_actions("my.menubar")
+        self.assertEqual(["Cut"], [action.name for action in actions])
+        self.assertEqual([self.edit], list(self.manager._action_set_indexes))
+
+    def test_changing_an_action_set(self):
+        """ changing an action set """
+
+        self.manager.get_actions("my.menubar")
+
+        self.edit.actions.append(Action(name="Paste", path="my.menubar/Edit"))
+        actions = self.manager.get_actions("my.menubar")
+        self.assertEqual(
+            ["New", "Cut", "Paste"], [action.name for action in actions]
+        )
+
+        self.edit.actions[0].path = "ToolBar"
+        actions = self.manager.get_actions("ToolBar")
+        self.assertEqual(["Open", "Cut"], [action.name for action in actions])
+
+        self.file.aliases = {}
+        actions = self.manager.get_actions("MenuBar")
+        self.assertEqual(["New"], [action.name for action in actions])
@@ -44,12 +44,11 @@ class TaskWindowLaunchAction(TaskAction):
         """
         task = event.new
         if task and not self.name:
-            name = ""
-            for factory in task.window.application.task_factories:
-                if factory.id == self.task_id:
-                    name = factory.name
-                    break
-            self.name = name
+            application = task.window.application
+            factory = application.get_extension_index(
+                application.TASK_FACTORIES
+            ).get(self.task_id)
+            self.name = factory.name if factory is not None else ""
 
 
 class TaskWindowLaunchGroup(Group):
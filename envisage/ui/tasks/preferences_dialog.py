@@ -19,14 +19,20 @@ from .preferences_pane import PreferencesPane
 
 class PreferencesTab(HasTraits):
     """ An object used internally by PreferencesDialog.
+
+    The UI for the panes (and so their models) is only created when the tab
+    is first loaded, i.e. when it is first selected.
     """
 
     name = Str
     panes = List(PreferencesPane)
 
+    # The panes that are shown in the tab (empty until the tab is loaded).
+    loaded_panes = List(PreferencesPane)
+
     view = View(
         Item(
-            "panes",
+            "loaded_panes",
             editor=ListEditor(style="custom"),
             show_label=False,
             style="readonly",
@@ -34,6 +40,12 @@ class PreferencesTab(HasTraits):
         resizable=True,
     )
 
+    def load(self):
+        """ Show the panes in the tab (if they are not shown already).
+        """
+        if self.loaded_panes != self.panes:
+            self.loaded_panes = self.panes[:]
+
 
 class PreferencesDialog(Handler):
     """ A dialog for editing preferences.
@@ -91,6 +103,10 @@ class PreferencesDialog(Handler):
         # Only show the tab bar if there is more than one category.
         tabs_style = "custom" if len(self._tabs) > 1 else "readonly"
 
+        # The first tab is shown initially unless a pane has been selected.
+        if self._selected is None and len(self._tabs) > 0:
+            self._selected = self._tabs[0]
+
         return View(
             Item(
                 "_tabs",
@@ -116,8 +132,9 @@ class PreferencesDialog(Handler):
     def apply(self, info=None):
         """ Handles the Apply button being clicked.
         """
+        # Panes in tabs that have never been shown can't have been changed.
         for tab in self._tabs:
-            for pane in tab.panes:
+            for pane in tab.loaded_panes:
                 pane.apply()
 
     def close(self, info, is_ok):
@@ -149,3 +166,9 @@ class PreferencesDialog(Handler):
             panes = before_after_sort(category_map[category.id])
             tabs.append(PreferencesTab(name=category.name, panes=panes))
         self._tabs = tabs
+        self._selected = None
+
+    @on_trait_change("_selected")
+    def _load_selected_tab(self, tab):
+        if tab is not None:
+            tab.load()
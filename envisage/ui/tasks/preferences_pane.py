@@ -9,7 +9,7 @@
 # Thanks for using Enthought open source!
 # Enthought library imports.
 from apptools.preferences.api import PreferencesHelper
-from traits.api import Callable, Instance, Str
+from traits.api import Callable, ComparisonMode, Instance, Str
 from traitsui.api import Controller
 
 
@@ -75,11 +75,21 @@ class PreferencesPane(Controller):
 
     def apply(self, info=None):
         """ Handles the Apply button being clicked.
+
+        Only the preferences that have been changed are copied to the model.
         """
-        trait_names = list(
-            filter(self._model._is_preference_trait, self._model.trait_names())
-        )
-        self.model.copy_traits(self._model, trait_names)
+        # If the pane has never been shown then nothing can have changed.
+        if self._model is None:
+            return
+
+        trait_names = [
+            trait_name
+            for trait_name in self._model.trait_names()
+            if self._model._is_preference_trait(trait_name)
+            and self._is_modified(trait_name)
+        ]
+        if len(trait_names) > 0:
+            self.model.copy_traits(self._model, trait_names)
 
     def close(self, info, is_ok):
         """ Handles the user attempting to close a dialog-based user interface.
@@ -87,3 +97,28 @@ class PreferencesPane(Controller):
         if is_ok:
             self.apply()
         return super().close(info, is_ok)
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _is_modified(self, trait_name):
+        """ Returns whether a preference has been changed in the pane.
+
+        The values are compared the way that the trait compares them when
+        deciding whether to notify a change. If they cannot be compared
+        (e.g. numpy arrays), the preference is treated as changed.
+        """
+        new = getattr(self._model, trait_name)
+        old = getattr(self.model, trait_name)
+
+        comparison_mode = self._model.trait(trait_name).comparison_mode
+        if comparison_mode == ComparisonMode.none:
+            return True
+        elif comparison_mode == ComparisonMode.identity:
+            return new is not old
+
+        try:
+            return bool(new != old)
+        except Exception:
+            return True
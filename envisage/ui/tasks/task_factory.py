@@ -40,9 +40,21 @@ class TaskFactory(HasTraits):
         """ Creates the Task using the specified TaskExtensions.
         """
         task = self.create(**traits)
-        for extension in extensions:
-            task.extra_actions.extend(extension.actions)
-            task.extra_dock_pane_factories.extend(
-                extension.dock_pane_factories
-            )
+
+        # Add all of the contributions in one go, so that anything listening
+        # to the task only hears about each list changing once.
+        actions = [
+            action for extension in extensions for action in extension.actions
+        ]
+        if actions:
+            task.extra_actions.extend(actions)
+
+        dock_pane_factories = [
+            factory
+            for extension in extensions
+            for factory in extension.dock_pane_factories
+        ]
+        if dock_pane_factories:
+            task.extra_dock_pane_factories.extend(dock_pane_factories)
+
         return task
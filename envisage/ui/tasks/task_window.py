@@ -8,11 +8,39 @@
 #
 # Thanks for using Enthought open source!
 
+# Standard library imports.
+import logging
+
 # Enthought library imports.
 from pyface.image_resource import ImageResource
-from pyface.tasks.api import TaskWindow as PyfaceTaskWindow
+from pyface.tasks.api import Task, TaskWindow as PyfaceTaskWindow
 from traits.api import Instance, Property
 
+# Logging.
+logger = logging.getLogger(__name__)
+
+
+class TaskPlaceholder(Task):
+    """ A stand-in for a task that has not been created yet.
+
+    The application adds placeholders to a window for the tasks in a layout
+    that are not initially active. A placeholder has the ID and name of the
+    task, but no panes or actions. The first time that it is activated, the
+    window asks the application to create the real task and puts it in the
+    placeholder's place.
+    """
+
+    ###########################################################################
+    # 'Task' interface.
+    ###########################################################################
+
+    def create_central_pane(self):
+        """ Create an empty central pane.
+        """
+        from pyface.tasks.api import TaskPane
+
+        return TaskPane()
+
 
 class TaskWindow(PyfaceTaskWindow):
     """ A TaskWindow for use with the Envisage Tasks plugin.
@@ -29,6 +57,78 @@ class TaskWindow(PyfaceTaskWindow):
 
     _icon = Instance(ImageResource, allow_none=True)
 
+    ###########################################################################
+    # 'TaskWindow' interface.
+    ###########################################################################
+
+    def activate_task(self, task):
+        """ Activates a task that has already been added to the window.
+
+        If the task is a placeholder, the real task is created first.
+        """
+        if isinstance(task, TaskPlaceholder):
+            task = self._create_task_for_placeholder(task)
+            if task is None:
+                return
+
+        super().activate_task(task)
+
+    def add_task_extensions(self, task, extensions):
+        """ Adds the contributions of some task extensions to a task that has
+            already been added to the window.
+
+        The dock panes are created, and the menu and tool bars are rebuilt to
+        include the actions. Placeholders are left alone, as the real task is
+        created with all of the task extensions that apply to it.
+        """
+        state = self._get_state(task)
+        if state is None:
+            logger.warning(
+                "Cannot extend task %r: task does not belong to the "
+                "window." % task
+            )
+            return
+
+        if isinstance(task, TaskPlaceholder):
+            return
+
+        actions = [action for ext in extensions for action in ext.actions]
+        dock_pane_factories = [
+            factory
+            for ext in extensions
+            for factory in ext.dock_pane_factories
+        ]
+        task.extra_actions.extend(actions)
+        task.extra_dock_pane_factories.extend(dock_pane_factories)
+
+        # The panes of the active task have to be hidden while we change them.
+        active = state is self._active_state
+        if active:
+            self._window_backend.hide_task(state)
+
+        for dock_pane_factory in dock_pane_factories:
+            dock_pane = dock_pane_factory(task=task)
+            dock_pane.task = task
+            dock_pane.create(self.control)
+            state.dock_panes.append(dock_pane)
+
+        if len(actions) > 0:
+            if not active:
+                if state.menu_bar_manager:
+                    state.menu_bar_manager.destroy()
+                for tool_bar_manager in state.tool_bar_managers:
+                    tool_bar_manager.destroy()
+
+            builder = self.action_manager_builder_factory(task=task)
+            state.menu_bar_manager = builder.create_menu_bar_manager()
+            state.tool_bar_managers = builder.create_tool_bar_managers()
+
+        if active:
+            self._window_backend.show_task(state)
+            self.dock_panes = state.dock_panes
+            self.menu_bar_manager = state.menu_bar_manager
+            self.tool_bar_managers = state.tool_bar_managers
+
     ###########################################################################
     # Protected 'TaskWindow' interface.
     ###########################################################################
@@ -46,6 +146,42 @@ class TaskWindow(PyfaceTaskWindow):
             title = form % (title, self.application.name)
         return title
 
+    def _create_task_for_placeholder(self, placeholder):
+        """ Replaces a placeholder with the real task, and returns the task
+            (or None if the task cannot be created).
+        """
+        state = self._get_state(placeholder)
+        if state is None:
+            logger.warning(
+                "Cannot activate task %r: task does not belong to the "
+                "window." % placeholder
+            )
+            return None
+
+        task = self.application.create_task(placeholder.id)
+        if task is None:
+            logger.error("Missing factory for task with ID %r", placeholder.id)
+            return None
+
+        # Keep any layout that has been applied to the placeholder.
+        layout = state.layout
+        if layout is placeholder.default_layout:
+            layout = None
+
+        index = self._states.index(state)
+        self.remove_task(placeholder)
+        self.add_task(task)
+
+        # Put the task where the placeholder was.
+        states = self._states[:]
+        new_state = states.pop()
+        if layout is not None:
+            new_state.layout = layout
+        states.insert(index, new_state)
+        self._states = states
+
+        return task
+
     def _get_icon(self):
         """If we have an icon return it, else delegate to the application.
         """
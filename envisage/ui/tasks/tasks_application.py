@@ -9,20 +9,23 @@
 # Thanks for using Enthought open source!
 # Standard library imports.
 import logging
-import pickle
 import os.path
 
 # Enthought library imports.
 from envisage.api import Application, ExtensionPoint
 from traits.api import (
+    Any,
     Bool,
     Callable,
+    Dict,
     Directory,
     Event,
     HasStrictTraits,
     Instance,
     Int,
     List,
+    observe,
+    on_trait_change,
     Str,
     Vetoable,
 )
@@ -53,6 +56,23 @@ class TasksApplication(Application):
     #: Pickle protocol to use for persisting layout information.
     layout_save_protocol = Int(4)
 
+    #: Whether to defer creating the tasks in a window layout (other than the
+    #: active task) until they are first activated. Until then, the window
+    #: contains a 'TaskPlaceholder' for each such task, so code that looks at
+    #: a window's 'tasks' must be prepared to find placeholders.
+    lazy_tasks = Bool(False)
+
+    #: The maximum number of window layouts to remember. When there are more
+    #: than this, the layouts of the windows that were closed least recently
+    #: are forgotten. Zero means that there is no limit.
+    max_window_layouts = Int(100)
+
+    #: Whether the application has a staged startup. If it does, the deferred
+    #: plugins are started one at a time by the GUI event loop once the
+    #: initial windows have been created (i.e. after 'application_initialized'
+    #: has been fired), so that the windows are shown as soon as possible.
+    staged_startup = Bool(True)
+
     #### 'TasksApplication' interface #########################################
 
     #: The active task window (the last one to get focus).
@@ -77,7 +97,9 @@ class TasksApplication(Application):
     state_location = Directory
 
     #: The filename that the application uses to persist window layout
-    #: information.
+    #: information. The layouts are written to this filename with the version
+    #: of the file format as a suffix (e.g. "application_memento.v1"), and
+    #: this file itself is only read if there is no such file yet.
     state_filename = Str(DEFAULT_STATE_FILENAME)
 
     #: Contributed task factories. This attribute is primarily for run-time
@@ -87,6 +109,9 @@ class TasksApplication(Application):
     #: Contributed task extensions.
     task_extensions = ExtensionPoint(id=TASK_EXTENSIONS)
 
+    #: Fired by the extension point when task extensions are added or removed.
+    task_extensions_items = Event
+
     #: The list of task windows created by the application.
     windows = List(Instance("envisage.ui.tasks.task_window.TaskWindow"))
 
@@ -147,11 +172,37 @@ class TasksApplication(Application):
     # An 'implicit' exit is when the user closes the last open window.
     _explicit_exit = Bool(False)
 
-    # Application state.
+    # Application state. This is loaded when it is first needed.
     _state = Instance(
         "envisage.ui.tasks.tasks_application.TasksApplicationState"
     )
 
+    # The store used to save and restore the application state.
+    _state_store = Instance(
+        "envisage.ui.tasks.tasks_application_state_store."
+        "TasksApplicationStateStore"
+    )
+
+    # The merged contributions of the task extensions for each task that has
+    # been created, keyed by task ID. An entry is discarded whenever a task
+    # extension that applies to the task is added or removed.
+    _task_extension_bundles = Dict(
+        Str, Instance("envisage.ui.tasks.task_extension.TaskExtension")
+    )
+
+    ###########################################################################
+    # 'object' interface.
+    ###########################################################################
+
+    def __init__(self, plugins=None, **traits):
+        """ Constructor. """
+
+        super().__init__(plugins, **traits)
+
+        # Connect the extension points so that we hear about task extensions
+        # being added or removed (e.g. by plugins that are started later on).
+        ExtensionPoint.connect_extension_point_traits(self)
+
     ###########################################################################
     # 'IApplication' interface.
     ###########################################################################
@@ -178,6 +229,11 @@ class TasksApplication(Application):
             gui.set_trait_later(self, "application_initialized", self)
             gui.start_event_loop()
 
+            # The application state is saved in the background, so make sure
+            # that it has been written (and that the background thread has
+            # finished) before we return.
+            self._state_store.close()
+
         return started
 
     ###########################################################################
@@ -198,12 +254,8 @@ class TasksApplication(Application):
             return None
 
         # Create the task using suitable task extensions.
-        extensions = [
-            ext
-            for ext in self.task_extensions
-            if ext.task_id == id or not ext.task_id
-        ]
-        task = factory.create_with_extensions(extensions)
+        bundle = self._get_task_extension_bundle(id)
+        task = factory.create_with_extensions([bundle])
         task.id = factory.id
         return task
 
@@ -250,14 +302,7 @@ class TasksApplication(Application):
 
         if layout:
             # Create and add tasks.
-            for task_id in layout.get_tasks():
-                task = self.create_task(task_id)
-                if task:
-                    window.add_task(task)
-                else:
-                    logger.error(
-                        "Missing factory for task with ID %r", task_id
-                    )
+            self._add_tasks(window, layout)
 
             # Apply a suitable layout.
             if restore:
@@ -316,12 +361,28 @@ class TasksApplication(Application):
     # Protected interface.
     ###########################################################################
 
+    def _add_tasks(self, window, layout):
+        """ Creates the tasks described in a TaskWindowLayout and adds them to
+            a window.
+        """
+        # Only the active task is visible, so we can put off creating the
+        # others.
+        active_task_id = layout.get_active_task()
+        for task_id in layout.get_tasks():
+            if self.lazy_tasks and task_id != active_task_id:
+                task = self._create_task_placeholder(task_id)
+            else:
+                task = self.create_task(task_id)
+            if task:
+                window.add_task(task)
+            else:
+                logger.error("Missing factory for task with ID %r", task_id)
+
     def _create_windows(self):
         """ Called at startup to create TaskWindows from the default or saved
             application layout.
         """
         # Build a list of TaskWindowLayouts.
-        self._load_state()
         if (
             self.always_use_default_layout
             or not self._state.previous_window_layouts
@@ -356,10 +417,47 @@ class TasksApplication(Application):
     def _get_task_factory(self, id):
         """ Returns the TaskFactory with the specified ID, or None.
         """
-        for factory in self.task_factories:
-            if factory.id == id:
-                return factory
-        return None
+        return self.get_extension_index(self.TASK_FACTORIES).get(id)
+
+    def _create_task_placeholder(self, id):
+        """ Creates a TaskPlaceholder for the task with the specified ID, or
+            returns None if there is not a suitable TaskFactory.
+        """
+        from .task_window import TaskPlaceholder
+
+        factory = self._get_task_factory(id)
+        if factory is None:
+            return None
+
+        return TaskPlaceholder(id=factory.id, name=factory.name)
+
+    def _get_task_extension_bundle(self, id):
+        """ Returns a TaskExtension that merges all of the contributions of
+            the task extensions that apply to the task with the specified ID.
+        """
+        from .task_extension import TaskExtension
+
+        bundle = self._task_extension_bundles.get(id)
+        if bundle is None:
+            extensions = [
+                ext
+                for ext in self.task_extensions
+                if ext.task_id == id or not ext.task_id
+            ]
+            bundle = TaskExtension(
+                task_id=id,
+                actions=[
+                    action for ext in extensions for action in ext.actions
+                ],
+                dock_pane_factories=[
+                    factory
+                    for ext in extensions
+                    for factory in ext.dock_pane_factories
+                ],
+            )
+            self._task_extension_bundles[id] = bundle
+
+        return bundle
 
     def _prepare_exit(self):
         """ Called immediately before the extant windows are destroyed and the
@@ -371,32 +469,15 @@ class TasksApplication(Application):
     def _load_state(self):
         """ Loads saved application state, if possible.
         """
-        state = TasksApplicationState()
-        filename = os.path.join(self.state_location, self.state_filename)
-        if os.path.exists(filename):
-            # Attempt to unpickle the saved application state.
-            logger.debug("Loading application state from %s", filename)
-            try:
-                with open(filename, "rb") as f:
-                    restored_state = pickle.load(f)
-            except Exception:
-                # If anything goes wrong, log the error and continue.
-                logger.exception("Error while restoring application state")
-            else:
-                if state.version == restored_state.version:
-                    state = restored_state
-                    logger.debug("Application state successfully restored")
-                else:
-                    logger.warning(
-                        "Discarding outdated application state: "
-                        "expected version %s, got version %s",
-                        state.version,
-                        restored_state.version,
-                    )
-        else:
-            logger.debug("No saved application state found at %s", filename)
+        self._state = self._read_state()
 
-        self._state = state
+    def _read_state(self):
+        """ Returns the saved application state, or a new state if there is
+            no (usable) saved state.
+        """
+        state = self._state_store.load(TasksApplicationState())
+        state.max_window_layouts = self.max_window_layouts
+        return state
 
     def _restore_layout_from_state(self, layout):
         """ Restores an equivalent layout from saved application state.
@@ -407,6 +488,7 @@ class TasksApplication(Application):
             # The active task is not part of the equivalency relation, so we
             # ensure that it is correct.
             match.active_task = layout.get_active_task()
+            self._state_store.layout_changed(match)
             layout = match
 
         # If that fails, at least try to restore the layout of
@@ -422,23 +504,13 @@ class TasksApplication(Application):
         return layout
 
     def _save_state(self):
-        """ Saves the application state.
+        """ Saves the application state (in the background).
         """
         # Grab the current window layouts.
         window_layouts = [w.get_window_layout() for w in self.windows]
         self._state.previous_window_layouts = window_layouts
 
-        # Attempt to pickle the application state.
-        filename = os.path.join(self.state_location, self.state_filename)
-        logger.debug("Saving application state to %s", filename)
-        try:
-            with open(filename, "wb") as f:
-                pickle.dump(self._state, f, protocol=self.layout_save_protocol)
-        except Exception:
-            # If anything goes wrong, log the error and continue.
-            logger.exception("Error while saving application state")
-        else:
-            logger.debug("Application state successfully saved")
+        self._state_store.save(self._state)
 
     def _initialize_application_home(self):
         """ Initialize the application directories.
@@ -470,6 +542,20 @@ class TasksApplication(Application):
 
         return GUI(splash_screen=self.splash_screen)
 
+    def __state_default(self):
+        # The state is loaded through '_load_state' (rather than by calling
+        # '_read_state' directly) so that subclasses can still extend it.
+        self._load_state()
+        return self._state
+
+    def __state_store_default(self):
+        from .tasks_application_state_store import TasksApplicationStateStore
+
+        return TasksApplicationStateStore(
+            filename=os.path.join(self.state_location, self.state_filename),
+            protocol=self.layout_save_protocol,
+        )
+
     def _state_location_default(self):
         state_location = os.path.join(self.home, "tasks", ETSConfig.toolkit)
         logger.debug("Tasks state location is %s", state_location)
@@ -478,6 +564,58 @@ class TasksApplication(Application):
 
     #### Trait change handlers ################################################
 
+    @observe("task_extensions, task_extensions_items")
+    def _update_task_extension_bundles(self, event):
+        if event.name == "task_extensions_items":
+            changed = event.new.added + event.new.removed
+            task_ids = set(ext.task_id for ext in changed)
+
+            # Extensions without a task ID apply to every task.
+            if "" not in task_ids:
+                for task_id in task_ids:
+                    self._task_extension_bundles.pop(task_id, None)
+                return
+
+        self._task_extension_bundles = {}
+
+    @observe("task_extensions_items")
+    def _merge_task_extensions(self, event):
+        """ Adds the contributions of new task extensions (e.g. from plugins
+            that have only just been started) to the tasks in the open
+            windows.
+        """
+        added = event.new.added
+        if len(added) == 0:
+            return
+
+        for window in self.windows:
+            for task in window.tasks:
+                extensions = [
+                    ext
+                    for ext in added
+                    if ext.task_id == task.id or not ext.task_id
+                ]
+                if len(extensions) > 0:
+                    window.add_task_extensions(task, extensions)
+
+    @on_trait_change("application_initialized")
+    def _schedule_deferred_plugins(self):
+        if len(self._deferred_plugins) > 0:
+            self.gui.invoke_later(self._start_deferred_plugin)
+
+    def _start_deferred_plugin(self):
+        """ Starts the next deferred plugin, and schedules the start of the
+            one after that (so that the GUI is responsive in between).
+        """
+        try:
+            self._start_next_deferred_plugin()
+
+        except Exception:
+            logger.exception("Error while starting deferred plugin")
+
+        if len(self._deferred_plugins) > 0:
+            self.gui.invoke_later(self._start_deferred_plugin)
+
     def _on_window_activated(self, window, trait_name, event):
         self.active_window = window
 
@@ -520,6 +658,11 @@ class TasksApplication(Application):
             if len(self.windows) == 1 and not self._explicit_exit:
                 self._prepare_exit()
 
+            # Otherwise, save the new layout now in case we never get the
+            # chance to save it later (only the new layout is pickled).
+            elif not self._explicit_exit:
+                self._state_store.save(self._state)
+
     def _on_window_closed(self, window, trait_name, event):
         from .task_window_event import TaskWindowEvent
 
@@ -545,39 +688,165 @@ class TasksApplicationState(HasStrictTraits):
     )
 
     # A list of TaskWindowLayouts accumulated throughout the application's
-    # lifecycle.
+    # lifecycle, most recently pushed first.
     window_layouts = List(
         Instance("pyface.tasks.task_window_layout.TaskWindowLayout")
     )
 
+    # The maximum number of TaskWindowLayouts kept in 'window_layouts'. When
+    # a layout is pushed and there are more than this, the least recently
+    # pushed layouts are discarded. Zero means that there is no limit.
+    max_window_layouts = Int(0, transient=True)
+
     # The "version" for the state data. This should be incremented whenever a
     # backwards incompatible change is made to this class or any of the layout
     # classes. This ensures that loading application state is always safe.
     version = Int(1)
 
+    #### Private interface ####################################################
+
+    # The TaskWindowLayouts in 'window_layouts' keyed by the set of IDs of
+    # their tasks (two layouts are equivalent if they have the same tasks), or
+    # None if the index needs to be rebuilt.
+    #
+    # e.g. {frozenset(task_id) : [TaskWindowLayout]}
+    _equivalence_index = Any(transient=True)
+
+    # The first TaskLayout in 'window_layouts' for each task (and the window
+    # layout that it is part of), or None if the index needs to be rebuilt.
+    #
+    # e.g. {task_id : (TaskWindowLayout, TaskLayout)}
+    _task_layout_index = Any(transient=True)
+
+    # Are we updating 'window_layouts' (and the indexes) ourselves?
+    _updating = Bool(False, transient=True)
+
+    ###########################################################################
+    # 'TasksApplicationState' interface.
+    ###########################################################################
+
     def get_equivalent_window_layout(self, window_layout):
         """ Gets an equivalent TaskWindowLayout, if there is one.
         """
-        for layout in self.window_layouts:
-            if layout.is_equivalent_to(window_layout):
-                return layout
-        return None
+        layouts = self._get_equivalence_index().get(
+            self._get_signature(window_layout)
+        )
+        return layouts[0] if layouts else None
 
     def get_task_layout(self, task_id):
         """ Gets a TaskLayout with the specified ID, there is one.
         """
-        for window_layout in self.window_layouts:
-            for layout in window_layout.items:
-                if layout.id == task_id:
-                    return layout
-        return None
+        entry = self._get_task_layout_index().get(task_id)
+        return entry[1] if entry is not None else None
 
     def push_window_layout(self, window_layout):
         """ Merge a TaskWindowLayout into the accumulated list.
         """
-        self.window_layouts = [
-            layout
-            for layout in self.window_layouts
-            if not layout.is_equivalent_to(window_layout)
+        equivalence_index = self._get_equivalence_index()
+        task_layout_index = self._get_task_layout_index()
+
+        signature = self._get_signature(window_layout)
+        removed = equivalence_index.pop(signature, [])
+
+        self._updating = True
+        try:
+            for layout in removed:
+                self.window_layouts.remove(layout)
+            self.window_layouts.insert(0, window_layout)
+            equivalence_index[signature] = [window_layout]
+
+            # Discard the least recently pushed layouts.
+            while 0 < self.max_window_layouts < len(self.window_layouts):
+                layout = self.window_layouts.pop()
+                layouts = equivalence_index[self._get_signature(layout)]
+                layouts.remove(layout)
+                if not layouts:
+                    del equivalence_index[self._get_signature(layout)]
+                removed.append(layout)
+
+        finally:
+            self._updating = False
+
+        # The layouts of the new window's tasks take precedence over any
+        # others.
+        for task_layout in reversed(self._get_task_layouts(window_layout)):
+            task_layout_index[task_layout.id] = (window_layout, task_layout)
+
+        # Find replacements for any task layouts that have been discarded.
+        removed_ids = set(map(id, removed))
+        for layout in removed:
+            for task_layout in self._get_task_layouts(layout):
+                task_id = task_layout.id
+                entry = task_layout_index.get(task_id)
+                if entry is not None and id(entry[0]) in removed_ids:
+                    entry = self._find_task_layout(task_id)
+                    if entry is None:
+                        del task_layout_index[task_id]
+                    else:
+                        task_layout_index[task_id] = entry
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _find_task_layout(self, task_id):
+        """ Returns the first TaskLayout with the specified ID (and the window
+            layout that it is part of), or None if there is no such layout.
+        """
+        for window_layout in self.window_layouts:
+            for task_layout in self._get_task_layouts(window_layout):
+                if task_layout.id == task_id:
+                    return window_layout, task_layout
+        return None
+
+    def _get_equivalence_index(self):
+        """ Returns the index of window layouts by equivalence signature.
+        """
+        if self._equivalence_index is None:
+            index = {}
+            for layout in self.window_layouts:
+                index.setdefault(self._get_signature(layout), []).append(
+                    layout
+                )
+            self._equivalence_index = index
+
+        return self._equivalence_index
+
+    def _get_task_layout_index(self):
+        """ Returns the index of task layouts by task ID.
+        """
+        if self._task_layout_index is None:
+            index = {}
+            for window_layout in self.window_layouts:
+                for task_layout in self._get_task_layouts(window_layout):
+                    index.setdefault(
+                        task_layout.id, (window_layout, task_layout)
+                    )
+            self._task_layout_index = index
+
+        return self._task_layout_index
+
+    def _get_signature(self, window_layout):
+        """ Returns the equivalence signature of a TaskWindowLayout.
+
+        Two layouts are equivalent (see 'TaskWindowLayout.is_equivalent_to')
+        if and only if they have the same signature.
+        """
+        return frozenset(window_layout.get_tasks())
+
+    def _get_task_layouts(self, window_layout):
+        """ Returns the TaskLayouts in a TaskWindowLayout.
+        """
+        return [
+            item
+            for item in window_layout.items
+            if item is not None and not isinstance(item, str)
         ]
-        self.window_layouts.insert(0, window_layout)
+
+    #### Trait change handlers ################################################
+
+    @on_trait_change("window_layouts, window_layouts_items")
+    def _reset_indexes(self):
+        if not self._updating:
+            self._equivalence_index = None
+            self._task_layout_index = None
@@ -0,0 +1,315 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+# Standard library imports.
+import concurrent.futures
+import logging
+import os
+import pickle
+import tempfile
+import threading
+
+# Enthought library imports.
+from traits.api import Any, Dict, HasStrictTraits, Int, Property, Str
+
+# Logging.
+logger = logging.getLogger(__name__)
+
+#: The version of the file format written by the store. This is independent
+#: of the version of the state itself.
+FORMAT_VERSION = 1
+
+
+class TasksApplicationStateStore(HasStrictTraits):
+    """ Saves and restores the state of a TasksApplication.
+
+    The state is written to a temporary file which then replaces the state
+    file, so a crash while saving never leaves a corrupt file behind. Saves
+    happen on a background thread: 'save' returns immediately, and 'flush'
+    waits for any pending save to complete. If a save is requested while
+    another is still waiting to start, only the most recent state is written.
+
+    Each window layout is pickled separately, and the pickle is reused for as
+    long as the same layout object is part of the state. Layouts are treated
+    as immutable once they have been added to the state; if a layout is
+    changed in place, 'layout_changed' must be called.
+
+    Older versions of Envisage expect 'filename' to contain a pickled
+    TasksApplicationState, so the state is written to 'format_filename'
+    instead. 'filename' is only read if there is no such file yet.
+
+    """
+
+    #### 'TasksApplicationStateStore' interface ###############################
+
+    #: The file that older versions of Envisage store the state in.
+    filename = Str
+
+    #: The file that the state is stored in ('filename' with the version of
+    #: the file format as a suffix).
+    format_filename = Property(Str, observe="filename")
+
+    #: Pickle protocol to use for the state.
+    protocol = Int(4)
+
+    #### Private interface ####################################################
+
+    # The pickled window layouts, keyed by the 'id' of the layout. The layout
+    # itself is also stored to make sure that the id is not reused.
+    #
+    # e.g. Dict(int, (TaskWindowLayout, bytes))
+    _blobs = Dict
+
+    # The executor used to write the state.
+    _executor = Any
+
+    # Incremented whenever a pickled window layout is discarded, so that a
+    # save that is in progress does not reinstate it.
+    _generation = Int
+
+    # The lock that protects the pickled window layouts and pending state.
+    _lock = Any
+
+    # The state waiting to be written (or None if there is none).
+    _pending = Any
+
+    # The future for the most recently requested save.
+    _future = Any
+
+    ###########################################################################
+    # 'object' interface.
+    ###########################################################################
+
+    def __init__(self, **traits):
+        """ Constructor. """
+
+        # The lock is created up front as it is used by the background thread.
+        self._lock = threading.Lock()
+
+        super().__init__(**traits)
+
+    ###########################################################################
+    # 'TasksApplicationStateStore' interface.
+    ###########################################################################
+
+    def load(self, state):
+        """ Load the saved state into a TasksApplicationState.
+
+        Returns
+        -------
+        TasksApplicationState
+            The restored state. If no state has been saved, or it cannot be
+            read, or it is for a different version of the state, then the
+            state that was passed in is returned unchanged.
+        """
+        filename = self.format_filename
+        legacy = not os.path.exists(filename)
+        if legacy:
+            filename = self.filename
+            if not os.path.exists(filename):
+                logger.debug(
+                    "No saved application state found at %s", filename
+                )
+                return state
+
+        logger.debug("Loading application state from %s", filename)
+        try:
+            with open(filename, "rb") as f:
+                data = pickle.load(f)
+
+            # State saved by older versions of Envisage is simply a pickled
+            # TasksApplicationState.
+            if legacy:
+                restored_state = data
+            else:
+                restored_state = self._decode(data, state)
+
+            restored_version = restored_state.version
+
+        except Exception:
+            # If anything goes wrong, log the error and continue.
+            logger.exception("Error while restoring application state")
+            return state
+
+        if state.version != restored_version:
+            logger.warning(
+                "Discarding outdated application state: "
+                "expected version %s, got version %s",
+                state.version,
+                restored_version,
+            )
+            return state
+
+        logger.debug("Application state successfully restored")
+        return restored_state
+
+    def save(self, state):
+        """ Save a TasksApplicationState in the background.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            A future that completes when the state has been written.
+        """
+        # Take a copy of the lists so that the state can keep changing while
+        # it is written.
+        snapshot = (
+            state.version,
+            list(state.previous_window_layouts),
+            list(state.window_layouts),
+        )
+
+        with self._lock:
+            pending = self._pending is not None
+            self._pending = snapshot
+            if not pending:
+                if self._executor is None:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="tasks-state"
+                    )
+                self._future = self._executor.submit(self._write)
+
+            return self._future
+
+    def flush(self):
+        """ Wait for any pending save to complete. """
+
+        future = self._future
+        if future is not None:
+            future.result()
+
+    def close(self):
+        """ Wait for any pending save to complete and release resources. """
+
+        self.flush()
+
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def layout_changed(self, layout):
+        """ Notify the store that a saved window layout has been modified.
+        """
+        with self._lock:
+            if self._blobs.pop(id(layout), None) is not None:
+                self._generation += 1
+
+    #### Properties ###########################################################
+
+    def _get_format_filename(self):
+        """ Property getter. """
+
+        return "%s.v%d" % (self.filename, FORMAT_VERSION)
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _decode(self, data, state):
+        """ Create a TasksApplicationState (of the same type as 'state') from
+            state read from a file.
+        """
+        if data["format"] != FORMAT_VERSION:
+            raise ValueError(
+                "Unsupported state file format %r" % data["format"]
+            )
+
+        layouts = [pickle.loads(blob) for blob in data["layouts"]]
+
+        # Remember the pickles so that they can be reused when we next save.
+        with self._lock:
+            for layout, blob in zip(layouts, data["layouts"]):
+                self._blobs[id(layout)] = (layout, blob)
+
+        return type(state)(
+            version=data["version"],
+            previous_window_layouts=[
+                layouts[i] for i in data["previous_window_layouts"]
+            ],
+            window_layouts=[layouts[i] for i in data["window_layouts"]],
+        )
+
+    def _encode(self, snapshot):
+        """ Encode the snapshot of a state as a picklable dictionary.
+
+        Returns the dictionary and the pickled window layouts (keyed as
+        '_blobs' is).
+        """
+        version, previous_window_layouts, window_layouts = snapshot
+
+        with self._lock:
+            cached = dict(self._blobs)
+
+        # Each distinct layout is pickled just once (layouts often appear in
+        # both lists), and only if it has not been pickled before.
+        blobs = {}
+        positions = {}
+
+        def encode(layout):
+            key = id(layout)
+            if key not in positions:
+                entry = cached.get(key)
+                if entry is None or entry[0] is not layout:
+                    entry = (
+                        layout, pickle.dumps(layout, protocol=self.protocol)
+                    )
+                blobs[key] = entry
+                positions[key] = len(positions)
+
+            return positions[key]
+
+        data = dict(
+            format=FORMAT_VERSION,
+            version=version,
+            previous_window_layouts=[
+                encode(layout) for layout in previous_window_layouts
+            ],
+            window_layouts=[encode(layout) for layout in window_layouts],
+        )
+        data["layouts"] = [blob for _, blob in blobs.values()]
+
+        return data, blobs
+
+    def _write(self):
+        """ Write the pending state to the state file. """
+
+        with self._lock:
+            snapshot, self._pending = self._pending, None
+            generation = self._generation
+
+        filename = self.format_filename
+        logger.debug("Saving application state to %s", filename)
+        try:
+            data, blobs = self._encode(snapshot)
+
+            fd, temp_filename = tempfile.mkstemp(
+                dir=os.path.dirname(filename) or None,
+                prefix=os.path.basename(filename) + ".",
+            )
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(data, f, protocol=self.protocol)
+                os.replace(temp_filename, filename)
+
+            except BaseException:
+                os.unlink(temp_filename)
+                raise
+
+        except Exception:
+            # If anything goes wrong, log the error and continue.
+            logger.exception("Error while saving application state")
+            return
+
+        # Keep the pickles of the layouts that are still in use (unless some
+        # may have changed while we were busy).
+        with self._lock:
+            if self._generation == generation:
+                self._blobs = blobs
+
+        logger.debug("Application state successfully saved")
@@ -0,0 +1,150 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import unittest
+
+from apptools.preferences.api import Preferences, PreferencesHelper
+from traits.api import Any, ComparisonMode, Int, List
+
+from envisage.ui.tasks.api import (
+    PreferencesCategory,
+    PreferencesDialog,
+    PreferencesPane,
+)
+
+
+class CounterPreferences(PreferencesHelper):
+    preferences_path = "counter"
+
+    count = Int
+
+
+class Ambiguous:
+    """ A value that cannot be compared, like a numpy array. """
+
+    def __ne__(self, other):
+        return self
+
+    def __bool__(self):
+        raise ValueError("The truth value is ambiguous")
+
+
+class AlwaysEqual:
+    """ A value that is equal to anything. """
+
+    def __eq__(self, other):
+        return True
+
+
+class ValuePreferences(PreferencesHelper):
+    preferences_path = "value"
+
+    value = Any
+
+    same = Any(comparison_mode=ComparisonMode.identity)
+
+
+class RecordingPreferencesPane(PreferencesPane):
+    # The values of 'count' that were copied to the model.
+    copied = List
+
+    def _model_changed(self, old, new):
+        if new is not None:
+            new.on_trait_change(self.copied.append, "count")
+
+
+class TestPreferencesDialog(unittest.TestCase):
+    def setUp(self):
+        self.dialog = PreferencesDialog(
+            categories=[
+                PreferencesCategory(id="first"),
+                PreferencesCategory(id="second"),
+            ]
+        )
+        self.first = RecordingPreferencesPane(
+            id="a",
+            category="first",
+            model=CounterPreferences(preferences=Preferences()),
+        )
+        self.second = RecordingPreferencesPane(
+            id="b",
+            category="second",
+            model=CounterPreferences(preferences=Preferences()),
+        )
+        self.dialog.panes = [self.first, self.second]
+
+    def show(self, pane):
+        """ Create the model that is edited by the UI for a pane. """
+
+        return pane.trait_context()["object"]
+
+    def test_tabs_are_loaded_when_selected(self):
+        first_tab, second_tab = self.dialog._tabs
+
+        self.dialog.traits_view()
+
+        self.assertIs(first_tab, self.dialog._selected)
+        self.assertEqual([self.first], first_tab.loaded_panes)
+        self.assertEqual([], second_tab.loaded_panes)
+
+        self.dialog.select_pane("b")
+
+        self.assertIs(second_tab, self.dialog._selected)
+        self.assertEqual([self.second], second_tab.loaded_panes)
+
+    def test_apply_only_modified_panes(self):
+        self.dialog.traits_view()
+        self.show(self.first).count = 42
+
+        self.dialog.apply()
+
+        self.assertEqual([42], self.first.copied)
+        self.assertEqual(42, self.first.model.count)
+        self.assertEqual([], self.second.copied)
+
+        # Nothing has changed since.
+        self.dialog.apply()
+
+        self.assertEqual([42], self.first.copied)
+
+    def test_apply_pane_that_was_never_shown(self):
+        self.dialog.traits_view()
+        self.dialog.select_pane("b")
+
+        self.dialog.apply()
+
+        self.assertEqual([], self.first.copied)
+        self.assertEqual([], self.second.copied)
+
+
+class TestPreferencesPane(unittest.TestCase):
+    def setUp(self):
+        self.pane = PreferencesPane(
+            model=ValuePreferences(preferences=Preferences())
+        )
+
+    def test_apply_values_that_cannot_be_compared(self):
+        self.pane.model.value = Ambiguous()
+        value = Ambiguous()
+        self.pane.trait_context()["object"].value = value
+
+        self.pane.apply()
+
+        self.assertIs(value, self.pane.model.value)
+
+    def test_apply_uses_trait_comparison_mode(self):
+        self.pane.model.same = AlwaysEqual()
+        # The value is equal to the model's, but it is not the same object.
+        same = AlwaysEqual()
+        self.pane.trait_context()["object"].same = same
+
+        self.pane.apply()
+
+        self.assertIs(same, self.pane.model.same)
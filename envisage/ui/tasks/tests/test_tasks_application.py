@@ -10,6 +10,7 @@
 
 import os
 import pathlib
+import pickle
 import shutil
 import sys
 import tempfile
@@ -17,10 +18,22 @@ import unittest
 
 import pkg_resources
 from pyface.i_gui import IGUI
-from traits.api import HasTraits, provides
+from pyface.tasks.action.api import SchemaAddition
+from pyface.tasks.api import PaneItem, Task, TaskLayout, TaskWindowLayout
+from traits.api import Bool, HasTraits, List, on_trait_change, provides
 
-from envisage.ui.tasks.api import TasksApplication
-from envisage.ui.tasks.tasks_application import DEFAULT_STATE_FILENAME
+from envisage.api import Plugin
+from envisage.ui.tasks.api import (
+    TaskExtension,
+    TaskFactory,
+    TasksApplication,
+    TasksPlugin,
+)
+from envisage.ui.tasks.tasks_application import (
+    DEFAULT_STATE_FILENAME,
+    TasksApplicationState,
+)
+from envisage.ui.tasks.task_window import TaskPlaceholder
 
 # Decorator for skipping tests that require a GUI
 requires_gui = unittest.skipIf(
@@ -47,6 +60,27 @@ class DummyGUI(HasTraits):
     pass
 
 
+class EventLoopGUI(DummyGUI):
+    """ Records the callables that are invoked later. """
+
+    pending = List
+
+    def invoke_later(self, callable, *args, **kwargs):
+        self.pending.append((callable, args, kwargs))
+
+    def run_pending(self):
+        """ Run the pending callables, one per iteration of the "event
+            loop", and return how many iterations there were.
+        """
+        iterations = 0
+        while self.pending:
+            callable, args, kwargs = self.pending.pop(0)
+            callable(*args, **kwargs)
+            iterations += 1
+
+        return iterations
+
+
 @unittest.skipIf(
     sys.platform == "linux" and sys.version_info >= (3, 8),
     "xref: enthought/envisage#476",
@@ -68,11 +102,14 @@ class TestTasksApplication(unittest.TestCase):
         )
         app.on_trait_change(app.exit, "application_initialized")
 
-        memento_file = os.path.join(state_location, app.state_filename)
+        memento_file = app._state_store.format_filename
         self.assertFalse(os.path.exists(memento_file))
         app.run()
         self.assertTrue(os.path.exists(memento_file))
 
+        # The state store's background thread has finished.
+        self.assertIsNone(app._state_store._executor)
+
         # Check that the generated file uses protocol 3.
         with open(memento_file, "rb") as f:
             protocol_bytes = f.read(2)
@@ -84,7 +121,7 @@ class TestTasksApplication(unittest.TestCase):
         # doesn't exist.
         state_location = pathlib.Path(self.tmpdir) / "subdir"
         state_filename = "memento_test"
-        state_path = state_location / state_filename
+        state_path = state_location / (state_filename + ".v1")
 
         self.assertFalse(state_location.exists())
         self.assertFalse(state_path.exists())
@@ -151,3 +188,340 @@ class TestTasksApplication(unittest.TestCase):
         # and the test passes because no errors are raised.
         app = TasksApplication()
         app.gui = DummyGUI()
+
+
+class ExtendedTask(Task):
+    """ A task that records changes to its extra contributions. """
+
+    changes = List
+
+    def create_central_pane(self):
+        from pyface.tasks.api import TaskPane
+
+        return TaskPane()
+
+    @on_trait_change("extra_actions_items, extra_dock_pane_factories_items")
+    def _record_change(self, name, new):
+        self.changes.append(name)
+
+
+class TaskContributions(Plugin):
+    """ A plugin that contributes a task and some task extensions. """
+
+    tasks = List(contributes_to="envisage.ui.tasks.tasks")
+
+    task_extensions = List(contributes_to="envisage.ui.tasks.task_extensions")
+
+    def _tasks_default(self):
+        return [
+            TaskFactory(id="my.task", factory=ExtendedTask),
+            TaskFactory(id="second.task", name="Second", factory=ExtendedTask),
+        ]
+
+
+class FakeWindow(HasTraits):
+    """ Records the tasks added to a window. """
+
+    tasks = List
+
+    def add_task(self, task):
+        self.tasks.append(task)
+
+
+class TestTaskCreation(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+        self.contributions = TaskContributions()
+        self.app = TasksApplication(
+            plugins=[TasksPlugin(), self.contributions],
+            state_location=self.tmpdir,
+        )
+
+    def test_load_state_can_be_extended(self):
+        class ExtendedApplication(TasksApplication):
+            def _load_state(self):
+                super()._load_state()
+                self._state.max_window_layouts = 42
+
+        app = ExtendedApplication(state_location=self.tmpdir)
+
+        self.assertEqual(42, app._state.max_window_layouts)
+
+    def test_create_task(self):
+        task = self.app.create_task("my.task")
+
+        self.assertIsInstance(task, ExtendedTask)
+        self.assertEqual(task.id, "my.task")
+        self.assertIsNone(self.app.create_task("other.task"))
+
+    def test_lazy_tasks(self):
+        self.app.lazy_tasks = True
+        window = FakeWindow()
+        layout = TaskWindowLayout(
+            "my.task", "second.task", "other.task", active_task="second.task"
+        )
+
+        with self.assertLogs("envisage.ui.tasks.tasks_application", "ERROR"):
+            self.app._add_tasks(window, layout)
+
+        # Only the active task is created.
+        placeholder, task = window.tasks
+        self.assertIsInstance(placeholder, TaskPlaceholder)
+        self.assertEqual("my.task", placeholder.id)
+        self.assertIsInstance(task, ExtendedTask)
+        self.assertEqual("second.task", task.id)
+
+    def test_no_lazy_tasks(self):
+        window = FakeWindow()
+        layout = TaskWindowLayout("my.task", "second.task")
+
+        self.app._add_tasks(window, layout)
+
+        self.assertEqual(
+            [ExtendedTask, ExtendedTask], [type(task) for task in window.tasks]
+        )
+
+    @requires_gui
+    def test_activate_placeholder(self):
+        self.app.lazy_tasks = True
+        layout = TaskWindowLayout(
+            "my.task", TaskLayout(id="second.task", left=PaneItem("pane"))
+        )
+        window = self.app.create_window(layout, restore=False)
+        self.addCleanup(window.destroy)
+        placeholder = window.tasks[1]
+        self.assertIsInstance(placeholder, TaskPlaceholder)
+
+        window.activate_task(placeholder)
+
+        task = window.tasks[1]
+        self.assertIsInstance(task, ExtendedTask)
+        self.assertIs(task, window.active_task)
+        self.assertEqual(
+            ["my.task", "second.task"], [task.id for task in window.tasks]
+        )
+        self.assertEqual(
+            "pane", window.get_window_layout().items[1].left.id
+        )
+
+    def test_create_task_with_extensions(self):
+        specific = TaskExtension(
+            task_id="my.task",
+            actions=[SchemaAddition(id="b"), SchemaAddition(id="c")],
+            dock_pane_factories=[Task],
+        )
+        other = TaskExtension(
+            task_id="other.task", actions=[SchemaAddition(id="x")]
+        )
+        self.contributions.task_extensions = [
+            TaskExtension(actions=[SchemaAddition(id="a")]),
+            specific,
+            other,
+        ]
+
+        task = self.app.create_task("my.task")
+
+        # The contributions of the TasksPlugin's own extension come first.
+        self.assertEqual(
+            ["a", "b", "c"], [action.id for action in task.extra_actions][-3:]
+        )
+        self.assertNotIn("x", [action.id for action in task.extra_actions])
+        self.assertEqual([Task], task.extra_dock_pane_factories)
+
+        # Each list is only extended once.
+        self.assertEqual(
+            ["extra_actions_items", "extra_dock_pane_factories_items"],
+            task.changes,
+        )
+
+    def test_task_extensions_changed(self):
+        task = self.app.create_task("my.task")
+        self.assertEqual([], task.extra_dock_pane_factories)
+
+        # Add an extension for the task...
+        extension = TaskExtension(
+            task_id="my.task", dock_pane_factories=[Task]
+        )
+        self.contributions.task_extensions.append(extension)
+        task = self.app.create_task("my.task")
+        self.assertEqual([Task], task.extra_dock_pane_factories)
+
+        # ... and one for all tasks.
+        self.contributions.task_extensions.append(
+            TaskExtension(dock_pane_factories=[ExtendedTask])
+        )
+        task = self.app.create_task("my.task")
+        self.assertEqual([Task, ExtendedTask], task.extra_dock_pane_factories)
+
+        # Remove them both.
+        del self.contributions.task_extensions[:]
+        task = self.app.create_task("my.task")
+        self.assertEqual([], task.extra_dock_pane_factories)
+
+    @requires_gui
+    def test_task_extensions_are_merged_into_open_windows(self):
+        window = self.app.create_window(
+            TaskWindowLayout("my.task", "second.task"), restore=False
+        )
+        self.addCleanup(window.destroy)
+        self.app.windows.append(window)
+        task, placeholder = window.tasks
+        window.activate_task(task)
+
+        extension = TaskExtension(
+            task_id="my.task", actions=[SchemaAddition(id="a")]
+        )
+        self.contributions.task_extensions.append(extension)
+
+        self.assertEqual("a", task.extra_actions[-1].id)
+        self.assertIs(placeholder, window.tasks[1])
+
+
+class DeferredPlugin(Plugin):
+    """ A plugin that is started after the initial windows are created. """
+
+    startup_phase = "deferred"
+
+    fail = Bool(False)
+
+    started = Bool(False)
+
+    def start(self):
+        if self.fail:
+            raise RuntimeError("Plugin failed to start")
+
+        self.started = True
+
+    def stop(self):
+        self.started = False
+
+
+class TestStagedStartup(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+        self.deferred = [DeferredPlugin(id="first"), DeferredPlugin(id="last")]
+        self.gui = EventLoopGUI()
+        self.app = TasksApplication(
+            plugins=[TasksPlugin()] + self.deferred,
+            state_location=self.tmpdir,
+            gui=self.gui,
+        )
+
+    def test_deferred_plugins_start_after_initialization(self):
+        self.app.start()
+        self.assertEqual([False, False], [p.started for p in self.deferred])
+        self.assertEqual(0, self.gui.run_pending())
+
+        self.app.application_initialized = self.app
+
+        # The plugins are started one at a time.
+        self.assertEqual(2, self.gui.run_pending())
+        self.assertEqual([True, True], [p.started for p in self.deferred])
+
+    def test_failed_deferred_plugin(self):
+        self.deferred[0].fail = True
+        self.app.start()
+        self.app.application_initialized = self.app
+
+        with self.assertLogs("envisage.ui.tasks.tasks_application", "ERROR"):
+            self.gui.run_pending()
+
+        self.assertTrue(self.deferred[1].started)
+
+    def test_no_staged_startup(self):
+        self.app.staged_startup = False
+
+        self.app.start()
+
+        self.assertEqual([True, True], [p.started for p in self.deferred])
+
+
+class TestTasksApplicationState(unittest.TestCase):
+    def test_get_equivalent_window_layout(self):
+        first = TaskWindowLayout("a", "b")
+        second = TaskWindowLayout("c")
+        state = TasksApplicationState(window_layouts=[first, second])
+
+        self.assertIs(
+            first,
+            state.get_equivalent_window_layout(TaskWindowLayout("b", "a")),
+        )
+        self.assertIs(
+            second, state.get_equivalent_window_layout(TaskWindowLayout("c"))
+        )
+        self.assertIsNone(
+            state.get_equivalent_window_layout(TaskWindowLayout("a"))
+        )
+
+    def test_get_task_layout(self):
+        first = TaskWindowLayout(TaskLayout(id="a"), "b")
+        second = TaskWindowLayout(TaskLayout(id="a"), TaskLayout(id="b"))
+        state = TasksApplicationState(window_layouts=[first, second])
+
+        self.assertIs(first.items[0], state.get_task_layout("a"))
+        self.assertIs(second.items[1], state.get_task_layout("b"))
+        self.assertIsNone(state.get_task_layout("c"))
+
+    def test_push_window_layout(self):
+        state = TasksApplicationState()
+        old = TaskWindowLayout(TaskLayout(id="a"), TaskLayout(id="b"))
+        other = TaskWindowLayout(TaskLayout(id="b"))
+        state.push_window_layout(old)
+        state.push_window_layout(other)
+        self.assertIs(other.items[0], state.get_task_layout("b"))
+
+        # Pushing an equivalent layout replaces the old one.
+        new = TaskWindowLayout(TaskLayout(id="b"), TaskLayout(id="a"))
+        state.push_window_layout(new)
+
+        self.assertEqual([new, other], state.window_layouts)
+        self.assertIs(
+            new, state.get_equivalent_window_layout(TaskWindowLayout("a", "b"))
+        )
+        self.assertIs(new.items[0], state.get_task_layout("b"))
+        self.assertIs(new.items[1], state.get_task_layout("a"))
+
+    def test_push_window_layout_evicts_least_recent(self):
+        state = TasksApplicationState(max_window_layouts=2)
+        layouts = [
+            TaskWindowLayout(TaskLayout(id="a")),
+            TaskWindowLayout(TaskLayout(id="a"), TaskLayout(id="b")),
+            TaskWindowLayout(TaskLayout(id="c")),
+        ]
+        for layout in layouts:
+            state.push_window_layout(layout)
+
+        self.assertEqual([layouts[2], layouts[1]], state.window_layouts)
+        self.assertIsNone(
+            state.get_equivalent_window_layout(TaskWindowLayout("a"))
+        )
+
+        # The layout of task "a" is now taken from the remaining layout.
+        self.assertIs(layouts[1].items[0], state.get_task_layout("a"))
+        self.assertIs(layouts[2].items[0], state.get_task_layout("c"))
+
+    def test_indexes_follow_window_layouts(self):
+        state = TasksApplicationState()
+        layout = TaskWindowLayout(TaskLayout(id="a"))
+        self.assertIsNone(state.get_task_layout("a"))
+
+        state.window_layouts = [layout]
+        self.assertIs(layout.items[0], state.get_task_layout("a"))
+
+        state.window_layouts.pop()
+        self.assertIsNone(state.get_task_layout("a"))
+        self.assertIsNone(
+            state.get_equivalent_window_layout(TaskWindowLayout("a"))
+        )
+
+    def test_pickle(self):
+        state = TasksApplicationState(max_window_layouts=10)
+        state.push_window_layout(TaskWindowLayout(TaskLayout(id="a")))
+
+        state = pickle.loads(pickle.dumps(state))
+
+        self.assertEqual("a", state.get_task_layout("a").id)
@@ -0,0 +1,201 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import pkg_resources
+from pyface.tasks.api import TaskLayout, TaskWindowLayout
+
+from envisage.ui.tasks.tasks_application import TasksApplicationState
+from envisage.ui.tasks.tasks_application_state_store import (
+    TasksApplicationStateStore,
+)
+
+
+class TestTasksApplicationStateStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+        self.filename = os.path.join(self.tmpdir, "state")
+        self.store = self.create_store()
+
+    def create_store(self, **traits):
+        store = TasksApplicationStateStore(filename=self.filename, **traits)
+        self.addCleanup(store.close)
+        return store
+
+    def create_state(self):
+        first = TaskWindowLayout(TaskLayout(id="a"), size=(400, 300))
+        second = TaskWindowLayout("b", "c", active_task="c")
+        return TasksApplicationState(
+            previous_window_layouts=[first], window_layouts=[second, first]
+        )
+
+    def test_save_and_load(self):
+        self.store.save(self.create_state()).result()
+
+        state = self.create_store().load(TasksApplicationState())
+
+        first, = state.previous_window_layouts
+        self.assertEqual((400, 300), first.size)
+        self.assertEqual(["a"], first.get_tasks())
+        self.assertEqual(["b", "c"], state.window_layouts[0].get_tasks())
+        self.assertEqual("c", state.window_layouts[0].active_task)
+
+        # A layout that appears in both lists is stored once.
+        self.assertIs(first, state.window_layouts[1])
+
+    def test_load_without_saved_state(self):
+        state = TasksApplicationState()
+
+        self.assertIs(state, self.store.load(state))
+
+    def test_load_corrupt_state(self):
+        with open(self.filename, "wb") as f:
+            f.write(b"not a pickle")
+        state = TasksApplicationState()
+
+        with self.assertLogs(
+            "envisage.ui.tasks.tasks_application_state_store"
+        ):
+            self.assertIs(state, self.store.load(state))
+
+    def test_load_outdated_state(self):
+        old_state = self.create_state()
+        old_state.version = 0
+        self.store.save(old_state).result()
+        state = TasksApplicationState()
+
+        with self.assertLogs(
+            "envisage.ui.tasks.tasks_application_state_store", "WARNING"
+        ):
+            self.assertIs(state, self.create_store().load(state))
+
+    def test_load_legacy_state(self):
+        stored_state_location = pkg_resources.resource_filename(
+            "envisage.ui.tasks.tests", "data"
+        )
+        shutil.copyfile(
+            os.path.join(stored_state_location, "application_memento_v3.pkl"),
+            self.filename,
+        )
+
+        state = self.store.load(TasksApplicationState())
+
+        self.assertEqual(state.previous_window_layouts[0].size, (492, 743))
+
+    def test_legacy_state_is_left_alone(self):
+        legacy_state = self.create_state()
+        with open(self.filename, "wb") as f:
+            pickle.dump(legacy_state, f)
+
+        state = self.store.load(TasksApplicationState())
+        state.push_window_layout(TaskWindowLayout("d"))
+        self.store.save(state).result()
+
+        # Older versions of Envisage can still read the file that they
+        # expect...
+        with open(self.filename, "rb") as f:
+            self.assertEqual(2, len(pickle.load(f).window_layouts))
+
+        # ... but the new state is read from now on.
+        state = self.create_store().load(TasksApplicationState())
+        self.assertEqual(3, len(state.window_layouts))
+        self.assertEqual(
+            ["state", "state.v1"], sorted(os.listdir(self.tmpdir))
+        )
+
+    def test_save_in_background(self):
+        threads = []
+        encode = TasksApplicationStateStore._encode
+
+        def record_thread(store, snapshot):
+            threads.append(threading.current_thread())
+            return encode(store, snapshot)
+
+        with mock.patch.object(
+            TasksApplicationStateStore, "_encode", record_thread
+        ):
+            self.store.save(self.create_state())
+            self.store.flush()
+
+        self.assertTrue(os.path.exists(self.store.format_filename))
+        thread, = threads
+        self.assertIsNot(thread, threading.current_thread())
+
+    def test_save_uses_protocol(self):
+        store = self.create_store(protocol=3)
+        store.save(self.create_state()).result()
+
+        with open(store.format_filename, "rb") as f:
+            self.assertEqual(f.read(2), b"\x80\x03")
+
+    def test_failed_save_keeps_previous_state(self):
+        self.store.save(self.create_state()).result()
+
+        def fail(data, f, protocol):
+            f.write(b"partial")
+            raise RuntimeError("disk full")
+
+        state = self.create_state()
+        state.push_window_layout(TaskWindowLayout("d"))
+        with mock.patch("pickle.dump", fail):
+            with self.assertLogs(
+                "envisage.ui.tasks.tasks_application_state_store"
+            ):
+                self.store.save(state).result()
+
+        state = self.create_store().load(TasksApplicationState())
+        self.assertEqual(2, len(state.window_layouts))
+        self.assertEqual(["state.v1"], os.listdir(self.tmpdir))
+
+    def test_only_new_layouts_are_pickled(self):
+        state = self.create_state()
+        self.store.save(state).result()
+        blobs = dict(self.store._blobs)
+
+        new = TaskWindowLayout("d")
+        state.push_window_layout(new)
+        self.store.save(state).result()
+
+        for key, (layout, blob) in blobs.items():
+            self.assertIs(blob, self.store._blobs[key][1])
+        self.assertIn(id(new), self.store._blobs)
+
+    def test_loaded_layouts_are_not_pickled_again(self):
+        self.store.save(self.create_state()).result()
+        with open(self.store.format_filename, "rb") as f:
+            data = pickle.load(f)
+
+        store = self.create_store()
+        state = store.load(TasksApplicationState())
+        store.save(state).result()
+
+        with open(self.store.format_filename, "rb") as f:
+            self.assertEqual(data, pickle.load(f))
+
+    def test_changed_layouts_are_pickled_again(self):
+        state = self.create_state()
+        self.store.save(state).result()
+
+        layout = state.window_layouts[0]
+        layout.active_task = "b"
+        self.store.layout_changed(layout)
+        self.store.save(state).result()
+
+        state = self.create_store().load(TasksApplicationState())
+        self.assertEqual("b", state.window_layouts[0].active_task)
@@ -0,0 +1,76 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+""" An action that creates its implementation when it is performed. """
+
+
+# Enthought library imports.
+from pyface.action.api import Action
+from traits.api import Any, Instance, Str
+
+
+class LazyAction(Action):
+    """ An action that creates its implementation when it is performed.
+
+    A lazy action stands in for an action in a menu or tool bar, so that the
+    module that defines the action is not imported until the action is first
+    performed (or 'get_implementation' is called).
+
+    Once the implementation has been created, the lazy action's 'enabled',
+    'visible' and 'checked' traits are kept in sync with it.
+
+    """
+
+    #### 'LazyAction' interface ###############################################
+
+    # The name of the class that implements the action.
+    class_name = Str
+
+    # The implementation of the action (or None if it has not been created
+    # yet).
+    implementation = Instance(Action)
+
+    # The workbench window that the action is in.
+    window = Any
+
+    ###########################################################################
+    # 'Action' interface.
+    ###########################################################################
+
+    def perform(self, event):
+        """ Perform the action. """
+
+        self.get_implementation().perform(event)
+
+    ###########################################################################
+    # 'LazyAction' interface.
+    ###########################################################################
+
+    def get_implementation(self):
+        """ Return the implementation, creating it if necessary. """
+
+        if self.implementation is None:
+            klass = self.window.application.import_symbol(self.class_name)
+
+            traits = {"window": self.window}
+            if len(self.name) > 0:
+                traits["name"] = self.name
+
+            implementation = klass(**traits)
+
+            # fixme: The action set is needed for dynamic enabling/disabling
+            # (see 'WorkbenchActionManagerBuilder._create_action').
+            implementation._action_set_ = getattr(self, "_action_set_", None)
+
+            for trait_name in ["enabled", "visible", "checked"]:
+                implementation.sync_trait(trait_name, self)
+
+            self.implementation = implementation
+
+        return self.implementation
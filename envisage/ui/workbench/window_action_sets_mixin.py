@@ -0,0 +1,104 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+""" Keeps the enabled/visible state of a window's action sets up to date. """
+
+
+# Enthought library imports.
+from traits.api import Bool, HasTraits, Int, on_trait_change
+
+# Local imports.
+from .workbench_action_set import WorkbenchActionSet
+
+
+class WindowActionSetsMixin(HasTraits):
+    """ Keeps the enabled/visible state of a window's action sets up to date.
+
+    The window's action sets are refreshed in a single pass when the window
+    is opened, and whenever the active part or perspective changes.
+
+    Switching perspectives can change the active part several times, and a
+    listener might change it again while the action sets are being
+    refreshed. Such changes are batched, so the action sets are refreshed
+    once at the end rather than after every change.
+
+    This is mixed into a workbench window, which provides the 'action_sets',
+    'opened', 'active_part' and 'active_perspective' traits. It must come
+    before the pyface window class in the bases, so that it can batch the
+    window's own handling of perspective changes.
+
+    """
+
+    #### Private interface ####################################################
+
+    # The number of batches that are in progress. While this is not zero, any
+    # refreshes are put off until the outermost batch is done.
+    _action_set_batch_depth = Int
+
+    # Whether the action sets need to be refreshed.
+    _action_sets_stale = Bool(False)
+
+    ###########################################################################
+    # 'WindowActionSetsMixin' interface.
+    ###########################################################################
+
+    def refresh_action_sets(self):
+        """ Refresh the enabled/visible state of the window's action sets.
+
+        If this is called during a batch, the refresh happens when the
+        batch is done.
+
+        """
+
+        self._action_sets_stale = True
+        if self._action_set_batch_depth == 0:
+            self._refresh_stale_action_sets()
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _refresh_stale_action_sets(self):
+        """ Refresh the action sets until they are up to date. """
+
+        # Refreshing might make the action sets stale again (e.g. if a
+        # listener changes the active part), in which case we go round again
+        # rather than refreshing them in the middle of a refresh.
+        self._action_set_batch_depth += 1
+        try:
+            while self._action_sets_stale:
+                self._action_sets_stale = False
+                for action_set in self.action_sets:
+                    if isinstance(action_set, WorkbenchActionSet):
+                        action_set.refresh()
+
+        finally:
+            self._action_set_batch_depth -= 1
+
+    #### Trait change handlers ################################################
+
+    def _active_perspective_changed(self, old, new):
+        """ Static trait change handler. """
+
+        # Showing the new perspective changes the active part (maybe several
+        # times), so the action sets are only refreshed once it is shown.
+        self._action_set_batch_depth += 1
+        try:
+            super()._active_perspective_changed(old, new)
+
+        finally:
+            self._action_set_batch_depth -= 1
+
+        self.refresh_action_sets()
+
+    @on_trait_change("opened, active_part")
+    def _refresh_action_sets_on_change(self):
+        """ Dynamic trait change handler. """
+
+        self.refresh_action_sets()
@@ -0,0 +1,176 @@
+# (C) Copyright 2007-2023 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+""" The 'per window' services of a workbench window. """
+
+
+# Enthought library imports.
+from envisage.api import IServiceRegistry, ServiceRegistry
+from traits.api import HasTraits, Instance, List, on_trait_change, provides
+
+
+@provides(IServiceRegistry)
+class WindowServicesMixin(HasTraits):
+    """ The 'per window' services of a workbench window.
+
+    The window's services are kept in a registry of their own. By default,
+    this is a child of the application's registry, so that any services that
+    the window does not have itself are looked up in the application (the
+    parent follows the application if the workbench is set or changed later
+    on).
+
+    The window's service offers are registered when the window is opening,
+    and unregistered (in the reverse order) when it has closed.
+
+    This is mixed into a workbench window, which provides the 'workbench',
+    'opening' and 'closed' traits, and a '_service_offers' trait with the
+    service offers to register.
+
+    """
+
+    #### 'WindowServicesMixin' interface ######################################
+
+    # The service registry for 'per window' services.
+    service_registry = Instance(IServiceRegistry)
+
+    #### Private interface ####################################################
+
+    # The Ids of the services that were automatically registered.
+    _service_ids = List
+
+    # The service registry created by the trait initializer (if it has been
+    # called). Only this registry's parent is kept up to date, a registry
+    # that is set explicitly is left alone.
+    _default_service_registry = Instance(ServiceRegistry)
+
+    ###########################################################################
+    # 'IServiceRegistry' interface.
+    ###########################################################################
+
+    def get_service(self, protocol, query="", minimize="", maximize=""):
+        """ Return at most one service that matches the specified query. """
+
+        service = self.service_registry.get_service(
+            protocol, query, minimize, maximize
+        )
+
+        return service
+
+    def get_service_properties(self, service_id):
+        """ Return the dictionary of properties associated with a service. """
+
+        return self.service_registry.get_service_properties(service_id)
+
+    def get_services(self, protocol, query="", minimize="", maximize=""):
+        """ Return all services that match the specified query. """
+
+        services = self.service_registry.get_services(
+            protocol, query, minimize, maximize
+        )
+
+        return services
+
+    def register_service(self, protocol, obj, properties=None):
+        """ Register a service. """
+
+        service_id = self.service_registry.register_service(
+            protocol, obj, properties
+        )
+
+        return service_id
+
+    def set_service_properties(self, service_id, properties):
+        """ Set the dictionary of properties associated with a service. """
+
+        self.service_registry.set_service_properties(service_id, properties)
+
+    def unregister_service(self, service_id):
+        """ Unregister a service. """
+
+        self.service_registry.unregister_service(service_id)
+
+    ###########################################################################
+    # 'WindowServicesMixin' interface.
+    ###########################################################################
+
+    #### Trait initializers ###################################################
+
+    def _service_registry_default(self):
+        """ Trait initializer. """
+
+        self._default_service_registry = ServiceRegistry(
+            parent=self._get_application()
+        )
+
+        return self._default_service_registry
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _get_application(self):
+        """ Return the application (or None if there is no workbench yet). """
+
+        if self.workbench is None:
+            return None
+
+        return self.workbench.application
+
+    def _register_service_offers(self, service_offers):
+        """ Register all service offers. """
+
+        return list(map(self._register_service_offer, service_offers))
+
+    def _register_service_offer(self, service_offer):
+        """ Register a service offer. """
+
+        # Add the window to the service offer properties (this is so that it
+        # is available to the factory when it is called to create the actual
+        # service).
+        service_offer.properties["window"] = self
+
+        service_id = self.register_service(
+            protocol=service_offer.protocol,
+            obj=service_offer.factory,
+            properties=service_offer.properties,
+        )
+
+        return service_id
+
+    def _unregister_service_offers(self, service_ids):
+        """ Unregister all service offers. """
+
+        # Unregister the services in the reverse order that we registered
+        # them.
+        service_ids_copy = service_ids[:]
+        service_ids_copy.reverse()
+
+        for service_id in service_ids_copy:
+            self.unregister_service(service_id)
+
+    #### Trait change handlers ################################################
+
+    def _opening_changed(self):
+        """ Static trait change handler. """
+
+        self._service_ids = self._register_service_offers(self._service_offers)
+
+    def _closed_changed(self):
+        """ Static trait change handler. """
+
+        self._unregister_service_offers(self._service_ids)
+
+    @on_trait_change("workbench.application")
+    def _update_service_registry_parent(self):
+        """ Dynamic trait change handler. """
+
+        # If the registry was created before the workbench was set then it
+        # would otherwise have no parent to fall back to.
+        if self._default_service_registry is not None:
+            self._default_service_registry.parent = self._get_application()
@@ -15,7 +15,7 @@ import pyface.workbench.api as pyface
 
 from envisage.api import IApplication
 from pyface.api import YES
-from traits.api import Delegate, Instance
+from traits.api import Delegate, Dict, Instance
 
 # Local imports.
 from .workbench_preferences import WorkbenchPreferences
@@ -45,6 +45,10 @@ class Workbench(pyface.Workbench):
 
     #### Private interface ####################################################
 
+    # The templates used to build the menu and tool bars of the windows (see
+    # 'WorkbenchActionManagerBuilder').
+    _action_manager_templates = Dict
+
     # The workbench preferences.
     _preferences = Instance(WorkbenchPreferences, ())
 
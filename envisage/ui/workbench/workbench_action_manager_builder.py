@@ -11,19 +11,35 @@
 
 
 # Standard library imports.
+import logging
 import weakref
 
 # Enthought library imports.
 from envisage.ui.action.api import AbstractActionManagerBuilder
-from pyface.action.api import Action, Group, MenuManager
+from envisage.ui.action.api import ToolBar
+from pyface.action.api import Action, ActionManager, Group, MenuManager
 from pyface.workbench.action.api import MenuBarManager
 from pyface.workbench.action.api import ToolBarManager
-from traits.api import Any, Instance
+from traits.api import Any, Dict, Instance, List
+
+# Local imports.
+from .lazy_action import LazyAction
+
+# Logging.
+logger = logging.getLogger(__name__)
 
 
 class WorkbenchActionManagerBuilder(AbstractActionManagerBuilder):
     """ The action manager builder used to build the workbench menu/tool bars.
 
+    If the builder is given a dictionary of 'templates' then the first time
+    that the menu bar or the tool bars are built from a particular set of
+    action sets, the builder records *where* everything ended up. Builders
+    for other windows with the same action sets then create the same menu
+    and tool bars straight from the template, without placing anything or
+    importing any classes. Only the latest template for each menu bar or tool
+    bar root is kept, so a different set of action sets replaces it.
+
     """
 
     #### 'WorkbenchActionManagerBuilder' interface ############################
@@ -31,15 +47,90 @@ class WorkbenchActionManagerBuilder(AbstractActionManagerBuilder):
     # The workbench window that we build the menu and tool bars for.
     window = Instance("envisage.ui.workbench.api.WorkbenchWindow")
 
+    # The templates that the menu and tool bars are built from (or None if
+    # they are always built from scratch). This is usually shared by the
+    # builders of all of the windows in an application.
+    #
+    # e.g. {(builder class, kind, root) : (signature, template)}
+    templates = Any
+
     #### Private interface ####################################################
 
     # All action implementations.
     _actions = Any
 
+    # The groups, menus and tool bars created by the builder for each action
+    # set.
+    #
+    # e.g. {action_set : [item, ...]}
+    _action_set_items = Dict
+
+    # The items created by the builder for the template being recorded (or
+    # None if no template is being recorded), and the definitions that they
+    # were created from. Action items are mapped to their position in
+    # '_created_actions' instead.
+    _definitions = Any
+
+    # The definitions of the actions that were added, in the order that they
+    # were created.
+    _created_actions = List
+
+    # The items that action managers already contained when they were
+    # created (e.g. the items of the 'View' menu).
+    _natives = Any
+
+    # The symbols that have been imported, by symbol path.
+    _symbols = Dict
+
+    ###########################################################################
+    # 'IActionManagerBuilder' interface.
+    ###########################################################################
+
+    def create_menu_bar_manager(self, root):
+        """ Create a menu bar manager from the builder's action sets. """
+
+        build = super().create_menu_bar_manager
+        menu_bar_manager, = self._build_from_template(
+            "menu bar", root, lambda root: [build(root)]
+        )
+
+        return menu_bar_manager
+
+    def create_tool_bar_managers(self, root):
+        """ Creates all tool bar managers from the builder's action sets. """
+
+        return self._build_from_template(
+            "tool bars", root, super().create_tool_bar_managers
+        )
+
+    ###########################################################################
+    # 'WorkbenchActionManagerBuilder' interface.
+    ###########################################################################
+
+    def get_action_set_items(self, action_set):
+        """ Return the groups, menus and tool bars created for an action set.
+
+        These are the items whose enabled and visible state follows that of
+        the action set.
+
+        """
+
+        return list(self._action_set_items.get(action_set, []))
+
     ###########################################################################
     # Protected 'AbstractActionManagerBuilder' interface.
     ###########################################################################
 
+    def _add_action(self, action_manager, action):
+        """ Add an action to an action manager. """
+
+        item = super()._add_action(action_manager, action)
+        if item is not None and self._definitions is not None:
+            self._definitions[item] = len(self._created_actions)
+            self._created_actions.append(action)
+
+        return item
+
     def _create_action(self, definition):
         """ Create an action implementation from an action definition. """
 
@@ -52,8 +143,19 @@ class WorkbenchActionManagerBuilder(AbstractActionManagerBuilder):
         if len(definition.class_name) > 0:
             action = self._actions.get(definition.class_name)
             if action is None:
-                klass = self._import_symbol(definition.class_name)
-                action = klass(**traits)
+                if definition.lazy:
+                    action = LazyAction(
+                        class_name=definition.class_name,
+                        accelerator=definition.accelerator,
+                        image=definition.image,
+                        tooltip=definition.tooltip,
+                        **traits
+                    )
+
+                else:
+                    klass = self._import_symbol(definition.class_name)
+                    action = klass(**traits)
+
                 self._actions[definition.class_name] = action
 
         # fixme: Do we ever actually do this? It seems that in Envisage 3.x
@@ -68,6 +170,17 @@ class WorkbenchActionManagerBuilder(AbstractActionManagerBuilder):
 
         return action
 
+    def _get_action_id(self, definition):
+        """ Return the ID that the implementation of an action will have. """
+
+        # Only an action that has already been created knows its ID for sure
+        # (its class may well set one).
+        action = self._actions.get(definition.class_name)
+        if action is not None:
+            return action.id
+
+        return super()._get_action_id(definition)
+
     def _create_group(self, definition):
         """ Create a group implementation from a group definition. """
 
@@ -84,6 +197,7 @@ class WorkbenchActionManagerBuilder(AbstractActionManagerBuilder):
             klass = Group
 
         group = klass(**traits)
+        self._record(group, definition)
 
         # fixme: We need to associate the action set with the action to
         # allow for dynamic enabling/disabling etc. This is a *very* hacky
@@ -115,6 +229,7 @@ class WorkbenchActionManagerBuilder(AbstractActionManagerBuilder):
             klass = MenuManager
 
         menu_manager = klass(**traits)
+        self._record(menu_manager, definition)
 
         # Add any groups to the menu.
         for group in definition.groups:
@@ -131,7 +246,10 @@ class WorkbenchActionManagerBuilder(AbstractActionManagerBuilder):
     def _create_menu_bar_manager(self):
         """ Create a menu bar manager from the builder's action sets. """
 
-        return MenuBarManager(window=self.window)
+        menu_bar_manager = MenuBarManager(window=self.window)
+        self._record(menu_bar_manager, None)
+
+        return menu_bar_manager
 
     def _create_tool_bar_manager(self, definition):
         """ Create a tool bar manager implementation from a definition. """
@@ -155,6 +273,7 @@ class WorkbenchActionManagerBuilder(AbstractActionManagerBuilder):
         # seems that menus and actions etc should *always* have a reference
         # to the window that they are in?!?
         tool_bar_manager = klass(**traits)
+        self._record(tool_bar_manager, definition)
 
         # Add any groups to the tool bar.
         for group in definition.groups:
@@ -177,7 +296,259 @@ class WorkbenchActionManagerBuilder(AbstractActionManagerBuilder):
 
         return weakref.WeakValueDictionary()
 
+    def _build_from_template(self, kind, root, build):
+        """ Build the menu bar or the tool bars for a root.
+
+        'build' is called with the root to build the action managers from
+        scratch if there is no template for them yet, and returns a list of
+        the managers.
+
+        """
+
+        if self.templates is None:
+            return build(root)
+
+        definitions, signature = self._get_definitions()
+        key = (type(self), kind, root)
+
+        # Only the latest template is kept for each root, so that templates
+        # for combinations of action sets that are no longer in use don't
+        # pile up.
+        template = None
+        entry = self.templates.get(key)
+        if entry is not None and entry[0] == signature:
+            template = entry[1]
+
+        if template is not None:
+            try:
+                return self._instantiate_template(
+                    template, kind, root, definitions
+                )
+
+            except LookupError:
+                logger.debug(
+                    "Could not use the %s template for %s", kind, root
+                )
+
+        self._definitions = {}
+        self._created_actions = []
+        self._natives = set()
+        try:
+            action_managers = build(root)
+            try:
+                self.templates[key] = (
+                    signature,
+                    self._compile_template(action_managers, definitions),
+                )
+
+            except LookupError:
+                logger.debug(
+                    "Could not make a %s template for %s", kind, root
+                )
+
+        finally:
+            self._definitions = self._natives = None
+            self._created_actions = []
+
+        return action_managers
+
+    def _compile_template(self, action_managers, definitions):
+        """ Make a template from some newly built action managers.
+
+        Raise a LookupError if the action managers contain items that the
+        builder knows nothing about.
+
+        """
+
+        positions = {
+            id(definition): position
+            for position, (definition, _) in enumerate(definitions)
+        }
+
+        def compile_groups(action_manager):
+            return tuple(
+                (
+                    positions.get(id(self._definitions.get(group))),
+                    group.id,
+                    tuple(compile_item(item) for item in group.items),
+                )
+                for group in action_manager.groups
+            )
+
+        def compile_item(item):
+            if item in self._definitions:
+                definition = self._definitions[item]
+                if isinstance(definition, int):
+                    return ("action", definition)
+
+                return (
+                    "menu", positions[id(definition)], compile_groups(item)
+                )
+
+            if isinstance(item, ActionManager):
+                kind = "native" if item in self._natives else "submenu"
+                return (kind, item.id, compile_groups(item))
+
+            if item in self._natives:
+                return ("native", item.id, None)
+
+            raise LookupError(item)
+
+        actions = tuple(
+            positions[id(definition)] for definition in self._created_actions
+        )
+        managers = tuple(
+            (
+                positions.get(id(self._definitions[action_manager])),
+                compile_groups(action_manager),
+            )
+            for action_manager in action_managers
+        )
+
+        return (tuple(self._symbols.items()), actions, managers)
+
+    def _get_definitions(self):
+        """ Return all of the definitions in the builder's action sets.
+
+        Returns a list of '(definition, action_set)' tuples, and a signature
+        that is the same for any action sets that contain the same
+        definitions (even if they are different objects).
+
+        """
+
+        definitions = []
+        signature = []
+        for action_set in self.action_sets:
+            signature.append(tuple(sorted(action_set.aliases.items())))
+            for attribute_name in ["actions", "groups", "menus", "tool_bars"]:
+                for item in getattr(action_set, attribute_name):
+                    items = [item] + list(getattr(item, "groups", []))
+                    for definition in items:
+                        definitions.append((definition, action_set))
+                        signature.append(
+                            (type(definition), len(items))
+                            + tuple(
+                                getattr(definition, name, None)
+                                for name in [
+                                    "path",
+                                    "group",
+                                    "before",
+                                    "after",
+                                    "id",
+                                    "name",
+                                    "class_name",
+                                ]
+                            )
+                        )
+
+        return definitions, tuple(signature)
+
     def _import_symbol(self, symbol_path):
         """ Import a symbol. """
 
-        return self.window.application.import_symbol(symbol_path)
+        symbol = self._symbols.get(symbol_path)
+        if symbol is None:
+            symbol = self.window.application.import_symbol(symbol_path)
+            self._symbols[symbol_path] = symbol
+
+        return symbol
+
+    def _instantiate_template(self, template, kind, root, definitions):
+        """ Build the action managers described by a template.
+
+        Raise a LookupError if an item that the template expects the action
+        managers to create for themselves is missing.
+
+        """
+
+        symbols, actions, managers = template
+        self._symbols.update(symbols)
+
+        # fixme: As in the action set manager, the definitions are tagged with
+        # the action set that contributed them.
+        for definition, action_set in definitions:
+            definition._action_set_ = action_set
+
+        # The actions are created in the same order as when the template was
+        # made, as implementations are shared by actions with the same class.
+        actions = [
+            self._create_action(definitions[position][0])
+            for position in actions
+        ]
+
+        def populate(action_manager, groups):
+            for index, (position, group_id, items) in enumerate(groups):
+                group = action_manager.find_group(group_id)
+                if group is None:
+                    if position is None:
+                        raise LookupError(group_id)
+
+                    group = self._create_group(definitions[position][0])
+                    action_manager.insert(index, group)
+
+                for index, item in enumerate(items):
+                    populate_item(group, index, *item)
+
+        def populate_item(group, index, kind, item_id, groups=None):
+            if kind == "action":
+                group.insert(index, actions[item_id])
+                return
+
+            if kind == "menu":
+                item = self._create_menu_manager(definitions[item_id][0])
+                group.insert(index, item)
+
+            elif kind == "submenu":
+                item = MenuManager(id=item_id, name=item_id)
+                group.insert(index, item)
+
+            else:
+                item = group.find(item_id)
+                if item is None:
+                    raise LookupError(item_id)
+
+            if groups is not None:
+                populate(item, groups)
+
+        action_managers = []
+        for position, groups in managers:
+            if kind == "menu bar":
+                action_manager = self._create_menu_bar_manager()
+
+            else:
+                if position is None:
+                    definition = ToolBar(
+                        name="Tool Bar", path=root, _action_set_=None
+                    )
+
+                else:
+                    definition = definitions[position][0]
+
+                action_manager = self._create_tool_bar_manager(definition)
+
+            populate(action_manager, groups)
+            action_managers.append(action_manager)
+
+        return action_managers
+
+    def _record(self, item, definition):
+        """ Make a note of a group, menu or tool bar that has been created.
+        """
+
+        action_set = getattr(definition, "_action_set_", None)
+        if action_set is not None:
+            self._action_set_items.setdefault(action_set, []).append(item)
+
+        if self._definitions is not None:
+            self._definitions[item] = definition
+
+        if self._natives is not None and isinstance(item, ActionManager):
+            # Anything that the item created for itself.
+            items = [item]
+            while len(items) > 0:
+                for group in items.pop().groups:
+                    self._natives.update(group.items)
+                    items.extend(
+                        native for native in group.items
+                        if isinstance(native, ActionManager)
+                    )
@@ -12,7 +12,7 @@
 
 # Enthought library imports.
 from envisage.ui.action.api import ActionSet
-from traits.api import Instance, List, Str
+from traits.api import Any, Instance, List, Str
 
 
 class WorkbenchActionSet(ActionSet):
@@ -57,6 +57,15 @@ class WorkbenchActionSet(ActionSet):
     # window.
     window = Instance("envisage.ui.workbench.api.WorkbenchWindow")
 
+    #### Private interface ####################################################
+
+    # The changes to the enabled/visible state that are waiting to be applied
+    # to the items in the action set while it is being refreshed (or None if
+    # it is not being refreshed).
+    #
+    # e.g. {'enabled' : True}
+    _pending = Any
+
     ###########################################################################
     # 'ActionSet' interface.
     ###########################################################################
@@ -64,16 +73,12 @@ class WorkbenchActionSet(ActionSet):
     def _enabled_changed(self, trait_name, old, new):
         """ Static trait change handler. """
 
-        if self.window is not None:
-            self._update_tool_bars(self.window, "enabled", new)
-            self._update_actions(self.window, "enabled", new)
+        self._update_items(trait_name, new)
 
     def _visible_changed(self, trait_name, old, new):
         """ Static trait change handler. """
 
-        if self.window is not None:
-            self._update_tool_bars(self.window, "visible", new)
-            self._update_actions(self.window, "visible", new)
+        self._update_items(trait_name, new)
 
     ###########################################################################
     # 'WorkbenchActionSet' interface.
@@ -85,18 +90,67 @@ class WorkbenchActionSet(ActionSet):
         Use this method to hook up any listeners that you need to control
         the enabled and/or visible state of the action set.
 
-        By default, we listen to the window being opened and the active
-        perspective and active view being changed.
+        By default, there is nothing to do: the window refreshes all of its
+        action sets (see 'refresh') when it is opened and when the active
+        perspective and active view change.
+
+        """
+
+    def refresh(self):
+        """ Refresh the enabled/visible state of the action set.
+
+        By default, this follows the '*_for_perspectives' and '*_for_views'
+        traits.
 
         """
 
-        # We use dynamic trait handlers here instead of static handlers (or
-        # @on_trait_change) because sub-classes might have a completely
-        # different way to determine the anabled and/or visible state, hence
-        # we might want to hook up completely different events.
-        self.window.on_trait_change(self._refresh, "opened")
-        self.window.on_trait_change(self._refresh, "active_part")
-        self.window.on_trait_change(self._refresh, "active_perspective")
+        window = self.window
+
+        # The state may be set several times below, so the items are only
+        # updated once we are done. If we are called while already
+        # refreshing (e.g. by a listener) then the outermost call does that.
+        outermost = self._pending is None
+        if outermost:
+            self._pending = {}
+
+        try:
+            if len(self.enabled_for_perspectives) > 0:
+                self.enabled = (
+                    window is not None
+                    and window.active_perspective is not None
+                    and window.active_perspective.id
+                    in self.enabled_for_perspectives
+                )
+
+            if len(self.visible_for_perspectives) > 0:
+                self.visible = (
+                    window is not None
+                    and window.active_perspective is not None
+                    and window.active_perspective.id
+                    in self.visible_for_perspectives
+                )
+
+            if len(self.enabled_for_views) > 0:
+                self.enabled = (
+                    window is not None
+                    and window.active_part is not None
+                    and window.active_part.id in self.enabled_for_views
+                )
+
+            if len(self.visible_for_views) > 0:
+                self.visible = (
+                    window is not None
+                    and window.active_part is not None
+                    and window.active_part.id in self.visible_for_views
+                )
+
+        finally:
+            if outermost:
+                pending, self._pending = self._pending, None
+
+        if outermost:
+            for trait_name, value in pending.items():
+                self._update_items(trait_name, value)
 
     ###########################################################################
     # Private interface.
@@ -115,65 +169,23 @@ class WorkbenchActionSet(ActionSet):
     #### Methods ##############################################################
 
     def _refresh(self):
-        """ Refresh the enabled/visible state of the action set. """
+        """ Refresh the enabled/visible state of the action set.
 
-        window = self.window
+        This is kept for sub-classes that hook it up to other events in
+        'initialize'.
+
+        """
+
+        self.refresh()
+
+    def _update_items(self, trait_name, value):
+        """ Update the state of the menus, groups and tool bars in the action
+            set.
+        """
+
+        if self._pending is not None:
+            self._pending[trait_name] = value
 
-        if len(self.enabled_for_perspectives) > 0:
-            self.enabled = (
-                window is not None
-                and window.active_perspective is not None
-                and window.active_perspective.id
-                in self.enabled_for_perspectives
-            )
-
-        if len(self.visible_for_perspectives) > 0:
-            self.visible = (
-                window is not None
-                and window.active_perspective is not None
-                and window.active_perspective.id
-                in self.visible_for_perspectives
-            )
-
-        if len(self.enabled_for_views) > 0:
-            self.enabled = (
-                window is not None
-                and window.active_part is not None
-                and window.active_part.id in self.enabled_for_views
-            )
-
-        if len(self.visible_for_views) > 0:
-            self.visible = (
-                window is not None
-                and window.active_part is not None
-                and window.active_part.id in self.visible_for_views
-            )
-
-    def _update_actions(self, window, trait_name, value):
-        """ Update the state of the tool bars in the action set. """
-
-        def visitor(item):
-            """ Called when we visit each item in an action manager. """
-
-            # fixme: The 'additions' group gets created by default and hence
-            # has no '_action_set_' attribute. This smells because of the fact
-            # that we 'tag' the '_action_set_' attribute onto all items to be
-            # ble to find them later. This link should be maintained externally
-            # (maybe in the action set itself?).
-            if hasattr(item, "_action_set_"):
-                if item._action_set_ is self:
-                    setattr(item, trait_name, value)
-
-        # Update actions on the menu bar.
-        window.menu_bar_manager.walk(visitor)
-
-        # Update actions on the tool bars.
-        for tool_bar_manager in window.tool_bar_managers:
-            tool_bar_manager.walk(visitor)
-
-    def _update_tool_bars(self, window, trait_name, value):
-        """ Update the state of the tool bars in the action set. """
-
-        for tool_bar_manager in window.tool_bar_managers:
-            if tool_bar_manager._action_set_ is self:
-                setattr(tool_bar_manager, trait_name, value)
+        elif self.window is not None:
+            for item in self.window.get_action_set_items(self):
+                setattr(item, trait_name, value)
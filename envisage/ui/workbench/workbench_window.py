@@ -18,12 +18,14 @@ import pyface.workbench.api as pyface
 
 from envisage.api import IExtensionPointUser, IExtensionRegistry
 from envisage.api import IServiceRegistry
-from envisage.api import ExtensionPoint, ServiceRegistry
+from envisage.api import ExtensionPoint
 from envisage.ui.action.api import ActionSet
 from pyface.action.api import StatusBarManager
 from traits.api import Delegate, Instance, List, Property, provides
 
 # Local imports.
+from .window_action_sets_mixin import WindowActionSetsMixin
+from .window_services_mixin import WindowServicesMixin
 from .workbench_action_manager_builder import WorkbenchActionManagerBuilder
 from .workbench_editor_manager import WorkbenchEditorManager
 
@@ -33,7 +35,9 @@ logger = logging.getLogger(__name__)
 
 
 @provides(IServiceRegistry, IExtensionPointUser)
-class WorkbenchWindow(pyface.WorkbenchWindow):
+class WorkbenchWindow(
+    WindowActionSetsMixin, WindowServicesMixin, pyface.WorkbenchWindow
+):
     """ An extensible workbench window. """
 
     # Extension point Ids.
@@ -54,9 +58,6 @@ class WorkbenchWindow(pyface.WorkbenchWindow):
     # used in the window.
     action_sets = List(Instance(ActionSet))
 
-    # The service registry for 'per window' services.
-    service_registry = Instance(IServiceRegistry, factory=ServiceRegistry)
-
     #### 'IExtensionPointUser' interface ######################################
 
     # The extension registry that the object's extension points are stored in.
@@ -82,9 +83,6 @@ class WorkbenchWindow(pyface.WorkbenchWindow):
     # Contributed service offers.
     _service_offers = ExtensionPoint(id=SERVICE_OFFERS)
 
-    # The Ids of the services that were automatically registered.
-    _service_ids = List
-
     ###########################################################################
     # 'IExtensionPointUser' interface.
     ###########################################################################
@@ -115,18 +113,6 @@ class WorkbenchWindow(pyface.WorkbenchWindow):
 
         return self._action_manager_builder.create_tool_bar_managers("ToolBar")
 
-    #### Trait change handlers ################################################
-
-    def _opening_changed(self):
-        """ Static trait change handler. """
-
-        self._service_ids = self._register_service_offers(self._service_offers)
-
-    def _closed_changed(self):
-        """ Static trait change handler. """
-
-        self._unregister_service_offers(self._service_ids)
-
     ###########################################################################
     # 'pyface.WorkbenchWindow' interface.
     ###########################################################################
@@ -162,56 +148,22 @@ class WorkbenchWindow(pyface.WorkbenchWindow):
     # 'WorkbenchWindow' interface.
     ###########################################################################
 
-    def _action_sets_default(self):
-        """ Trait initializer. """
-
-        return [factory(window=self) for factory in self._action_sets]
-
-    ###########################################################################
-    # 'IServiceRegistry' interface.
-    ###########################################################################
-
-    def get_service(self, protocol, query="", minimize="", maximize=""):
-        """ Return at most one service that matches the specified query. """
-
-        service = self.service_registry.get_service(
-            protocol, query, minimize, maximize
-        )
-
-        return service
-
-    def get_service_properties(self, service_id):
-        """ Return the dictionary of properties associated with a service. """
-
-        return self.service_registry.get_service_properties(service_id)
+    def get_action_set_items(self, action_set):
+        """ Return the groups, menus and tool bars created for an action set.
 
-    def get_services(self, protocol, query="", minimize="", maximize=""):
-        """ Return all services that match the specified query. """
+        These are the items in the window's menu bar and tool bars whose
+        enabled and visible state follows that of the action set.
 
-        services = self.service_registry.get_services(
-            protocol, query, minimize, maximize
-        )
-
-        return services
-
-    def register_service(self, protocol, obj, properties=None):
-        """ Register a service. """
-
-        service_id = self.service_registry.register_service(
-            protocol, obj, properties
-        )
+        """
 
-        return service_id
+        return self._action_manager_builder.get_action_set_items(action_set)
 
-    def set_service_properties(self, service_id, properties):
-        """ Set the dictionary of properties associated with a service. """
-
-        self.service_registry.set_service_properties(service_id, properties)
+    #### Trait initializers ###################################################
 
-    def unregister_service(self, service_id):
-        """ Unregister a service. """
+    def _action_sets_default(self):
+        """ Trait initializer. """
 
-        self.service_registry.unregister_service(service_id)
+        return [factory(window=self) for factory in self._action_sets]
 
     ###########################################################################
     # Private interface.
@@ -220,40 +172,12 @@ class WorkbenchWindow(pyface.WorkbenchWindow):
     def __action_manager_builder_default(self):
         """ Trait initializer. """
 
+        # Windows with the same action sets share the same menu and tool bar
+        # templates.
         action_manager_builder = WorkbenchActionManagerBuilder(
-            window=self, action_sets=self.action_sets
+            window=self,
+            action_sets=self.action_sets,
+            templates=self.workbench._action_manager_templates,
         )
 
         return action_manager_builder
-
-    def _register_service_offers(self, service_offers):
-        """ Register all service offers. """
-
-        return list(map(self._register_service_offer, service_offers))
-
-    def _register_service_offer(self, service_offer):
-        """ Register a service offer. """
-
-        # Add the window to the service offer properties (this is so that it
-        # is available to the factory when it is called to create the actual
-        # service).
-        service_offer.properties["window"] = self
-
-        service_id = self.register_service(
-            protocol=service_offer.protocol,
-            obj=service_offer.factory,
-            properties=service_offer.properties,
-        )
-
-        return service_id
-
-    def _unregister_service_offers(self, service_ids):
-        """ Unregister all service offers. """
-
-        # Unregister the services in the reverse order that we registered
-        # them.
-        service_ids_copy = service_ids[:]
-        service_ids_copy.reverse()
-
-        for service_id in service_ids_copy:
-            self.unregister_service(service_id)